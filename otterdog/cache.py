@@ -15,8 +15,13 @@ from otterdog.utils import print_trace
 
 if TYPE_CHECKING:
     from otterdog.providers.github.cache import CacheStrategy
+    from otterdog.providers.github.web_settings import WebSettingsCache
+    from otterdog.snapshot import SnapshotStore
 
 _GITHUB_CACHE = file_cache()
+_SNAPSHOT_STORE: SnapshotStore | None = None
+_TEMPLATE_STORE_DIR: str | None = None
+_WEB_SETTINGS_CACHE: WebSettingsCache | None = None
 
 
 def get_github_cache() -> CacheStrategy:
@@ -31,3 +36,42 @@ def set_github_cache(cache: CacheStrategy) -> None:
 
     print_trace(f"Setting {cache} as GitHub cache strategy")
     _GITHUB_CACHE = cache
+
+
+def get_snapshot_store() -> SnapshotStore | None:
+    global _SNAPSHOT_STORE
+
+    return _SNAPSHOT_STORE
+
+
+def set_snapshot_store(store: SnapshotStore | None) -> None:
+    global _SNAPSHOT_STORE
+
+    print_trace(f"Setting {store} as snapshot store")
+    _SNAPSHOT_STORE = store
+
+
+def get_template_store_dir() -> str | None:
+    global _TEMPLATE_STORE_DIR
+
+    return _TEMPLATE_STORE_DIR
+
+
+def set_template_store_dir(store_dir: str | None) -> None:
+    global _TEMPLATE_STORE_DIR
+
+    print_trace(f"Setting {store_dir} as template store directory")
+    _TEMPLATE_STORE_DIR = store_dir
+
+
+def get_web_settings_cache() -> WebSettingsCache | None:
+    global _WEB_SETTINGS_CACHE
+
+    return _WEB_SETTINGS_CACHE
+
+
+def set_web_settings_cache(cache: WebSettingsCache | None) -> None:
+    global _WEB_SETTINGS_CACHE
+
+    print_trace(f"Setting {cache} as web settings cache")
+    _WEB_SETTINGS_CACHE = cache
@@ -6,51 +6,39 @@
 #  SPDX-License-Identifier: EPL-2.0
 #  *******************************************************************************
 
+from __future__ import annotations
+
 import asyncio
 import sys
 import traceback
-from typing import Any
+from io import StringIO
+from typing import TYPE_CHECKING, Any
 
 import click
 from click.shell_completion import CompletionItem
 
-from otterdog.cache import set_github_cache
-from otterdog.operations.review_app_permissions import ReviewAppPermissionsOperation
-from otterdog.providers.github.cache.file import file_cache
-
 from . import __version__
-from .config import OtterdogConfig
-from .operations import Operation
-from .operations.apply import ApplyOperation
-from .operations.canonical_diff import CanonicalDiffOperation
-from .operations.delete_file import DeleteFileOperation
-from .operations.dispatch_workflow import DispatchWorkflowOperation
-from .operations.fetch_config import FetchOperation
-from .operations.import_configuration import ImportOperation
-from .operations.install_app import InstallAppOperation
-from .operations.list_apps import ListAppsOperation
-from .operations.list_members import ListMembersOperation
-from .operations.local_apply import LocalApplyOperation
-from .operations.local_plan import LocalPlanOperation
-from .operations.open_pull_request import OpenPullRequestOperation
-from .operations.plan import PlanOperation
-from .operations.push_config import PushOperation
-from .operations.show import ShowOperation
-from .operations.show_default import ShowDefaultOperation
-from .operations.show_live import ShowLiveOperation
-from .operations.sync_template import SyncTemplateOperation
-from .operations.uninstall_app import UninstallAppOperation
-from .operations.validate import ValidateOperation
-from .operations.web_login import WebLoginOperation
 from .utils import IndentingPrinter, init, is_debug_enabled, print_error
 
+if TYPE_CHECKING:
+    from .config import OtterdogConfig
+    from .operations import Operation
+
+# the operations and their dependencies are only imported by the command that is executed,
+# keep the imports of this module to a minimum to start up quickly, e.g. for shell completion.
+
 _CONFIG_FILE = "otterdog.json"
 _CONTEXT_SETTINGS = {"help_option_names": ["-h", "--help"], "max_content_width": 120}
 
+# same as DEFAULT_PATCH_CONCURRENCY of the patch executor, not imported as it depends on all models
+_DEFAULT_PATCH_CONCURRENCY = 8
+
 _CONFIG: OtterdogConfig | None = None
 
 
 def complete_organizations(ctx, param, incomplete):
+    from .config import OtterdogConfig
+
     config_file = ctx.params.get("config")
     if config_file is None:
         config_file = _CONFIG_FILE
@@ -105,6 +93,8 @@ class StdCommand(click.Command):
         self.params.insert(0, click.Argument(["organizations"], nargs=-1, shell_complete=complete_organizations))
 
     def invoke(self, ctx: click.Context) -> Any:
+        from .config import OtterdogConfig
+
         global _CONFIG
 
         verbose = ctx.params.pop("verbose")
@@ -134,11 +124,20 @@ def cli():
 
 
 @cli.command(cls=StdCommand)
-def validate(organizations: list[str]):
+@click.option(
+    "--parallel",
+    type=click.IntRange(min=1),
+    show_default=True,
+    default=1,
+    help="number of organizations to process concurrently",
+)
+def validate(organizations: list[str], parallel):
     """
     Validates the configuration for organizations.
     """
-    _execute_operation(organizations, ValidateOperation())
+    from otterdog.operations.validate import ValidateOperation
+
+    _execute_operation(organizations, ValidateOperation(), parallel)
 
 
 @cli.command(cls=StdCommand)
@@ -159,6 +158,8 @@ def show(organizations: list[str], markdown, output_dir):
     """
     Displays the full configuration for organizations.
     """
+    from otterdog.operations.show import ShowOperation
+
     _execute_operation(organizations, ShowOperation(markdown, output_dir))
 
 
@@ -171,11 +172,32 @@ def show(organizations: list[str], markdown, output_dir):
     default=False,
     help="skip settings retrieved via web ui",
 )
-def show_live(organizations: list[str], no_web_ui):
+@click.option(
+    "--refresh-web-settings",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="retrieve settings via web ui even if cached settings are available",
+)
+@click.option(
+    "--parallel",
+    type=click.IntRange(min=1),
+    show_default=True,
+    default=1,
+    help="number of organizations to process concurrently",
+)
+def show_live(organizations: list[str], no_web_ui, refresh_web_settings, parallel):
     """
     Displays the live configuration for organizations.
     """
-    _execute_operation(organizations, ShowLiveOperation(no_web_ui=no_web_ui))
+    from otterdog.operations.show_live import ShowLiveOperation
+
+    _execute_operation(
+        organizations,
+        ShowLiveOperation(no_web_ui=no_web_ui),
+        parallel,
+        refresh_web_settings=refresh_web_settings,
+    )
 
 
 @cli.command(cls=StdCommand)
@@ -189,6 +211,8 @@ def show_default(organizations: list[str], markdown):
     """
     Displays the default configuration for organizations.
     """
+    from otterdog.operations.show_default import ShowDefaultOperation
+
     _execute_operation(organizations, ShowDefaultOperation(markdown))
 
 
@@ -207,6 +231,8 @@ def dispatch_workflow(organizations: list[str], repo, workflow):
     """
     Dispatches a workflow in a repo of an organization.
     """
+    from otterdog.operations.dispatch_workflow import DispatchWorkflowOperation
+
     _execute_operation(organizations, DispatchWorkflowOperation(repo, workflow))
 
 
@@ -240,6 +266,8 @@ def fetch_config(organizations: list[str], force, pull_request, suffix, ref):
     """
     Fetches the configuration from the corresponding config repo of an organization.
     """
+    from otterdog.operations.fetch_config import FetchOperation
+
     _execute_operation(
         organizations, FetchOperation(force_processing=force, pull_request=pull_request, suffix=suffix, ref=ref)
     )
@@ -267,6 +295,8 @@ def push_config(organizations: list[str], no_diff, force, message):
     """
     Pushes the local configuration to the corresponding config repo of an organization.
     """
+    from otterdog.operations.push_config import PushOperation
+
     _execute_operation(
         organizations, PushOperation(show_diff=not no_diff, force_processing=force, push_message=message)
     )
@@ -280,6 +310,8 @@ def open_pr(organizations: list[str], branch, title, author):
     """
     Opens a pull request for local configuration changes in the corresponding config repo of an organization.
     """
+    from otterdog.operations.open_pull_request import OpenPullRequestOperation
+
     _execute_operation(organizations, OpenPullRequestOperation(branch=branch, title=title, author=author))
 
 
@@ -289,6 +321,8 @@ def list_apps(organizations: list[str], json):
     """
     Lists all app installations for the organization.
     """
+    from otterdog.operations.list_apps import ListAppsOperation
+
     _execute_operation(organizations, ListAppsOperation(json))
 
 
@@ -298,6 +332,8 @@ def list_members(organizations: list[str], two_factor_disabled: bool):
     """
     Lists members of the organization.
     """
+    from otterdog.operations.list_members import ListMembersOperation
+
     _execute_operation(organizations, ListMembersOperation(two_factor_disabled))
 
 
@@ -318,11 +354,24 @@ def list_members(organizations: list[str], two_factor_disabled: bool):
     default=False,
     help="skip settings retrieved via web ui",
 )
-def import_command(organizations: list[str], force, no_web_ui):
+@click.option(
+    "--refresh-web-settings",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="retrieve settings via web ui even if cached settings are available",
+)
+def import_command(organizations: list[str], force, no_web_ui, refresh_web_settings):
     """
     Imports existing resources for a GitHub organization.
     """
-    _execute_operation(organizations, ImportOperation(force_processing=force, no_web_ui=no_web_ui))
+    from otterdog.operations.import_configuration import ImportOperation
+
+    _execute_operation(
+        organizations,
+        ImportOperation(force_processing=force, no_web_ui=no_web_ui),
+        refresh_web_settings=refresh_web_settings,
+    )
 
 
 @cli.command(cls=StdCommand, short_help="Show changes to live configuration on GitHub.")
@@ -334,6 +383,13 @@ def import_command(organizations: list[str], force, no_web_ui):
     default=False,
     help="skip settings retrieved via web ui",
 )
+@click.option(
+    "--refresh-web-settings",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="retrieve settings via web ui even if cached settings are available",
+)
 @click.option(
     "--repo-filter",
     show_default=True,
@@ -360,11 +416,29 @@ def import_command(organizations: list[str], force, no_web_ui):
     default="*",
     help="a valid shell pattern to match webhook urls / secret names to be included for update",
 )
-def plan(organizations: list[str], no_web_ui, repo_filter, update_webhooks, update_secrets, update_filter):
+@click.option(
+    "--parallel",
+    type=click.IntRange(min=1),
+    show_default=True,
+    default=1,
+    help="number of organizations to process concurrently",
+)
+def plan(
+    organizations: list[str],
+    no_web_ui,
+    refresh_web_settings,
+    repo_filter,
+    update_webhooks,
+    update_secrets,
+    update_filter,
+    parallel,
+):
     """
     Show changes that would be applied by otterdog based on the current configuration
     compared to the current live configuration at GitHub.
     """
+    from otterdog.operations.plan import PlanOperation
+
     _execute_operation(
         organizations,
         PlanOperation(
@@ -374,6 +448,8 @@ def plan(organizations: list[str], no_web_ui, repo_filter, update_webhooks, upda
             update_secrets=update_secrets,
             update_filter=update_filter,
         ),
+        parallel,
+        refresh_web_settings=refresh_web_settings,
     )
 
 
@@ -411,11 +487,20 @@ def plan(organizations: list[str], no_web_ui, repo_filter, update_webhooks, upda
     default="*",
     help="a valid shell pattern to match webhook urls / secret names to be included for update",
 )
-def local_plan(organizations: list[str], suffix, repo_filter, update_webhooks, update_secrets, update_filter):
+@click.option(
+    "--parallel",
+    type=click.IntRange(min=1),
+    show_default=True,
+    default=1,
+    help="number of organizations to process concurrently",
+)
+def local_plan(organizations: list[str], suffix, repo_filter, update_webhooks, update_secrets, update_filter, parallel):
     """
     Show changes that would be applied by otterdog based on the current configuration
     compared to another local configuration.
     """
+    from otterdog.operations.local_plan import LocalPlanOperation
+
     _execute_operation(
         organizations,
         LocalPlanOperation(
@@ -425,6 +510,7 @@ def local_plan(organizations: list[str], suffix, repo_filter, update_webhooks, u
             update_secrets=update_secrets,
             update_filter=update_filter,
         ),
+        parallel,
     )
 
 
@@ -445,6 +531,13 @@ def local_plan(organizations: list[str], suffix, repo_filter, update_webhooks, u
     default=False,
     help="skip settings retrieved via web ui",
 )
+@click.option(
+    "--refresh-web-settings",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="retrieve settings via web ui even if cached settings are available",
+)
 @click.option(
     "--repo-filter",
     show_default=True,
@@ -479,19 +572,30 @@ def local_plan(organizations: list[str], suffix, repo_filter, update_webhooks, u
     default=False,
     help="enables deletion of resources if they are missing in the definition",
 )
+@click.option(
+    "--patch-concurrency",
+    type=click.IntRange(min=1),
+    show_default=True,
+    default=_DEFAULT_PATCH_CONCURRENCY,
+    help="number of patches to apply concurrently",
+)
 def apply(
     organizations: list[str],
     force,
     no_web_ui,
+    refresh_web_settings,
     repo_filter,
     update_webhooks,
     update_secrets,
     update_filter,
     delete_resources,
+    patch_concurrency,
 ):
     """
     Apply changes based on the current configuration to the live configuration at GitHub.
     """
+    from otterdog.operations.apply import ApplyOperation
+
     _execute_operation(
         organizations,
         ApplyOperation(
@@ -502,7 +606,9 @@ def apply(
             update_secrets=update_secrets,
             update_filter=update_filter,
             delete_resources=delete_resources,
+            patch_concurrency=patch_concurrency,
         ),
+        refresh_web_settings=refresh_web_settings,
     )
 
 
@@ -564,6 +670,13 @@ def apply(
     default=False,
     help="enables deletion of resources if they are missing in the definition",
 )
+@click.option(
+    "--patch-concurrency",
+    type=click.IntRange(min=1),
+    show_default=True,
+    default=_DEFAULT_PATCH_CONCURRENCY,
+    help="number of patches to apply concurrently",
+)
 def local_apply(
     organizations: list[str],
     force,
@@ -574,10 +687,13 @@ def local_apply(
     update_filter,
     delete_resources,
     suffix,
+    patch_concurrency,
 ):
     """
     Apply changes based on the current configuration to another local configuration.
     """
+    from otterdog.operations.local_apply import LocalApplyOperation
+
     _execute_operation(
         organizations,
         LocalApplyOperation(
@@ -589,6 +705,7 @@ def local_apply(
             update_secrets=update_secrets,
             update_filter=update_filter,
             delete_resources=delete_resources,
+            patch_concurrency=patch_concurrency,
         ),
     )
 
@@ -604,6 +721,8 @@ def sync_template(organizations: list[str], repo):
     """
     Sync contents of repositories created from a template repository.
     """
+    from otterdog.operations.sync_template import SyncTemplateOperation
+
     _execute_operation(organizations, SyncTemplateOperation(repo=repo))
 
 
@@ -623,6 +742,8 @@ def delete_file(organizations: list[str], repo, path, message):
     """
     Delete files in a repository.
     """
+    from otterdog.operations.delete_file import DeleteFileOperation
+
     _execute_operation(organizations, DeleteFileOperation(repo=repo, path=path, message=message))
 
 
@@ -631,6 +752,8 @@ def canonical_diff(organizations: list[str]):
     """
     Displays a diff of the current configuration to a canonical version.
     """
+    from otterdog.operations.canonical_diff import CanonicalDiffOperation
+
     _execute_operation(organizations, CanonicalDiffOperation())
 
 
@@ -639,6 +762,8 @@ def web_login(organizations: list[str]):
     """
     Opens a new browser window and logins to GitHub with the bot account for the organization.
     """
+    from otterdog.operations.web_login import WebLoginOperation
+
     _execute_operation(organizations, WebLoginOperation())
 
 
@@ -653,6 +778,7 @@ def install_app(app_slug: str, organizations: list[str]):
     """
     Installs a GitHub App.
     """
+    from otterdog.operations.install_app import InstallAppOperation
 
     _execute_operation(organizations, InstallAppOperation(app_slug))
 
@@ -668,6 +794,7 @@ def uninstall_app(app_slug: str, organizations: list[str]):
     """
     Uninstalls a GitHub App.
     """
+    from otterdog.operations.uninstall_app import UninstallAppOperation
 
     _execute_operation(organizations, UninstallAppOperation(app_slug))
 
@@ -700,6 +827,7 @@ def review_permissions(app_slug, grant, force, organizations: list[str]):
     """
     Reviews permission updates for installed apps.
     """
+    from otterdog.operations.review_app_permissions import ReviewAppPermissionsOperation
 
     _execute_operation(organizations, ReviewAppPermissionsOperation(app_slug, grant, force))
 
@@ -723,7 +851,17 @@ def install_deps():
         print_error(f"could not install required dependencies: {status}")
 
 
-def _execute_operation(organizations: list[str], operation: Operation):
+def _execute_operation(
+    organizations: list[str],
+    operation: Operation,
+    parallel: int = 1,
+    refresh_web_settings: bool = False,
+):
+    from otterdog.cache import set_github_cache, set_snapshot_store, set_web_settings_cache
+    from otterdog.providers.github.cache.file import file_cache
+    from otterdog.providers.github.web_settings import file_web_settings_cache
+    from otterdog.snapshot.file import file_snapshot_store
+
     printer = IndentingPrinter(sys.stdout)
     printer.println()
 
@@ -733,7 +871,11 @@ def _execute_operation(organizations: list[str], operation: Operation):
 
         assert config is not None
 
-        set_github_cache(file_cache())
+        set_github_cache(file_cache(max_stale=config.github_cache_max_stale))
+        if config.github_snapshot_max_age > 0:
+            set_snapshot_store(file_snapshot_store(config.github_snapshot_max_age))
+        if config.github_web_settings_max_age > 0:
+            set_web_settings_cache(file_web_settings_cache(config.github_web_settings_max_age, refresh_web_settings))
 
         operation.init(config, printer)
         operation.pre_execute()
@@ -743,9 +885,10 @@ def _execute_operation(organizations: list[str], operation: Operation):
         if len(organizations) == 0:
             organizations = config.organization_names
 
-        for organization in organizations:
-            org_config = config.get_organization_config(organization)
-            exit_code = max(exit_code, asyncio.run(operation.execute(org_config)))
+        if parallel > 1 and len(organizations) > 1:
+            exit_code = asyncio.run(_execute_operation_in_parallel(config, organizations, operation, parallel, printer))
+        else:
+            exit_code = asyncio.run(_execute_operation_sequentially(config, organizations, operation))
 
         operation.post_execute()
         sys.exit(exit_code)
@@ -758,5 +901,79 @@ def _execute_operation(organizations: list[str], operation: Operation):
         sys.exit(2)
 
 
+async def _execute_operation_sequentially(
+    config: OtterdogConfig,
+    organizations: list[str],
+    operation: Operation,
+) -> int:
+    # run the operation for all organizations in the same event loop, so that
+    # resources like the browser used to access the web interface can be shared.
+    try:
+        exit_code = 0
+        for organization in organizations:
+            org_config = config.get_organization_config(organization)
+            exit_code = max(exit_code, await operation.execute(org_config))
+
+        return exit_code
+    finally:
+        await _close_shared_resources()
+
+
+async def _execute_operation_in_parallel(
+    config: OtterdogConfig,
+    organizations: list[str],
+    operation: Operation,
+    parallel: int,
+    printer: IndentingPrinter,
+) -> int:
+    # run the operation for multiple organizations in the same event loop, so that
+    # clients of the same account share their rate limit budget.
+    # the output of each organization is buffered and printed in the original order
+    # as soon as the organization and all organizations before it have been processed.
+    semaphore = asyncio.Semaphore(parallel)
+
+    async def execute(organization: str) -> tuple[int, str]:
+        buffer = StringIO()
+        org_operation = operation.with_printer(IndentingPrinter(buffer))
+
+        async with semaphore:
+            try:
+                org_config = config.get_organization_config(organization)
+                exit_code = await org_operation.execute(org_config)
+            except Exception as e:
+                if is_debug_enabled():
+                    traceback.print_exception(e)
+
+                org_operation.printer.println(f"failed to process organization '{organization}': {e}")
+                exit_code = 2
+
+        return exit_code, buffer.getvalue()
+
+    tasks = [asyncio.create_task(execute(organization)) for organization in organizations]
+
+    try:
+        exit_code = 0
+        for task in tasks:
+            org_exit_code, output = await task
+            printer.writer.write(output)
+            printer.writer.flush()
+            exit_code = max(exit_code, org_exit_code)
+
+        return exit_code
+    finally:
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await _close_shared_resources()
+
+
+async def _close_shared_resources() -> None:
+    # browsers can only be open if the web module has been loaded, do not import playwright otherwise
+    web = sys.modules.get("otterdog.providers.github.web")
+    if web is not None:
+        await web.close_browsers()
+
+
 if __name__ == "__main__":
     cli()
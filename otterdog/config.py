@@ -21,6 +21,8 @@ from .jsonnet import JsonnetConfig
 from .utils import deep_merge_dict, print_trace, query_json
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from otterdog.credentials import CredentialProvider, Credentials
 
 
@@ -128,6 +130,9 @@ class SecretResolver(Protocol):
     @abstractmethod
     def get_secret(self, data: str) -> str: ...
 
+    def get_secrets(self, secret_data: Iterable[str]) -> dict[str, str]:
+        return {data: self.get_secret(data) for data in secret_data}
+
 
 class OtterdogConfig(SecretResolver):
     def __init__(self, config_file: str, local_mode: bool, working_dir: str | None = None):
@@ -137,6 +142,8 @@ class OtterdogConfig(SecretResolver):
         self._config_file = os.path.realpath(config_file)
         self._config_dir = os.path.dirname(self._config_file)
         self._credential_providers: dict[str, CredentialProvider] = {}
+        # resolved secrets are kept in memory only, the config is not reused across runs
+        self._resolved_secrets: dict[str, str] = {}
 
         self._local_mode = local_mode
 
@@ -194,6 +201,22 @@ class OtterdogConfig(SecretResolver):
     def default_config_repo(self) -> str:
         return self._github_config.get("config_repo", ".otterdog")
 
+    @property
+    def github_cache_max_stale(self) -> int:
+        return int(self._github_config.get("cache_max_stale", 0))
+
+    @property
+    def github_snapshot_max_age(self) -> int:
+        return int(self._github_config.get("snapshot_max_age", 0))
+
+    @property
+    def github_web_settings_max_age(self) -> int:
+        return int(self._github_config.get("web_settings_max_age", 0))
+
+    @property
+    def github_bulk_load(self) -> bool:
+        return bool(self._github_config.get("bulk_load", False))
+
     @property
     def default_base_template(self) -> str:
         base_template = self._jsonnet_config.get("base_template")
@@ -283,15 +306,35 @@ class OtterdogConfig(SecretResolver):
         return provider_type in ["pass", "bitwarden"]
 
     def get_secret(self, secret_data: str) -> str:
-        if secret_data and ":" in secret_data:
-            provider_type, data = re.split(":", secret_data)
+        return self.get_secrets([secret_data])[secret_data]
+
+    def get_secrets(self, secret_data: Iterable[str]) -> dict[str, str]:
+        """
+        Resolves several secrets at once, each distinct secret is retrieved only once
+        from its credential provider and the secrets of each provider are retrieved together.
+        """
+        result = {}
+        unresolved_data_by_provider: dict[str, dict[str, str]] = {}
+
+        for data in secret_data:
+            if data in self._resolved_secrets:
+                result[data] = self._resolved_secrets[data]
+            elif data and ":" in data:
+                provider_type, provider_data = re.split(":", data)
+                unresolved_data_by_provider.setdefault(provider_type, {})[data] = provider_data
+            else:
+                result[data] = data
+
+        for provider_type, unresolved_data in unresolved_data_by_provider.items():
             provider = self._get_credential_provider(provider_type)
             if provider is not None:
-                return provider.get_secret(data)
+                secrets = provider.get_secrets(list(set(unresolved_data.values())))
+                for data, provider_data in unresolved_data.items():
+                    self._resolved_secrets[data] = result[data] = secrets[provider_data]
             else:
-                return secret_data
-        else:
-            return secret_data
+                result.update({data: data for data in unresolved_data})
+
+        return result
 
     def __repr__(self):
         return f"OtterdogConfig('{self.config_file}')"
@@ -9,14 +9,23 @@
 from __future__ import annotations
 
 import dataclasses
+import hashlib
 from abc import abstractmethod
-from typing import TYPE_CHECKING, Protocol
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Protocol, TypeVar
 
 from otterdog.utils import print_info, print_trace
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Iterable
     from typing import Any
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# the maximum number of lookups, e.g. processes accessing a vault, that are run concurrently
+_MAX_CONCURRENT_LOOKUPS = 8
+
 
 @dataclasses.dataclass
 class Credentials:
@@ -29,6 +38,9 @@ class Credentials:
     _totp_secret: str | None
     _github_token: str | None
 
+    # identifies the account whose rate limits apply, e.g. an app installation, defaults to the token
+    _account_key: str | None = None
+
     _last_totp: str | None = None
 
     @property
@@ -72,6 +84,13 @@ class Credentials:
         else:
             return self._github_token
 
+    @property
+    def account_key(self) -> str:
+        if self._account_key is not None:
+            return self._account_key
+        else:
+            return hashlib.sha256(self.github_token.encode("utf-8")).hexdigest()
+
     def __str__(self) -> str:
         return f"Credentials(username={self.username})"
 
@@ -82,3 +101,18 @@ class CredentialProvider(Protocol):
 
     @abstractmethod
     def get_secret(self, data: str) -> str: ...
+
+    def get_secrets(self, data: Collection[str]) -> dict[str, str]:
+        """
+        Retrieves several secrets at once, returning the secret for each of the given data.
+        """
+        return dict(zip(data, map_concurrently(self.get_secret, data), strict=True))
+
+
+def map_concurrently(fn: Callable[[T], R], items: Iterable[T]) -> list[R]:
+    """
+    Applies the function to each item using a bounded pool of threads,
+    returning the results in the order of the items.
+    """
+    with ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_LOOKUPS) as executor:
+        return list(executor.map(fn, items))
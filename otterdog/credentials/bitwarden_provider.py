@@ -13,9 +13,10 @@ import subprocess
 from typing import TYPE_CHECKING
 
 from otterdog import utils
-from otterdog.credentials import CredentialProvider, Credentials
+from otterdog.credentials import CredentialProvider, Credentials, map_concurrently
 
 if TYPE_CHECKING:
+    from collections.abc import Collection
     from typing import Any
 
 
@@ -49,16 +50,8 @@ class BitwardenVault(CredentialProvider):
         if api_token_key is None:
             api_token_key = self._api_token_key
 
-        status, output = subprocess.getstatusoutput(f"bw get item {item_id}")
-        if status != 0:
-            raise RuntimeError(f"item with id '{item_id}' not found in your bitwarden vault: {output}")
-        else:
-            start_index = output.index("{")
-            end_index = output.rindex("}")
-            output = output[start_index : end_index + 1]
-
-        # load the item json string and access the field containing the GitHub token
-        item = json.loads(output)
+        # access the field containing the GitHub token
+        item = self._get_item(item_id)
 
         token_field = next(filter(lambda k: k["name"] == api_token_key, item.get("fields", [])), None)
         if token_field is None:
@@ -88,32 +81,59 @@ class BitwardenVault(CredentialProvider):
         return Credentials(username, password, totp_secret, github_token)
 
     def get_secret(self, data: str) -> str:
+        return self.get_secrets([data])[data]
+
+    def get_secrets(self, data: Collection[str]) -> dict[str, str]:
+        # retrieve each referenced item only once, regardless of how many of its fields are needed
+        secret_keys_by_item: dict[str, list[tuple[str, str]]] = {}
+        for secret_data in data:
+            item_id, secret_key = self._parse_secret_data(secret_data)
+            secret_keys_by_item.setdefault(item_id, []).append((secret_data, secret_key))
+
+        item_ids = list(secret_keys_by_item)
+        items = map_concurrently(self._get_item, item_ids)
+
+        secrets = {}
+        for item_id, item in zip(item_ids, items, strict=True):
+            for secret_data, secret_key in secret_keys_by_item[item_id]:
+                secrets[secret_data] = self._get_secret_field(item_id, item, secret_key)
+
+        return secrets
+
+    @staticmethod
+    def _parse_secret_data(data: str) -> tuple[str, str]:
         from re import split
 
         try:
             item_id, secret_key = split("@", data)
+            return item_id, secret_key
+        except ValueError:
+            raise RuntimeError(f"failed to parse secret data '{data}'") from None
 
-            status, output = subprocess.getstatusoutput(f"bw get item {item_id}")
-            if status != 0:
-                raise RuntimeError(f"item with id '{item_id}' not found in your bitwarden vault: {output}")
-
-            if status != 0:
-                raise RuntimeError(f"item with id '{item_id}' not found in your bitwarden vault")
+    @staticmethod
+    def _get_item(item_id: str) -> dict[str, Any]:
+        status, output = subprocess.getstatusoutput(f"bw get item {item_id}")
+        if status != 0:
+            raise RuntimeError(f"item with id '{item_id}' not found in your bitwarden vault: {output}")
+        else:
+            start_index = output.index("{")
+            end_index = output.rindex("}")
+            output = output[start_index : end_index + 1]
 
-            # load the item json string and access the field containing the GitHub token
-            item = json.loads(output)
+        # load the item json string
+        return json.loads(output)
 
-            secret_field = next(filter(lambda k: k["name"] == secret_key, item.get("fields", [])), None)
-            if secret_field is None:
-                raise RuntimeError(f"field with key '{secret_key}' not found in item with id '{item_id}'")
+    @staticmethod
+    def _get_secret_field(item_id: str, item: dict[str, Any], secret_key: str) -> str:
+        secret_field = next(filter(lambda k: k["name"] == secret_key, item.get("fields", [])), None)
+        if secret_field is None:
+            raise RuntimeError(f"field with key '{secret_key}' not found in item with id '{item_id}'")
 
-            secret = secret_field.get("value")
-            if secret is None:
-                raise RuntimeError(f"field with key '{secret_key}' is empty in item with id '{item_id}'")
+        secret = secret_field.get("value")
+        if secret is None:
+            raise RuntimeError(f"field with key '{secret_key}' is empty in item with id '{item_id}'")
 
-            return secret
-        except ValueError:
-            raise RuntimeError(f"failed to parse secret data '{data}'") from None
+        return secret
 
     def __repr__(self):
         return f"BitWardenVault(unlocked={self.is_unlocked()})"
@@ -6,8 +6,14 @@
 #  SPDX-License-Identifier: EPL-2.0
 #  *******************************************************************************
 
+import asyncio
+import contextlib
+import copy
 import os
+import re
+import time
 from asyncio import Lock
+from collections.abc import AsyncIterator
 from functools import cached_property
 from shutil import ignore_patterns
 from typing import Any
@@ -24,6 +30,18 @@ from .utils import (
 
 _template_lock = Lock()
 
+# the directories containing the resolved content of templates, keyed by the
+# template store, url and ref, together with the time they need to be resolved again.
+_resolved_templates: dict[tuple[str, str, str], tuple[str, float | None]] = {}
+
+# refs tracking a branch are resolved again after this amount of seconds
+_BRANCH_RESOLUTION_TTL = 60
+
+_COMMIT_SHA_PATTERN = re.compile(r"[0-9a-f]{40}")
+
+# default configs of templates, keyed by the content hash of the template
+_default_configs_cache: dict[str, dict[str, Any]] = {}
+
 
 class JsonnetConfig:
     # FIXME: the function names to create resources should not be hard-coded but
@@ -105,151 +123,171 @@ class JsonnetConfig:
 
     @cached_property
     def default_org_config(self) -> dict[str, Any]:
-        return self.default_org_config_for_org_id("default")
+        default_configs = self._default_configs
+        default_config = default_configs.get("org") if default_configs is not None else None
+        if default_config is None:
+            return self.default_org_config_for_org_id("default")
+        else:
+            return default_config
 
     @cached_property
     def default_org_custom_property_config(self):
-        try:
-            # load the default org custom property config
-            org_custom_property_snippet = (
-                f"(import '{self.template_file}').{self.create_org_custom_property}('default')"
-            )
-            return jsonnet_evaluate_snippet(org_custom_property_snippet)
-        except RuntimeError:
-            print_debug("no default org custom property config found, custom properties will be skipped")
-            return None
+        return self._get_default_config(
+            "org_custom_property", "no default org custom property config found, custom properties will be skipped"
+        )
 
     @cached_property
     def default_org_webhook_config(self):
-        try:
-            # load the default org webhook config
-            org_webhook_snippet = f"(import '{self.template_file}').{self.create_org_webhook}('default')"
-            return jsonnet_evaluate_snippet(org_webhook_snippet)
-        except RuntimeError:
-            print_debug("no default org webhook config found, webhooks will be skipped")
-            return None
+        return self._get_default_config("org_webhook", "no default org webhook config found, webhooks will be skipped")
 
     @cached_property
     def default_org_secret_config(self):
-        try:
-            # load the default org secret config
-            org_secret_snippet = f"(import '{self.template_file}').{self.create_org_secret}('default')"
-            return jsonnet_evaluate_snippet(org_secret_snippet)
-        except RuntimeError:
-            print_debug("no default org secret config found, secrets will be skipped")
-            return None
+        return self._get_default_config("org_secret", "no default org secret config found, secrets will be skipped")
 
     @cached_property
     def default_org_variable_config(self):
-        try:
-            # load the default org variable config
-            org_variable_snippet = f"(import '{self.template_file}').{self.create_org_variable}('default')"
-            return jsonnet_evaluate_snippet(org_variable_snippet)
-        except RuntimeError:
-            print_debug("no default org variable config found, variables will be skipped")
-            return None
+        return self._get_default_config(
+            "org_variable", "no default org variable config found, variables will be skipped"
+        )
 
     @cached_property
     def default_repo_config(self):
-        try:
-            # load the default repo config
-            repo_snippet = f"(import '{self.template_file}').{self.create_repo}('default')"
-            return jsonnet_evaluate_snippet(repo_snippet)
-        except RuntimeError:
-            print_debug("no default repo config found, repos will be skipped")
-            return None
+        return self._get_default_config("repo", "no default repo config found, repos will be skipped")
 
     @cached_property
     def default_repo_webhook_config(self):
-        try:
-            # load the default repo webhook config
-            repo_webhook_snippet = f"(import '{self.template_file}').{self.create_repo_webhook}('default')"
-            return jsonnet_evaluate_snippet(repo_webhook_snippet)
-        except RuntimeError:
-            print_debug("no default repo webhook config found, webhooks will be skipped")
-            return None
+        return self._get_default_config(
+            "repo_webhook", "no default repo webhook config found, webhooks will be skipped"
+        )
 
     @cached_property
     def default_repo_secret_config(self):
-        try:
-            # load the default repo secret config
-            repo_secret_snippet = f"(import '{self.template_file}').{self.create_repo_secret}('default')"
-            return jsonnet_evaluate_snippet(repo_secret_snippet)
-        except RuntimeError:
-            print_debug("no default repo secret config found, secrets will be skipped")
-            return None
+        return self._get_default_config("repo_secret", "no default repo secret config found, secrets will be skipped")
 
     @cached_property
     def default_repo_variable_config(self):
-        try:
-            # load the default repo variable config
-            repo_variable_snippet = f"(import '{self.template_file}').{self.create_repo_variable}('default')"
-            return jsonnet_evaluate_snippet(repo_variable_snippet)
-        except RuntimeError:
-            print_debug("no default repo variable config found, variables will be skipped")
-            return None
+        return self._get_default_config(
+            "repo_variable", "no default repo variable config found, variables will be skipped"
+        )
 
     @cached_property
     def default_branch_protection_rule_config(self):
-        try:
-            # load the default branch protection rule config
-            branch_protection_snippet = (
-                f"(import '{self.template_file}').{self.create_branch_protection_rule}('default')"
-            )
-            return jsonnet_evaluate_snippet(branch_protection_snippet)
-        except RuntimeError:
-            print_debug("no default branch protection rule config found, branch protection rules will be skipped")
-            return None
+        return self._get_default_config(
+            "branch_protection_rule",
+            "no default branch protection rule config found, branch protection rules will be skipped",
+        )
 
     @cached_property
     def default_repo_ruleset_config(self):
-        try:
-            # load the default repo ruleset config
-            repo_ruleset_snippet = f"(import '{self.template_file}').{self.create_repo_ruleset}('default')"
-            return jsonnet_evaluate_snippet(repo_ruleset_snippet)
-        except RuntimeError:
-            print_debug("no default repo ruleset config found, rulesets will be skipped")
-            return None
+        return self._get_default_config(
+            "repo_ruleset", "no default repo ruleset config found, rulesets will be skipped"
+        )
 
     @cached_property
     def default_environment_config(self):
-        try:
-            # load the default environment config
-            environment_snippet = f"(import '{self.template_file}').{self.create_environment}('default')"
-            return jsonnet_evaluate_snippet(environment_snippet)
-        except RuntimeError:
-            print_debug("no default environment config found, environments will be skipped")
-            return None
+        return self._get_default_config(
+            "environment", "no default environment config found, environments will be skipped"
+        )
 
     @cached_property
     def default_pull_request_config(self):
-        try:
-            # load the default pull request config
-            pull_request_snippet = f"(import '{self.template_file}').{self.create_pull_request}()"
-            return jsonnet_evaluate_snippet(pull_request_snippet)
-        except RuntimeError:
-            print_debug("no default pull request config found, pull requests will be skipped")
-            return None
+        return self._get_default_config(
+            "pull_request", "no default pull request config found, pull requests will be skipped"
+        )
 
     @cached_property
     def default_status_checks_config(self):
-        try:
-            # load the default status check config
-            status_checks_snippet = f"(import '{self.template_file}').{self.create_status_checks}()"
-            return jsonnet_evaluate_snippet(status_checks_snippet)
-        except RuntimeError:
-            print_debug("no default status checks config found, status checks will be skipped")
-            return None
+        return self._get_default_config(
+            "status_checks", "no default status checks config found, status checks will be skipped"
+        )
 
     @cached_property
     def default_merge_queue_config(self):
-        try:
-            # load the default merge queue config
-            merge_queue_snippet = f"(import '{self.template_file}').{self.create_merge_queue}()"
-            return jsonnet_evaluate_snippet(merge_queue_snippet)
-        except RuntimeError:
-            print_debug("no default merge queue config found, merge queues will be skipped")
-            return None
+        return self._get_default_config(
+            "merge_queue", "no default merge queue config found, merge queues will be skipped"
+        )
+
+    @property
+    def _default_config_functions(self) -> dict[str, tuple[str, str]]:
+        return {
+            "org": (self.create_org, "'default'"),
+            "org_custom_property": (self.create_org_custom_property, "'default'"),
+            "org_webhook": (self.create_org_webhook, "'default'"),
+            "org_secret": (self.create_org_secret, "'default'"),
+            "org_variable": (self.create_org_variable, "'default'"),
+            "repo": (self.create_repo, "'default'"),
+            "repo_webhook": (self.create_repo_webhook, "'default'"),
+            "repo_secret": (self.create_repo_secret, "'default'"),
+            "repo_variable": (self.create_repo_variable, "'default'"),
+            "branch_protection_rule": (self.create_branch_protection_rule, "'default'"),
+            "repo_ruleset": (self.create_repo_ruleset, "'default'"),
+            "environment": (self.create_environment, "'default'"),
+            "pull_request": (self.create_pull_request, ""),
+            "status_checks": (self.create_status_checks, ""),
+            "merge_queue": (self.create_merge_queue, ""),
+        }
+
+    @cached_property
+    def _template_hash(self) -> str:
+        # the hash covers the template file and all files it might import from the template directory
+        import hashlib
+
+        digest = hashlib.sha256(self._base_template_file.encode("utf-8"))
+        for root, dirs, files in os.walk(self.template_dir):
+            dirs.sort()
+            for file in sorted(files):
+                path = os.path.join(root, file)
+                digest.update(os.path.relpath(path, self.template_dir).encode("utf-8"))
+                with open(path, "rb") as fp:
+                    digest.update(hashlib.sha256(fp.read()).digest())
+
+        return digest.hexdigest()
+
+    @cached_property
+    def _default_configs(self) -> dict[str, Any] | None:
+        """
+        Evaluates all default configs of the template in a single evaluation.
+
+        The result is cached by the content hash of the template, so that organizations using
+        the same template reuse the default configs instead of evaluating the template again.
+        """
+        template_hash = self._template_hash
+        default_configs = _default_configs_cache.get(template_hash)
+
+        if default_configs is None:
+            fields = ",\n".join(
+                f"'{key}': if std.objectHasAll(template, '{function}') then template.{function}({args}) else null"
+                for key, (function, args) in self._default_config_functions.items()
+            )
+            snippet = f"local template = import '{self.template_file}';\n{{\n{fields}\n}}"
+
+            try:
+                default_configs = jsonnet_evaluate_snippet(snippet)
+            except RuntimeError as ex:
+                print_debug(f"failed to evaluate default configs of template '{self.template_file}': {ex}")
+                return None
+
+            _default_configs_cache[template_hash] = default_configs
+
+        return copy.deepcopy(default_configs)
+
+    def _get_default_config(self, key: str, missing_message: str) -> dict[str, Any] | None:
+        default_configs = self._default_configs
+        if default_configs is not None:
+            default_config = default_configs.get(key)
+        else:
+            # fall back to evaluating the default config on its own if not all
+            # default configs of the template could be evaluated at once
+            try:
+                function, args = self._default_config_functions[key]
+                default_config = jsonnet_evaluate_snippet(f"(import '{self.template_file}').{function}({args})")
+            except RuntimeError:
+                default_config = None
+
+        if default_config is None:
+            print_debug(missing_message)
+
+        return default_config
 
     @property
     def template_dir(self) -> str:
@@ -283,41 +321,139 @@ class JsonnetConfig:
         return f"import 'vendor/{self._base_template_repo_name}/{self._base_template_file}'"
 
     async def _init_base_template(self) -> None:
-        import git
         from aiofiles.os import makedirs
         from aiofiles.ospath import exists
-        from aioshutil import copytree, rmtree
+
+        from otterdog.cache import get_template_store_dir
 
         print_debug(f"initializing base template '{self._base_template_repo_url}@{self._base_template_ref}'")
 
-        template_owner, template_repository = parse_github_url(self._base_template_repo_url)
+        store_dir = get_template_store_dir()
+        if store_dir is None:
+            store_dir = f"{self.base_dir}/templates"
 
         async with _template_lock:
-            # cache the template repo with the requested ref in the 'templates' directory
-            template_dir = f"{self.base_dir}/templates/{template_owner}/{template_repository}/{self._base_template_ref}"
-
-            if not await exists(f"{template_dir}/.git"):
-                print_debug(f"cloning base template from url '{self._base_template_repo_url}'")
-                repo = git.Repo.clone_from(self._base_template_repo_url, template_dir)
-                repo.git.checkout(self._base_template_ref)
-            else:
-                repo = git.Repo(template_dir)
-                if not repo.head.is_detached:
-                    print_debug(
-                        f"pulling changes from base template url '{self._base_template_repo_url}' "
-                        f"for ref '{repo.head.ref}'"
-                    )
-                    repo.remotes.origin.pull()
+            key = (store_dir, self._base_template_repo_url, self._base_template_ref)
+            resolved = _resolved_templates.get(key)
+
+            # the content of a branch might change, resolve it again after some time
+            if resolved is None or (resolved[1] is not None and resolved[1] < time.monotonic()):
+                commit_dir, is_pinned = await self._fetch_base_template(store_dir)
+                resolved = (commit_dir, None if is_pinned else time.monotonic() + _BRANCH_RESOLUTION_TTL)
+                _resolved_templates[key] = resolved
 
         # create base directory if it does not exist yet
         if not await exists(self.org_dir):
             await makedirs(self.org_dir)
 
-        if await exists(f"{self.org_dir}/vendor"):
-            await rmtree(f"{self.org_dir}/vendor")
+        await self._link_template_dir(resolved[0])
+
+    async def _fetch_base_template(self, store_dir: str) -> tuple[str, bool]:
+        """
+        Fetches the base template and returns the directory containing the content of the
+        resolved commit, together with whether the ref is pinned to a specific commit.
+        """
+        from aiofiles.ospath import exists
 
-        # copy over the cloned template repository
-        await copytree(template_dir, self.template_dir, ignore=ignore_patterns(".git"))
+        template_owner, template_repository = parse_github_url(self._base_template_repo_url)
+        ref = self._base_template_ref
+        commits_dir = f"{store_dir}/.commits/{template_owner}/{template_repository}"
+
+        # a pinned commit whose content is already present does not need to be fetched at all
+        if _COMMIT_SHA_PATTERN.fullmatch(ref) is not None:
+            commit_dir = f"{commits_dir}/{ref}"
+            if await exists(commit_dir):
+                return commit_dir, True
+
+        # cache the template repo with the requested ref in the template store
+        template_dir = f"{store_dir}/{template_owner}/{template_repository}/{ref}"
+
+        # the template store might be shared by several processes, e.g. the workers of the webapp
+        async with _file_lock(f"{template_dir}.lock"):
+            return await self._update_base_template(template_dir, commits_dir)
+
+    async def _update_base_template(self, template_dir: str, commits_dir: str) -> tuple[str, bool]:
+        import git
+        from aiofiles.ospath import exists
+        from aioshutil import copytree, rmtree
+
+        ref = self._base_template_ref
+
+        if not await exists(f"{template_dir}/.git"):
+            print_debug(f"cloning base template from url '{self._base_template_repo_url}'")
+            repo = git.Repo.clone_from(self._base_template_repo_url, template_dir)
+            repo.git.checkout(ref)
+        else:
+            repo = git.Repo(template_dir)
+            # refs pointing to a tag or commit are checked out as detached head and do not change
+            if not repo.head.is_detached:
+                print_debug(
+                    f"pulling changes from base template url '{self._base_template_repo_url}' for ref '{repo.head.ref}'"
+                )
+                repo.remotes.origin.pull()
+
+        is_pinned = repo.head.is_detached
+        commit_sha = repo.head.commit.hexsha
+        commit_dir = f"{commits_dir}/{commit_sha}"
+
+        # the content of each commit is copied only once, shared by all organizations using it
+        if not await exists(commit_dir):
+            print_debug(f"storing content of base template for commit '{commit_sha}'")
+            tmp_dir = f"{commit_dir}.{os.getpid()}.tmp"
+            await copytree(template_dir, tmp_dir, ignore=ignore_patterns(".git"), dirs_exist_ok=True)
+
+            try:
+                await aiofiles.os.rename(tmp_dir, commit_dir)
+            except OSError:
+                # another process stored the same commit concurrently
+                await rmtree(tmp_dir)
+
+        return commit_dir, is_pinned
+
+    async def _link_template_dir(self, commit_dir: str) -> None:
+        from aiofiles.os import makedirs, readlink, symlink, unlink
+        from aiofiles.ospath import exists, islink
+        from aioshutil import copytree, rmtree
+
+        vendor_dir = f"{self.org_dir}/vendor"
+        link_target = os.path.relpath(commit_dir, vendor_dir)
+
+        if await islink(self.template_dir):
+            if await readlink(self.template_dir) == link_target:
+                return
+
+            await unlink(self.template_dir)
+        elif await exists(vendor_dir):
+            await rmtree(vendor_dir)
+
+        await makedirs(vendor_dir, exist_ok=True)
+
+        try:
+            await symlink(link_target, self.template_dir, target_is_directory=True)
+        except OSError as ex:
+            # fall back to copying the template if symbolic links are not supported
+            print_debug(f"failed to link base template, copying it instead: {ex}")
+            await copytree(commit_dir, self.template_dir)
 
     def __repr__(self) -> str:
         return f"JsonnetConfig('{self._base_dir}, '{self._base_template_file}')"
+
+
+@contextlib.asynccontextmanager
+async def _file_lock(lock_file: str) -> AsyncIterator[None]:
+    """
+    Acquires an exclusive lock on the given file that is shared across processes.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        # locking files is not supported on this platform, e.g. windows
+        yield
+        return
+
+    os.makedirs(os.path.dirname(lock_file), exist_ok=True)
+
+    # the lock is released when the file is closed, even if acquiring it has been cancelled
+    with open(lock_file, "w") as file:
+        await asyncio.to_thread(fcntl.flock, file.fileno(), fcntl.LOCK_EX)
+        yield
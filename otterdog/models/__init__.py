@@ -9,6 +9,7 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
 import os
 from abc import ABC, abstractmethod
 from enum import Enum
@@ -20,6 +21,7 @@ from otterdog.utils import (
     UNSET,
     Change,
     IndentingPrinter,
+    PrefixTrie,
     T,
     associate_by_key,
     is_different_ignoring_order,
@@ -32,7 +34,7 @@ from otterdog.utils import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterator, Sequence
+    from collections.abc import Callable, Iterable, Iterator, Sequence
 
     from otterdog.config import SecretResolver
     from otterdog.jsonnet import JsonnetConfig
@@ -42,6 +44,54 @@ MT = TypeVar("MT", bound="ModelObject")
 EMT = TypeVar("EMT", bound="EmbeddedModelObject")
 
 
+def nested_model_list(key: str, from_model_data: Callable[[Any], Any]) -> Callable[[dict[str, Any]], Any]:
+    """
+    Returns a converter for a list of nested model objects, a missing list is converted to an empty list.
+    """
+
+    def convert(data: dict[str, Any]) -> Any:
+        return [from_model_data(x) for x in data.get(key, [])]
+
+    return convert
+
+
+def nested_model(
+    key: str, from_model_data: Callable[[Any], Any], default: Any = UNSET
+) -> Callable[[dict[str, Any]], Any]:
+    """
+    Returns a converter for a nested model object, a missing or null value is converted to the given default.
+    """
+
+    def convert(data: dict[str, Any]) -> Any:
+        value = data.get(key)
+        return default if value is None else from_model_data(value)
+
+    return convert
+
+
+@functools.cache
+def _get_model_data_loader(
+    model_class: type[ModelObject] | type[EmbeddedModelObject],
+) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    """
+    Returns a function that converts model data to the keyword arguments to construct the given model class.
+    The loader is built once per class, so no mapping needs to be created for every object.
+    """
+    converters: dict[str, Callable[[dict[str, Any]], Any]] = model_class.get_model_data_converters()
+    field_names = [field.name for field in dataclasses.fields(model_class)]
+
+    plain_keys = tuple(name for name in field_names if name not in converters)
+    converted_keys = tuple((name, converters[name]) for name in field_names if name in converters)
+
+    def load(data: dict[str, Any]) -> dict[str, Any]:
+        kwargs = {key: data.get(key, UNSET) for key in plain_keys}
+        for key, convert in converted_keys:
+            kwargs[key] = convert(data)
+        return kwargs
+
+    return load
+
+
 class FailureType(Enum):
     INFO = 1
     WARNING = 2
@@ -170,7 +220,7 @@ class LivePatchHandler(Protocol):
     def __call__(self, patch: LivePatch) -> None: ...
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class EmbeddedModelObject(ABC):
     """
     The abstract base class for embedded model objects.
@@ -219,8 +269,9 @@ class EmbeddedModelObject(ABC):
         write_patch_object_as_json(patch, printer)
 
     @classmethod
-    def all_fields(cls) -> list[dataclasses.Field]:
-        return list(dataclasses.fields(cls))
+    @functools.cache
+    def all_fields(cls) -> tuple[dataclasses.Field, ...]:
+        return dataclasses.fields(cls)
 
     def keys(self, exclude_unset_keys: bool = True) -> list[str]:
         result = []
@@ -246,12 +297,15 @@ class EmbeddedModelObject(ABC):
 
     @classmethod
     def from_model_data(cls: type[EMT], data: dict[str, Any]) -> EMT:
-        mapping = cls.get_mapping_from_model()
-        return cls(**bend(mapping, data))  # type: ignore
+        return cls(**_get_model_data_loader(cls)(data))
 
     @classmethod
-    def get_mapping_from_model(cls) -> dict[str, Any]:
-        return {k: OptionalS(k, default=UNSET) for k in (x.name for x in cls.all_fields())}
+    def get_model_data_converters(cls) -> dict[str, Callable[[dict[str, Any]], Any]]:
+        """
+        Returns converters for fields that need to be converted when loading model data,
+        all other fields are taken as is.
+        """
+        return {}
 
     @classmethod
     def from_provider_data(cls: type[EMT], org_id: str, data: dict[str, Any]) -> EMT:
@@ -274,7 +328,7 @@ class EmbeddedModelObject(ABC):
         return {field.name: S(field.name) for field in cls.all_fields() if not is_unset(data.get(field.name, UNSET))}
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class ModelObject(ABC):
     """
     The abstract base class for any model object.
@@ -284,31 +338,40 @@ class ModelObject(ABC):
         """
         Assigns to all field which are UNSET their default value, if one is available.
         """
-        for field in self.all_fields():
-            value = self.__getattribute__(field.name)
-            if is_unset(value):
-                if field.default is not dataclasses.MISSING:
-                    self.__setattr__(field.name, field.default)
-                elif field.default_factory is not dataclasses.MISSING:
-                    self.__setattr__(field.name, field.default_factory())
+        for name, default, default_factory in self._get_field_defaults():
+            if is_unset(self.__getattribute__(name)):
+                self.__setattr__(name, default if default_factory is None else default_factory())
+
+    @classmethod
+    @functools.cache
+    def _get_field_defaults(cls) -> tuple[tuple[str, Any, Callable[[], Any] | None], ...]:
+        result: list[tuple[str, Any, Callable[[], Any] | None]] = []
+        for field in cls.all_fields():
+            if field.default is not dataclasses.MISSING:
+                result.append((field.name, field.default, None))
+            elif field.default_factory is not dataclasses.MISSING:
+                result.append((field.name, None, field.default_factory))
+
+        return tuple(result)
 
     @property
     @abstractmethod
     def model_object_name(self) -> str: ...
 
+    @classmethod
+    @functools.cache
+    def _get_key_field_name(cls) -> str | None:
+        return next((field.name for field in cls.all_fields() if field.metadata.get("key", False) is True), None)
+
     def is_keyed(self) -> bool:
         """Indicates whether the ModelObject is keyed by a property"""
-        return any(field.metadata.get("key", False) for field in self.all_fields())
+        return self._get_key_field_name() is not None
 
     def get_key(self) -> str:
         """Returns the key property of this ModelObject if it keyed"""
-        assert self.is_keyed()
-        return next(
-            filter(
-                lambda field: field.metadata.get("key", False) is True,
-                self.all_fields(),
-            )
-        ).name
+        key = self._get_key_field_name()
+        assert key is not None
+        return key
 
     def get_key_value(self) -> Any:
         """Returns the value of the key property"""
@@ -382,36 +445,52 @@ class ModelObject(ABC):
 
         return patch_result
 
+    # the field metadata of a model class does not change, compute it only once per class
+
     @classmethod
-    def all_fields(cls) -> list[dataclasses.Field]:
-        return list(dataclasses.fields(cls))
+    @functools.cache
+    def all_fields(cls) -> tuple[dataclasses.Field, ...]:
+        return dataclasses.fields(cls)
 
     @classmethod
-    def model_fields(cls) -> list[dataclasses.Field]:
-        return [field for field in dataclasses.fields(cls) if not cls.is_external_only(field)]
+    @functools.cache
+    def model_fields(cls) -> tuple[dataclasses.Field, ...]:
+        return tuple(field for field in cls.all_fields() if not cls.is_external_only(field))
 
     @classmethod
-    def model_only_fields(cls) -> list[dataclasses.Field]:
-        return [field for field in dataclasses.fields(cls) if cls.is_model_only(field)]
+    @functools.cache
+    def model_only_fields(cls) -> tuple[dataclasses.Field, ...]:
+        return tuple(field for field in cls.all_fields() if cls.is_model_only(field))
 
     @classmethod
-    def provider_fields(cls) -> list[dataclasses.Field]:
-        return [
+    @functools.cache
+    def provider_fields(cls) -> tuple[dataclasses.Field, ...]:
+        return tuple(
             field
-            for field in dataclasses.fields(cls)
+            for field in cls.all_fields()
             if not cls.is_external_only(field)
             and not cls.is_model_only(field)
             and not cls.is_read_only(field)
             and not cls.is_nested_model(field)
-        ]
+        )
+
+    @classmethod
+    @functools.cache
+    def _get_fields_by_name(cls) -> dict[str, dataclasses.Field]:
+        return {field.name: field for field in cls.all_fields()}
+
+    @classmethod
+    @functools.cache
+    def _get_model_key_fields(cls) -> tuple[tuple[dataclasses.Field, bool, bool], ...]:
+        return tuple((field, cls.is_model_only(field), cls.is_nested_model(field)) for field in cls.model_fields())
 
     @classmethod
     def _get_field(cls, key: str) -> dataclasses.Field:
-        for field in dataclasses.fields(cls):
-            if field.name == key:
-                return field
+        field = cls._get_fields_by_name().get(key)
+        if field is None:
+            raise ValueError(f"unknown key {key}")
 
-        raise ValueError(f"unknown key {key}")
+        return field
 
     @staticmethod
     def is_external_only(field: dataclasses.Field) -> bool:
@@ -475,8 +554,16 @@ class ModelObject(ABC):
         return header
 
     @classmethod
-    @abstractmethod
-    def from_model_data(cls, data: dict[str, Any]): ...
+    def from_model_data(cls, data: dict[str, Any]):
+        return cls(**_get_model_data_loader(cls)(data))
+
+    @classmethod
+    def get_model_data_converters(cls) -> dict[str, Callable[[dict[str, Any]], Any]]:
+        """
+        Returns converters for fields that need to be converted when loading model data,
+        all other fields are taken as is.
+        """
+        return {}
 
     @classmethod
     @abstractmethod
@@ -542,17 +629,17 @@ class ModelObject(ABC):
     ) -> list[str]:
         result = []
 
-        for field in self.model_fields():
+        for field, model_only, nested_model in self._get_model_key_fields():
             if for_diff is True and not self.include_field_for_diff_computation(field):
                 continue
 
             if for_patch is True and not self.include_field_for_patch_computation(field):
                 continue
 
-            if (for_diff or for_patch) and not include_model_only_fields and self.is_model_only(field):
+            if (for_diff or for_patch) and not include_model_only_fields and model_only:
                 continue
 
-            if include_nested_models is False and self.is_nested_model(field):
+            if include_nested_models is False and nested_model:
                 continue
 
             if exclude_unset_keys:
@@ -681,18 +768,14 @@ class ModelObject(ABC):
         expected_objects_by_key = associate_by_key(expected_objects, lambda x: x.get_key_value())
         expected_objects_by_all_keys = multi_associate_by_key(expected_objects, lambda x: x.get_all_key_values())
 
-        has_wildcard_keys = any(x.get_key_value().endswith("*") for x in expected_objects)
+        prefix_index = cls._build_key_prefix_index(expected_objects_by_key)
 
         for current_object in current_objects:
             key = current_object.get_key_value()
 
             expected_object = expected_objects_by_all_keys.get(key)
-            if expected_object is None and has_wildcard_keys:
-                for obj in expected_objects:
-                    stripped_key = obj.get_key_value().rstrip("*")
-                    if stripped_key and key.startswith(stripped_key):
-                        expected_object = obj
-                        break
+            if expected_object is None and prefix_index is not None:
+                expected_object = prefix_index.find_first(key)
 
             if expected_object is None:
                 if current_object.include_existing_object_for_live_patch(context.org_id, parent_object):
@@ -710,6 +793,44 @@ class ModelObject(ABC):
             if expected_object.include_for_live_patch(context):
                 cls.generate_live_patch(expected_object, None, parent_object, context, handler)
 
+    @staticmethod
+    def _build_key_prefix_index(expected_objects_by_key: dict[str, MT]) -> PrefixTrie[MT] | None:
+        """
+        Builds an index to match keys by prefix if any of the expected objects has a wildcard key.
+        Once wildcard keys are present, the key of any expected object matches all keys it is a prefix of,
+        the first matching expected object in their original order takes precedence.
+        """
+        if not any(key.endswith("*") for key in expected_objects_by_key):
+            return None
+
+        index: PrefixTrie[MT] = PrefixTrie()
+        for rank, (key, expected_object) in enumerate(expected_objects_by_key.items()):
+            stripped_key = key.rstrip("*")
+            if stripped_key:
+                index.insert(stripped_key, rank, expected_object)
+
+        return index
+
     @classmethod
     @abstractmethod
     async def apply_live_patch(cls, patch: LivePatch, org_id: str, provider: GitHubProvider) -> None: ...
+
+
+def resolve_secrets(model_objects: Iterable[ModelObject], secret_resolver: SecretResolver) -> None:
+    """
+    Resolves the secrets of the given model objects, all referenced secrets are retrieved at once.
+    """
+    model_objects = list(model_objects)
+    secret_data: list[str] = []
+
+    def collect(data: str) -> str:
+        secret_data.append(data)
+        return data
+
+    # collect the referenced secrets first, leaving the model objects unchanged
+    for model_object in model_objects:
+        model_object.resolve_secrets(collect)
+
+    secrets = secret_resolver.get_secrets(secret_data)
+    for model_object in model_objects:
+        model_object.resolve_secrets(secrets.__getitem__)
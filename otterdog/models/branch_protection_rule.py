@@ -34,7 +34,7 @@ if TYPE_CHECKING:
     from otterdog.providers.github import GitHubProvider
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class BranchProtectionRule(ModelObject):
     """
     Represents a Branch Protection Rule within a Repository.
@@ -276,12 +276,10 @@ class BranchProtectionRule(ModelObject):
 
     @classmethod
     def from_model_data(cls, data: dict[str, Any]) -> BranchProtectionRule:
-        mapping: dict[str, Any] = {k: OptionalS(k, default=UNSET) for k in (x.name for x in cls.all_fields())}
-
         if "requires_approving_reviews" in data:
-            mapping["requires_pull_request"] = S("requires_approving_reviews")
+            data = {**data, "requires_pull_request": data["requires_approving_reviews"]}
 
-        return cls(**bend(mapping, data))
+        return super(BranchProtectionRule, cls).from_model_data(data)
 
     @classmethod
     def from_provider_data(cls, org_id: str, data: dict[str, Any]) -> BranchProtectionRule:
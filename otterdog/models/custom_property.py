@@ -29,7 +29,7 @@ if TYPE_CHECKING:
     from otterdog.providers.github import GitHubProvider
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class CustomProperty(ModelObject):
     """
     Represents a Custom Property defined in an Organization.
@@ -141,11 +141,6 @@ class CustomProperty(ModelObject):
     def include_field_for_patch_computation(self, field: dataclasses.Field) -> bool:
         return True
 
-    @classmethod
-    def from_model_data(cls, data: dict[str, Any]) -> CustomProperty:
-        mapping = {k: OptionalS(k, default=UNSET) for k in (x.name for x in cls.all_fields())}
-        return cls(**bend(mapping, data))
-
     @classmethod
     def from_provider_data(cls, org_id: str, data: dict[str, Any]) -> CustomProperty:
         mapping = cls.get_mapping_from_provider(org_id, data)
@@ -27,7 +27,7 @@ if TYPE_CHECKING:
     from otterdog.providers.github import GitHubProvider
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Environment(ModelObject):
     """
     Represents a Deployment Environment of a Repository.
@@ -98,11 +98,6 @@ class Environment(ModelObject):
         else:
             return True
 
-    @classmethod
-    def from_model_data(cls, data: dict[str, Any]) -> Environment:
-        mapping = {k: OptionalS(k, default=UNSET) for k in (x.name for x in cls.all_fields())}
-        return cls(**bend(mapping, data))
-
     @classmethod
     def from_provider_data(cls, org_id: str, data: dict[str, Any]) -> Environment:
         mapping = cls.get_mapping_from_provider(org_id, data)
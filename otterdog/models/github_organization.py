@@ -9,24 +9,32 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import dataclasses
+import functools
+import hashlib
 import json
 import os
+import time
+from collections import OrderedDict
 from datetime import datetime
 from io import StringIO
 from typing import TYPE_CHECKING, Any
 
 import jsonschema
-from importlib_resources import as_file, files
-from jsonbender import F, Forall, OptionalS, S, bend  # type: ignore
+from importlib_resources import files
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT202012
 
 from otterdog import resources
+from otterdog.cache import get_snapshot_store
 from otterdog.models import (
     LivePatchContext,
     LivePatchHandler,
     ModelObject,
     PatchContext,
     ValidationContext,
+    resolve_secrets,
 )
 from otterdog.models.branch_protection_rule import BranchProtectionRule
 from otterdog.models.custom_property import CustomProperty
@@ -42,6 +50,8 @@ from otterdog.models.repo_variable import RepositoryVariable
 from otterdog.models.repo_webhook import RepositoryWebhook
 from otterdog.models.repo_workflow_settings import RepositoryWorkflowSettings
 from otterdog.models.repository import Repository
+from otterdog.providers.github import MAX_REPO_CONCURRENCY
+from otterdog.snapshot import OrganizationSnapshot, RepositorySnapshot
 from otterdog.utils import (
     IndentingPrinter,
     associate_by_key,
@@ -52,13 +62,21 @@ from otterdog.utils import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterator
+    from collections.abc import Awaitable, Iterator
 
     from otterdog.config import JsonnetConfig, OtterdogConfig, SecretResolver
     from otterdog.providers.github import GitHubProvider
 
+# number of repos whose data is retrieved with a single graphql query when bulk loading repos,
+# chosen to stay below the maximum number of nodes GitHub allows per query.
+_BULK_REPO_BATCH_SIZE = 10
+
 _ORG_SCHEMA = json.loads(files(resources).joinpath("schemas/organization.json").read_text())
 
+# maximum number of content hashes of organization configs that are remembered as being valid
+_MAX_VALIDATED_CONFIGS = 128
+_validated_configs: OrderedDict[str, None] = OrderedDict()
+
 
 @dataclasses.dataclass
 class GitHubOrganization:
@@ -131,11 +149,24 @@ class GitHubOrganization:
         return context
 
     @staticmethod
-    def _validate_org_config(data: dict[str, Any]) -> None:
-        with as_file(files(resources).joinpath("schemas")) as resource_dir:
-            schema_root = resource_dir.as_uri()
-            resolver = jsonschema.validators.RefResolver(base_uri=f"{schema_root}/", referrer=data)
-            jsonschema.validate(instance=data, schema=_ORG_SCHEMA, resolver=resolver)
+    def validate_config(data: dict[str, Any]) -> None:
+        """
+        Validates the data of an organization config with the json schema, raising the best matching error if invalid.
+        """
+        # validation only depends on the content, skip configs that have already been validated
+        content_hash = _get_content_hash(data)
+        if content_hash is not None and content_hash in _validated_configs:
+            _validated_configs.move_to_end(content_hash)
+            return
+
+        error = jsonschema.exceptions.best_match(_get_org_schema_validator().iter_errors(data))
+        if error is not None:
+            raise error
+
+        if content_hash is not None:
+            _validated_configs[content_hash] = None
+            if len(_validated_configs) > _MAX_VALIDATED_CONFIGS:
+                _validated_configs.popitem(last=False)
 
     def get_model_objects(self) -> Iterator[tuple[ModelObject, ModelObject | None]]:
         yield self.settings, None
@@ -160,30 +191,19 @@ class GitHubOrganization:
     @classmethod
     def from_model_data(cls, data: dict[str, Any]) -> GitHubOrganization:
         # validate the input data with the json schema.
-        cls._validate_org_config(data)
-
-        mapping = {
-            "github_id": S("github_id"),
-            "settings": S("settings") >> F(lambda x: OrganizationSettings.from_model_data(x)),
-            "webhooks": OptionalS("webhooks", default=[]) >> Forall(lambda x: OrganizationWebhook.from_model_data(x)),
-            "secrets": OptionalS("secrets", default=[]) >> Forall(lambda x: OrganizationSecret.from_model_data(x)),
-            "variables": OptionalS("variables", default=[])
-            >> Forall(lambda x: OrganizationVariable.from_model_data(x)),
-            "repositories": OptionalS("repositories", default=[]) >> Forall(lambda x: Repository.from_model_data(x)),
-        }
-
-        return cls(**bend(mapping, data))
-
-    def resolve_secrets(self, secret_resolver: Callable[[str], str]) -> None:
-        for webhook in self.webhooks:
-            webhook.resolve_secrets(secret_resolver)
-
-        for secret in self.secrets:
-            secret.resolve_secrets(secret_resolver)
-
-        for repo in self.repositories:
-            repo.resolve_secrets(secret_resolver)
+        cls.validate_config(data)
+
+        return cls(
+            github_id=data["github_id"],
+            settings=OrganizationSettings.from_model_data(data["settings"]),
+            webhooks=[OrganizationWebhook.from_model_data(x) for x in data.get("webhooks", [])],
+            secrets=[OrganizationSecret.from_model_data(x) for x in data.get("secrets", [])],
+            variables=[OrganizationVariable.from_model_data(x) for x in data.get("variables", [])],
+            repositories=[Repository.from_model_data(x) for x in data.get("repositories", [])],
+        )
 
+    def resolve_secrets(self, secret_resolver: SecretResolver) -> None:
+        resolve_secrets([*self.webhooks, *self.secrets, *self.repositories], secret_resolver)
         self._secrets_resolved = True
 
     def copy_secrets(self, other_org: GitHubOrganization) -> None:
@@ -336,7 +356,7 @@ class GitHubOrganization:
         org = cls.from_model_data(data)
 
         if resolve_secrets:
-            org.resolve_secrets(config.get_secret)
+            org.resolve_secrets(config)
 
         return org
 
@@ -349,6 +369,7 @@ class GitHubOrganization:
         no_web_ui: bool = False,
         printer: IndentingPrinter | None = None,
         concurrency: int | None = None,
+        bulk_load: bool = False,
     ) -> GitHubOrganization:
         start = datetime.now()
         if printer is not None and is_info_enabled():
@@ -433,6 +454,7 @@ class GitHubOrganization:
                 jsonnet_config,
                 printer,
                 concurrency,
+                bulk_load,
             ):
                 org.add_repository(repo)
         else:
@@ -441,98 +463,181 @@ class GitHubOrganization:
         return org
 
 
-async def _process_single_repo(
+def _get_repo_resources(jsonnet_config: JsonnetConfig) -> list[str]:
+    resources = {
+        "branch_protection_rules": jsonnet_config.default_branch_protection_rule_config,
+        "rulesets": jsonnet_config.default_repo_ruleset_config,
+        "webhooks": jsonnet_config.default_org_webhook_config,
+        "secrets": jsonnet_config.default_repo_secret_config,
+        "variables": jsonnet_config.default_repo_variable_config,
+        "environments": jsonnet_config.default_environment_config,
+    }
+
+    return [resource for resource, default_config in resources.items() if default_config is not None]
+
+
+async def _fetch_single_repo(
     gh_client: GitHubProvider,
     github_id: str,
     repo_name: str,
-    jsonnet_config: JsonnetConfig,
-    teams: dict[str, Any],
-    app_installations: dict[str, str],
-) -> tuple[str, Repository]:
+    resources: list[str],
+    prefetched_data: dict[str, Any] | None = None,
+) -> dict[str, Any]:
     rest_api = gh_client.rest_api
 
+    prefetched_rules = None
+    prefetched_environments = None
+    if prefetched_data is not None:
+        prefetched_data = dict(prefetched_data)
+        prefetched_rules = prefetched_data.pop("branch_protection_rules", None)
+        prefetched_environments = prefetched_data.pop("environments", None)
+
     # get repo data
-    github_repo_data = await rest_api.repo.get_repo_data(github_id, repo_name)
-    repo = Repository.from_provider_data(github_id, github_repo_data)
+    github_repo_data = await rest_api.repo.get_repo_data(github_id, repo_name, prefetched_data)
+
+    # the remaining resources of a repo are independent of each other and are retrieved concurrently,
+    # limiting the number of concurrent requests per repo.
+    sem = asyncio.Semaphore(MAX_REPO_CONCURRENCY)
 
-    github_repo_workflow_data = await rest_api.repo.get_workflow_settings(github_id, repo_name)
-    repo.workflows = RepositoryWorkflowSettings.from_provider_data(github_id, github_repo_workflow_data)
+    async def fetch(coro: Awaitable[Any]) -> Any:
+        async with sem:
+            return await coro
+
+    async def provided(data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return data
 
-    if jsonnet_config.default_branch_protection_rule_config is not None:
+    workflow_settings_request = fetch(rest_api.repo.get_workflow_settings(github_id, repo_name))
+
+    if "branch_protection_rules" in resources and prefetched_rules is not None:
+        rules_request = provided(prefetched_rules)
+    elif "branch_protection_rules" in resources:
         # get branch protection rules of the repo
-        rules = await gh_client.get_branch_protection_rules(github_id, repo_name)
-        for github_rule in rules:
-            repo.add_branch_protection_rule(BranchProtectionRule.from_provider_data(github_id, github_rule))
+        rules_request = fetch(gh_client.get_branch_protection_rules(github_id, repo_name))
     else:
         print_debug("not reading branch protection rules, no default config available")
+        rules_request = provided([])
 
     # repository rulesets are not available for private repos and free plan
     # TODO: support rulesets in private repos with enterprise plan
-    if jsonnet_config.default_repo_ruleset_config is not None and repo.private is False:
+    if "rulesets" in resources and github_repo_data.get("private") is False:
         # get rulesets of the repo
-        rulesets = await rest_api.repo.get_rulesets(github_id, repo_name)
-        for github_ruleset in rulesets:
-            # FIXME: need to associate an app id to its slug
-            #        GitHub does not support that atm, so we lookup the currently installed
-            #        apps for an organization which provide a mapping from id to slug.
-            for actor in github_ruleset.get("bypass_actors", []):
-                if actor.get("actor_type", None) == "Integration":
-                    actor_id = str(actor.get("actor_id", 0))
-                    if actor_id in app_installations:
-                        actor["app_slug"] = app_installations[actor_id]
-                elif actor.get("actor_type", None) == "Team":
-                    actor_id = str(actor.get("actor_id", 0))
-                    if actor_id in teams:
-                        actor["team_slug"] = teams[actor_id]
-
-            for rule in github_ruleset.get("rules", []):
-                if rule.get("type", None) == "required_status_checks":
-                    required_status_checks = rule.get("parameters", {}).get("required_status_checks", [])
-                    for status_check in required_status_checks:
-                        integration_id = str(status_check.get("integration_id", 0))
-                        if integration_id in app_installations:
-                            status_check["app_slug"] = app_installations[integration_id]
-
-            repo.add_ruleset(RepositoryRuleset.from_provider_data(github_id, github_ruleset))
+        rulesets_request = fetch(gh_client.get_repo_rulesets(github_id, repo_name))
     else:
         print_debug("not reading repo rulesets, no default config available")
+        rulesets_request = provided([])
 
-    if jsonnet_config.default_org_webhook_config is not None:
+    if "webhooks" in resources:
         # get webhooks of the repo
-        webhooks = await rest_api.repo.get_webhooks(github_id, repo_name)
-        for github_webhook in webhooks:
-            repo.add_webhook(RepositoryWebhook.from_provider_data(github_id, github_webhook))
+        webhooks_request = fetch(gh_client.get_repo_webhooks(github_id, repo_name))
     else:
         print_debug("not reading repo webhooks, no default config available")
+        webhooks_request = provided([])
 
-    if jsonnet_config.default_repo_secret_config is not None:
+    if "secrets" in resources:
         # get secrets of the repo
-        secrets = await rest_api.repo.get_secrets(github_id, repo_name)
-        for github_secret in secrets:
-            repo.add_secret(RepositorySecret.from_provider_data(github_id, github_secret))
+        secrets_request = fetch(rest_api.repo.get_secrets(github_id, repo_name))
     else:
         print_debug("not reading repo secrets, no default config available")
+        secrets_request = provided([])
 
-    if jsonnet_config.default_repo_variable_config is not None:
+    if "variables" in resources:
         # get variables of the repo
-        variables = await rest_api.repo.get_variables(github_id, repo_name)
-        for github_variable in variables:
-            repo.add_variable(RepositoryVariable.from_provider_data(github_id, github_variable))
+        variables_request = fetch(rest_api.repo.get_variables(github_id, repo_name))
     else:
         print_debug("not reading repo variables, no default config available")
+        variables_request = provided([])
 
-    if jsonnet_config.default_environment_config is not None:
+    if "environments" in resources and prefetched_environments is not None:
+        environments_request = provided(prefetched_environments)
+    elif "environments" in resources:
         # get environments of the repo
-        environments = await rest_api.repo.get_environments(github_id, repo_name)
-        for github_environment in environments:
-            repo.add_environment(Environment.from_provider_data(github_id, github_environment))
+        environments_request = fetch(rest_api.repo.get_environments(github_id, repo_name))
     else:
         print_debug("not reading environments, no default config available")
+        environments_request = provided([])
+
+    (
+        github_repo_workflow_data,
+        rules,
+        rulesets,
+        webhooks,
+        secrets,
+        variables,
+        environments,
+    ) = await asyncio.gather(
+        workflow_settings_request,
+        rules_request,
+        rulesets_request,
+        webhooks_request,
+        secrets_request,
+        variables_request,
+        environments_request,
+    )
 
     if is_debug_enabled():
         print_debug(f"done retrieving data for repo '{repo_name}'")
 
-    return repo_name, repo
+    return {
+        "repo": github_repo_data,
+        "workflows": github_repo_workflow_data,
+        "branch_protection_rules": rules,
+        "rulesets": rulesets,
+        "webhooks": webhooks,
+        "secrets": secrets,
+        "variables": variables,
+        "environments": environments,
+    }
+
+
+def _build_repository(
+    github_id: str,
+    data: dict[str, Any],
+    teams: dict[str, Any],
+    app_installations: dict[str, str],
+) -> Repository:
+    repo = Repository.from_provider_data(github_id, data["repo"])
+    repo.workflows = RepositoryWorkflowSettings.from_provider_data(github_id, data["workflows"])
+
+    for github_rule in data["branch_protection_rules"]:
+        repo.add_branch_protection_rule(BranchProtectionRule.from_provider_data(github_id, github_rule))
+
+    for github_ruleset in data["rulesets"]:
+        # FIXME: need to associate an app id to its slug
+        #        GitHub does not support that atm, so we lookup the currently installed
+        #        apps for an organization which provide a mapping from id to slug.
+        for actor in github_ruleset.get("bypass_actors", []):
+            if actor.get("actor_type", None) == "Integration":
+                actor_id = str(actor.get("actor_id", 0))
+                if actor_id in app_installations:
+                    actor["app_slug"] = app_installations[actor_id]
+            elif actor.get("actor_type", None) == "Team":
+                actor_id = str(actor.get("actor_id", 0))
+                if actor_id in teams:
+                    actor["team_slug"] = teams[actor_id]
+
+        for rule in github_ruleset.get("rules", []):
+            if rule.get("type", None) == "required_status_checks":
+                required_status_checks = rule.get("parameters", {}).get("required_status_checks", [])
+                for status_check in required_status_checks:
+                    integration_id = str(status_check.get("integration_id", 0))
+                    if integration_id in app_installations:
+                        status_check["app_slug"] = app_installations[integration_id]
+
+        repo.add_ruleset(RepositoryRuleset.from_provider_data(github_id, github_ruleset))
+
+    for github_webhook in data["webhooks"]:
+        repo.add_webhook(RepositoryWebhook.from_provider_data(github_id, github_webhook))
+
+    for github_secret in data["secrets"]:
+        repo.add_secret(RepositorySecret.from_provider_data(github_id, github_secret))
+
+    for github_variable in data["variables"]:
+        repo.add_variable(RepositoryVariable.from_provider_data(github_id, github_variable))
+
+    for github_environment in data["environments"]:
+        repo.add_environment(Environment.from_provider_data(github_id, github_environment))
+
+    return repo
 
 
 async def _load_repos_from_provider(
@@ -541,12 +646,35 @@ async def _load_repos_from_provider(
     jsonnet_config: JsonnetConfig,
     printer: IndentingPrinter | None = None,
     concurrency: int | None = None,
+    bulk_load: bool = False,
 ) -> list[Repository]:
     start = datetime.now()
     if printer is not None and is_info_enabled():
         printer.println("\nrepositories: Reading...")
 
-    repo_names = await provider.get_repos(github_id)
+    resources = _get_repo_resources(jsonnet_config)
+
+    snapshot_store = get_snapshot_store()
+    if snapshot_store is not None:
+        repo_summaries = await provider.get_repo_summaries(github_id)
+        repo_names = [repo_summary["name"] for repo_summary in repo_summaries]
+
+        snapshot = await snapshot_store.load(github_id)
+        if snapshot is not None:
+            reusable_repos = snapshot.get_reusable_repositories(repo_summaries, resources, snapshot_store.max_age)
+        else:
+            reusable_repos = {}
+
+        print_debug(f"reusing {len(reusable_repos)} of {len(repo_names)} repos from snapshot")
+    elif bulk_load:
+        # the summaries contain some settings of the repos that are not available in bulk otherwise
+        repo_summaries = await provider.get_repo_summaries(github_id)
+        repo_names = [repo_summary["name"] for repo_summary in repo_summaries]
+        reusable_repos = {}
+    else:
+        repo_summaries = []
+        repo_names = await provider.get_repos(github_id)
+        reusable_repos = {}
 
     teams = {
         str(team["id"]): f"{github_id}/{team['slug']}" for team in await provider.rest_api.org.get_teams(github_id)
@@ -557,29 +685,50 @@ async def _load_repos_from_provider(
         for installation in await provider.rest_api.org.get_app_installations(github_id)
     }
 
-    # limit the number of repos that are processed concurrently to avoid hitting secondary rate limits
+    repos_to_fetch = [repo_name for repo_name in repo_names if repo_name not in reusable_repos]
+    fetched_at = time.time()
+    bulk_data = await _load_bulk_repo_data(github_id, provider, repos_to_fetch, repo_summaries) if bulk_load else {}
+
+    # limit the number of repos that are processed concurrently, the requests itself
+    # are scheduled by the rate limiter of the provider to avoid hitting secondary rate limits.
     sem = asyncio.Semaphore(50 if concurrency is None else concurrency)
 
-    async def safe_process(repo_name):
+    async def safe_fetch(repo_name: str) -> dict[str, Any]:
         async with sem:
-            return await _process_single_repo(provider, github_id, repo_name, jsonnet_config, teams, app_installations)
-
-    if concurrency is not None:
-        chunk_size = 50
-        result = []
-        for chunk in divide_chunks(repo_names, chunk_size):
-            result.extend(await asyncio.gather(*[safe_process(repo_name) for repo_name in chunk]))
-
-            # after processing a full chunk, wait for 30s to avoid hitting secondary rate limits
-            if len(chunk) == chunk_size:
-                await asyncio.sleep(30)
-    else:
-        result = await asyncio.gather(*[safe_process(repo_name) for repo_name in repo_names])
+            return await _fetch_single_repo(provider, github_id, repo_name, resources, bulk_data.get(repo_name))
+
+    fetched_repos = dict(
+        zip(repos_to_fetch, await asyncio.gather(*[safe_fetch(repo_name) for repo_name in repos_to_fetch]), strict=True)
+    )
+
+    if snapshot_store is not None:
+        repo_snapshots = dict(reusable_repos)
+        for repo_summary in repo_summaries:
+            repo_name = repo_summary["name"]
+            if repo_name in fetched_repos:
+                # building the model might modify the data, store a copy in the snapshot
+                repo_snapshots[repo_name] = RepositorySnapshot(
+                    repo_summary.get("updated_at"),
+                    repo_summary.get("pushed_at"),
+                    copy.deepcopy(fetched_repos[repo_name]),
+                    fetched_at,
+                )
+
+        # keep repositories that have been marked dirty while retrieving the live state
+        await snapshot_store.update(
+            github_id,
+            OrganizationSnapshot(resources, repo_snapshots),
+            snapshot.dirty_repositories if snapshot is not None else [],
+        )
 
     github_repos = []
-    for data in result:
-        _, repo_data = data
-        github_repos.append(repo_data)
+    for repo_name in repo_names:
+        if repo_name in fetched_repos:
+            repo_data = fetched_repos[repo_name]
+        else:
+            repo_data = copy.deepcopy(reusable_repos[repo_name].data)
+
+        github_repos.append(_build_repository(github_id, repo_data, teams, app_installations))
 
     if printer is not None and is_info_enabled():
         end = datetime.now()
@@ -588,7 +737,115 @@ async def _load_repos_from_provider(
     return github_repos
 
 
-def divide_chunks(input_list, n):
-    # looping till length of input_list
-    for i in range(0, len(input_list), n):
-        yield input_list[i : i + n]
+async def _load_bulk_repo_data(
+    github_id: str,
+    provider: GitHubProvider,
+    repo_names: list[str],
+    repo_summaries: list[dict[str, Any]],
+) -> dict[str, dict[str, Any]]:
+    """
+    Retrieves data for all repos of an organization in batches, the data of a repo
+    that is missing in the result will be retrieved with separate requests.
+
+    Counting the requests of a public, non-archived repo without github pages site and
+    environments, this reduces the number of rest requests per repo from 12 to 7, plus
+    up to 2 requests depending on its workflow settings. The repo itself is only retrieved
+    separately if the security settings are missing from its summary, e.g. due to missing
+    permissions, and environments only if the repo has any.
+    """
+    batches = [repo_names[i : i + _BULK_REPO_BATCH_SIZE] for i in range(0, len(repo_names), _BULK_REPO_BATCH_SIZE)]
+
+    async def load_batch(batch: list[str]) -> dict[str, dict[str, Any]]:
+        try:
+            return await provider.get_bulk_repo_data(github_id, batch)
+        except RuntimeError as ex:
+            print_debug(
+                f"failed retrieving bulk data for {len(batch)} repos of org '{github_id}', reading them per repo:\n{ex}"
+            )
+            return {}
+
+    result: dict[str, dict[str, Any]] = {}
+    for batch_data in await asyncio.gather(*[load_batch(batch) for batch in batches]):
+        result.update(batch_data)
+
+    # settings that are not available via graphql are taken from the summary of a repo if present
+    for repo_summary in repo_summaries:
+        repo_data = result.get(repo_summary["name"])
+        if repo_data is not None:
+            for key in ("has_pages", "security_and_analysis"):
+                if key in repo_summary:
+                    repo_data[key] = repo_summary[key]
+
+    try:
+        for property_values in await provider.get_org_custom_property_values(github_id):
+            repo_data = result.setdefault(property_values["repository_name"], {})
+            repo_data["custom_properties"] = property_values["properties"]
+    except RuntimeError as ex:
+        print_debug(f"failed retrieving custom property values for org '{github_id}', reading them per repo:\n{ex}")
+
+    return result
+
+
+@functools.cache
+def _get_org_schema_validator() -> Any:
+    """
+    Returns a validator for organization configs that is created only once.
+
+    References to other schemas are inlined beforehand, so that they
+    do not need to be resolved again for every validated object.
+    """
+    schemas = {}
+    for entry in files(resources).joinpath("schemas").iterdir():
+        if entry.name.endswith(".json"):
+            schema = json.loads(entry.read_text())
+            schemas[schema.get("$id", entry.name)] = schema
+
+    validator_class = jsonschema.validators.validator_for(_ORG_SCHEMA, default=jsonschema.Draft202012Validator)
+    validator_class.check_schema(_ORG_SCHEMA)
+
+    # keep a registry of all schemas to resolve recursive references that can not be inlined
+    registry: Registry = Registry().with_resources(
+        (schema_id, Resource.from_contents(schema, default_specification=DRAFT202012))
+        for schema_id, schema in schemas.items()
+    )
+
+    return validator_class(_inline_schema_refs(_ORG_SCHEMA, _ORG_SCHEMA, schemas, ()), registry=registry)
+
+
+def _inline_schema_refs(node: Any, root: dict[str, Any], schemas: dict[str, Any], stack: tuple[str, ...]) -> Any:
+    if isinstance(node, list):
+        return [_inline_schema_refs(x, root, schemas, stack) for x in node]
+    elif not isinstance(node, dict):
+        return node
+
+    # identifiers and definitions of a schema are not needed anymore once all references have been inlined
+    skipped_keys = ("$ref", "$id", "definitions") if node is root else ("$ref",)
+    result = {k: _inline_schema_refs(v, root, schemas, stack) for k, v in node.items() if k not in skipped_keys}
+
+    ref = node.get("$ref")
+    if isinstance(ref, str):
+        document, _, pointer = ref.partition("#")
+        target_root = schemas[document] if document else root
+        absolute_ref = f"{target_root.get('$id', '')}#{pointer}"
+
+        if absolute_ref in stack:
+            result["$ref"] = absolute_ref
+        else:
+            target = target_root
+            for part in pointer.split("/")[1:]:
+                target = target[part]
+
+            inlined = _inline_schema_refs(target, target_root, schemas, (*stack, absolute_ref))
+            # other keywords next to a reference are evaluated in addition to the referenced schema
+            result.setdefault("allOf", []).append(inlined)
+
+    return result
+
+
+def _get_content_hash(data: dict[str, Any]) -> str | None:
+    try:
+        content = json.dumps(data, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
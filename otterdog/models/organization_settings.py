@@ -11,7 +11,7 @@ from __future__ import annotations
 import dataclasses
 from typing import TYPE_CHECKING, Any, cast
 
-from jsonbender import F, Forall, If, K, OptionalS, S, bend  # type: ignore
+from jsonbender import OptionalS, S, bend  # type: ignore
 
 from otterdog.models import (
     FailureType,
@@ -22,6 +22,8 @@ from otterdog.models import (
     ModelObject,
     PatchContext,
     ValidationContext,
+    nested_model,
+    nested_model_list,
 )
 from otterdog.utils import (
     UNSET,
@@ -37,13 +39,13 @@ from .custom_property import CustomProperty
 from .organization_workflow_settings import OrganizationWorkflowSettings
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterator
 
     from otterdog.jsonnet import JsonnetConfig
     from otterdog.providers.github import GitHubProvider
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class OrganizationSettings(ModelObject):
     """
     Represents settings of a GitHub Organization.
@@ -145,22 +147,11 @@ class OrganizationSettings(ModelObject):
             yield from self.workflows.get_model_objects()
 
     @classmethod
-    def from_model_data(cls, data: dict[str, Any]) -> OrganizationSettings:
-        mapping: dict[str, Any] = {k: OptionalS(k, default=UNSET) for k in (x.name for x in cls.all_fields())}
-
-        mapping.update(
-            {
-                "custom_properties": OptionalS("custom_properties", default=[])
-                >> Forall(lambda x: CustomProperty.from_model_data(x)),
-                "workflows": If(
-                    OptionalS("workflows", default=None) == K(None),
-                    K(UNSET),
-                    S("workflows") >> F(lambda x: OrganizationWorkflowSettings.from_model_data(x)),
-                ),
-            }
-        )
-
-        return cls(**bend(mapping, data))
+    def get_model_data_converters(cls) -> dict[str, Callable[[dict[str, Any]], Any]]:
+        return {
+            "custom_properties": nested_model_list("custom_properties", CustomProperty.from_model_data),
+            "workflows": nested_model("workflows", OrganizationWorkflowSettings.from_model_data),
+        }
 
     @classmethod
     def from_provider_data(cls, org_id: str, data: dict[str, Any]) -> OrganizationSettings:
@@ -22,7 +22,7 @@ if TYPE_CHECKING:
     from otterdog.providers.github import GitHubProvider
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class OrganizationVariable(Variable):
     """
     Represents a Variable defined on organization level.
@@ -36,7 +36,7 @@ class OrganizationVariable(Variable):
         return "org_variable"
 
     def validate(self, context: ValidationContext, parent_object: Any) -> None:
-        super().validate(context, parent_object)
+        super(OrganizationVariable, self).validate(context, parent_object)
 
         if is_set_and_valid(self.visibility):
             from .github_organization import GitHubOrganization
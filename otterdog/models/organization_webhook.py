@@ -19,7 +19,7 @@ if TYPE_CHECKING:
     from otterdog.providers.github import GitHubProvider
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class OrganizationWebhook(Webhook):
     """
     Represents a Webhook defined on organization level.
@@ -0,0 +1,202 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientError
+
+from otterdog.models import LivePatch, LivePatchType
+from otterdog.models.repository import Repository
+from otterdog.providers.github.exception import GitHubException
+from otterdog.utils import print_debug
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from otterdog.providers.github import GitHubProvider
+
+DEFAULT_PATCH_CONCURRENCY = 8
+_DEFAULT_RETRIES = 2
+_DEFAULT_RETRY_DELAY = 1.0
+
+
+@dataclasses.dataclass(frozen=True)
+class LivePatchError:
+    patch: LivePatch
+    error: RuntimeError
+
+
+@dataclasses.dataclass
+class _PatchGroup:
+    repo_name: str | None
+    patches: list[LivePatch] = dataclasses.field(default_factory=list)
+    dependencies: set[str] = dataclasses.field(default_factory=set)
+    done: asyncio.Event = dataclasses.field(default_factory=asyncio.Event)
+
+
+class LivePatchExecutor:
+    """
+    Applies live patches to an organization, taking dependencies between them into account.
+
+    Patches are applied in the following phases:
+
+    * additions and changes to organization level resources, one after another
+    * additions and changes to repositories and their resources, the patches of a single
+      repository are applied one after another in their original order, while independent
+      repositories are processed concurrently
+    * removals of repositories and their resources, grouped per repository like above
+    * removals of organization level resources, one after another
+
+    A repository that is created from a template or forked from another repository of
+    the same organization is only processed after that repository has been processed.
+
+    Changes and removals that fail with a transient error are retried, all other errors are
+    collected and returned once all patches have been processed. Additions are never retried
+    as they might consist of several requests that are not idempotent, e.g. creating a
+    repository from a template and updating its settings afterwards.
+    """
+
+    def __init__(
+        self,
+        org_id: str,
+        provider: GitHubProvider,
+        concurrency: int = DEFAULT_PATCH_CONCURRENCY,
+        retries: int = _DEFAULT_RETRIES,
+        retry_delay: float = _DEFAULT_RETRY_DELAY,
+    ):
+        self._org_id = org_id
+        self._provider = provider
+        self._concurrency = max(1, concurrency)
+        self._retries = retries
+        self._retry_delay = retry_delay
+
+    async def execute(
+        self,
+        patches: list[LivePatch],
+        on_patch_processed: Callable[[LivePatch], None] | None = None,
+    ) -> list[LivePatchError]:
+        errors: list[LivePatchError] = []
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def apply_sequentially(group: _PatchGroup) -> None:
+            for patch in group.patches:
+                error = await self._apply(patch)
+                if error is not None:
+                    errors.append(error)
+
+                if on_patch_processed is not None:
+                    on_patch_processed(patch)
+
+        async def apply_repo_group(group: _PatchGroup, groups: dict[str, _PatchGroup]) -> None:
+            try:
+                for dependency in group.dependencies:
+                    await groups[dependency].done.wait()
+
+                async with semaphore:
+                    await apply_sequentially(group)
+            finally:
+                group.done.set()
+
+        async def apply_repo_groups(groups: dict[str, _PatchGroup]) -> None:
+            await asyncio.gather(*[apply_repo_group(group, groups) for group in groups.values()])
+
+        org_group, repo_groups, repo_removal_groups, org_removal_group = self._group_patches(patches)
+
+        await apply_sequentially(org_group)
+        await apply_repo_groups(repo_groups)
+        await apply_repo_groups(repo_removal_groups)
+        await apply_sequentially(org_removal_group)
+
+        # report errors in the original order of the patches
+        patch_order = {id(patch): index for index, patch in enumerate(patches)}
+        return sorted(errors, key=lambda x: patch_order[id(x.patch)])
+
+    def _group_patches(
+        self, patches: list[LivePatch]
+    ) -> tuple[_PatchGroup, dict[str, _PatchGroup], dict[str, _PatchGroup], _PatchGroup]:
+        org_group = _PatchGroup(None)
+        org_removal_group = _PatchGroup(None)
+        repo_groups: dict[str, _PatchGroup] = {}
+        repo_removal_groups: dict[str, _PatchGroup] = {}
+
+        for patch in patches:
+            is_removal = patch.patch_type == LivePatchType.REMOVE
+            repo_name = self._get_repo_name(patch)
+
+            if repo_name is None:
+                (org_removal_group if is_removal else org_group).patches.append(patch)
+            else:
+                groups = repo_removal_groups if is_removal else repo_groups
+                groups.setdefault(repo_name, _PatchGroup(repo_name)).patches.append(patch)
+
+        for group in repo_groups.values():
+            for patch in group.patches:
+                if patch.patch_type == LivePatchType.ADD and isinstance(patch.expected_object, Repository):
+                    source_repo = self._get_source_repo_name(patch.expected_object)
+                    if source_repo is not None and source_repo != group.repo_name and source_repo in repo_groups:
+                        group.dependencies.add(source_repo)
+
+        return org_group, repo_groups, repo_removal_groups, org_removal_group
+
+    @staticmethod
+    def _get_repo_name(patch: LivePatch) -> str | None:
+        model_object = patch.expected_object if patch.expected_object is not None else patch.current_object
+
+        if isinstance(model_object, Repository):
+            return model_object.name
+        elif isinstance(patch.parent_object, Repository):
+            return patch.parent_object.name
+        else:
+            return None
+
+    def _get_source_repo_name(self, repo: Repository) -> str | None:
+        for source in (repo.template_repository, repo.forked_repository):
+            if isinstance(source, str) and "/" in source:
+                owner, name = source.split("/", 1)
+                if owner.lower() == self._org_id.lower():
+                    return name
+
+        return None
+
+    async def _apply(self, patch: LivePatch) -> LivePatchError | None:
+        attempt = 0
+        while True:
+            try:
+                await patch.apply(self._org_id, self._provider)
+                return None
+            except RuntimeError as ex:
+                if attempt >= self._retries or not _is_retryable(patch) or not _is_transient_error(ex):
+                    return LivePatchError(patch, ex)
+
+                delay = self._retry_delay * 2**attempt
+                attempt += 1
+                print_debug(f"failed to apply patch {patch!r}, retrying in {delay}s: {ex}")
+                await asyncio.sleep(delay)
+
+
+def _is_retryable(patch: LivePatch) -> bool:
+    # changes and removals only update or delete existing resources and can safely be applied again
+    return patch.patch_type in (LivePatchType.CHANGE, LivePatchType.REMOVE)
+
+
+def _is_transient_error(ex: BaseException) -> bool:
+    current: BaseException | None = ex
+    while current is not None:
+        if isinstance(current, GitHubException):
+            # resources that have just been created might not be available immediately
+            return current.status >= 500 or current.status in (404, 409)
+        elif isinstance(current, ClientError | asyncio.TimeoutError):
+            return True
+
+        current = current.__cause__
+
+    return False
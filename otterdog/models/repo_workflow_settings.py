@@ -31,7 +31,7 @@ if TYPE_CHECKING:
     from otterdog.providers.github import GitHubProvider
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class RepositoryWorkflowSettings(WorkflowSettings):
     """
     Represents workflow settings defined on repository level.
@@ -75,7 +75,7 @@ class RepositoryWorkflowSettings(WorkflowSettings):
         return copy
 
     def validate(self, context: ValidationContext, parent_object: Any) -> None:
-        super().validate(context, parent_object)
+        super(RepositoryWorkflowSettings, self).validate(context, parent_object)
 
         if is_set_and_valid(self.enabled) and self.enabled is True:
             from .github_organization import GitHubOrganization
@@ -137,7 +137,7 @@ class RepositoryWorkflowSettings(WorkflowSettings):
             else:
                 return False
 
-        return super().include_field_for_diff_computation(field)
+        return super(RepositoryWorkflowSettings, self).include_field_for_diff_computation(field)
 
     @classmethod
     async def get_mapping_to_provider(
@@ -146,7 +146,7 @@ class RepositoryWorkflowSettings(WorkflowSettings):
         if "enabled" in data and data["enabled"] is False:
             return {"enabled": S("enabled")}
         else:
-            return await super().get_mapping_to_provider(org_id, data, provider)
+            return await super(RepositoryWorkflowSettings, cls).get_mapping_to_provider(org_id, data, provider)
 
     @classmethod
     def generate_live_patch(
@@ -12,7 +12,7 @@ import dataclasses
 import re
 from typing import TYPE_CHECKING, Any, ClassVar, cast
 
-from jsonbender import F, Forall, If, K, OptionalS, S, bend  # type: ignore
+from jsonbender import F, If, K, OptionalS, S, bend  # type: ignore
 
 from otterdog.models import (
     FailureType,
@@ -23,6 +23,8 @@ from otterdog.models import (
     ModelObject,
     PatchContext,
     ValidationContext,
+    nested_model,
+    nested_model_list,
 )
 from otterdog.utils import (
     UNSET,
@@ -51,7 +53,7 @@ if TYPE_CHECKING:
     from otterdog.providers.github import GitHubProvider
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Repository(ModelObject):
     """
     Represents a Repository of an Organization.
@@ -562,29 +564,18 @@ class Repository(ModelObject):
             yield self.workflows, self
 
     @classmethod
-    def from_model_data(cls, data: dict[str, Any]) -> Repository:
-        mapping = {k: OptionalS(k, default=UNSET) for k in (x.name for x in cls.all_fields())}
-
-        mapping.update(
-            {
-                "webhooks": OptionalS("webhooks", default=[]) >> Forall(lambda x: RepositoryWebhook.from_model_data(x)),
-                "secrets": OptionalS("secrets", default=[]) >> Forall(lambda x: RepositorySecret.from_model_data(x)),
-                "variables": OptionalS("variables", default=[])
-                >> Forall(lambda x: RepositoryVariable.from_model_data(x)),
-                "branch_protection_rules": OptionalS("branch_protection_rules", default=[])
-                >> Forall(lambda x: BranchProtectionRule.from_model_data(x)),
-                "rulesets": OptionalS("rulesets", default=[]) >> Forall(lambda x: RepositoryRuleset.from_model_data(x)),
-                "environments": OptionalS("environments", default=[])
-                >> Forall(lambda x: Environment.from_model_data(x)),
-                "workflows": If(
-                    OptionalS("workflows", default=None) == K(None),
-                    K(UNSET),
-                    S("workflows") >> F(lambda x: RepositoryWorkflowSettings.from_model_data(x)),
-                ),
-            }
-        )
-
-        return cls(**bend(mapping, data))
+    def get_model_data_converters(cls) -> dict[str, Callable[[dict[str, Any]], Any]]:
+        return {
+            "webhooks": nested_model_list("webhooks", RepositoryWebhook.from_model_data),
+            "secrets": nested_model_list("secrets", RepositorySecret.from_model_data),
+            "variables": nested_model_list("variables", RepositoryVariable.from_model_data),
+            "branch_protection_rules": nested_model_list(
+                "branch_protection_rules", BranchProtectionRule.from_model_data
+            ),
+            "rulesets": nested_model_list("rulesets", RepositoryRuleset.from_model_data),
+            "environments": nested_model_list("environments", Environment.from_model_data),
+            "workflows": nested_model("workflows", RepositoryWorkflowSettings.from_model_data),
+        }
 
     @classmethod
     def from_provider_data(cls, org_id: str, data: dict[str, Any]) -> Repository:
@@ -13,7 +13,7 @@ import dataclasses
 import re
 from typing import TYPE_CHECKING, Any, ClassVar, TypeVar, cast
 
-from jsonbender import F, Forall, If, K, OptionalS, S, bend  # type: ignore
+from jsonbender import Forall, If, K, OptionalS, S, bend  # type: ignore
 
 from otterdog.models import (
     EmbeddedModelObject,
@@ -21,6 +21,7 @@ from otterdog.models import (
     ModelObject,
     PatchContext,
     ValidationContext,
+    nested_model,
 )
 from otterdog.utils import (
     UNSET,
@@ -34,13 +35,15 @@ from otterdog.utils import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from otterdog.jsonnet import JsonnetConfig
     from otterdog.providers.github import GitHubProvider
 
 RS = TypeVar("RS", bound="Ruleset")
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PullRequestSettings(EmbeddedModelObject):
     required_approving_review_count: int
     dismisses_stale_reviews: bool
@@ -72,7 +75,7 @@ class PullRequestSettings(EmbeddedModelObject):
 
     @classmethod
     def get_mapping_from_provider(cls, org_id: str, data: dict[str, Any]) -> dict[str, Any]:
-        mapping = super().get_mapping_from_provider(org_id, data)
+        mapping = super(PullRequestSettings, cls).get_mapping_from_provider(org_id, data)
 
         mapping.update(
             {
@@ -90,7 +93,7 @@ class PullRequestSettings(EmbeddedModelObject):
     async def get_mapping_to_provider(
         cls, org_id: str, data: dict[str, Any], provider: GitHubProvider
     ) -> dict[str, Any]:
-        mapping = super().get_mapping_from_provider(org_id, data)
+        mapping = super(PullRequestSettings, cls).get_mapping_from_provider(org_id, data)
 
         mapping.update(
             {
@@ -113,7 +116,7 @@ class PullRequestSettings(EmbeddedModelObject):
         return mapping
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class StatusCheckSettings(EmbeddedModelObject):
     do_not_enforce_on_create: bool
     strict: bool
@@ -134,7 +137,7 @@ class StatusCheckSettings(EmbeddedModelObject):
 
     @classmethod
     def get_mapping_from_provider(cls, org_id: str, data: dict[str, Any]) -> dict[str, Any]:
-        mapping = super().get_mapping_from_provider(org_id, data)
+        mapping = super(StatusCheckSettings, cls).get_mapping_from_provider(org_id, data)
 
         def transform_status_check(status_check):
             if "app_slug" in status_check:
@@ -156,7 +159,7 @@ class StatusCheckSettings(EmbeddedModelObject):
     async def get_mapping_to_provider(
         cls, org_id: str, data: dict[str, Any], provider: GitHubProvider
     ) -> dict[str, Any]:
-        mapping = super().get_mapping_from_provider(org_id, data)
+        mapping = super(StatusCheckSettings, cls).get_mapping_from_provider(org_id, data)
 
         if "status_checks" in data:
 
@@ -208,7 +211,7 @@ class StatusCheckSettings(EmbeddedModelObject):
         return mapping
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class MergeQueueSettings(EmbeddedModelObject):
     merge_method: str
     build_concurrency: int
@@ -256,7 +259,7 @@ class MergeQueueSettings(EmbeddedModelObject):
 
     @classmethod
     def get_mapping_from_provider(cls, org_id: str, data: dict[str, Any]) -> dict[str, Any]:
-        mapping = super().get_mapping_from_provider(org_id, data)
+        mapping = super(MergeQueueSettings, cls).get_mapping_from_provider(org_id, data)
 
         mapping.update(
             {
@@ -277,7 +280,7 @@ class MergeQueueSettings(EmbeddedModelObject):
     async def get_mapping_to_provider(
         cls, org_id: str, data: dict[str, Any], provider: GitHubProvider
     ) -> dict[str, Any]:
-        mapping = super().get_mapping_from_provider(org_id, data)
+        mapping = super(MergeQueueSettings, cls).get_mapping_from_provider(org_id, data)
 
         mapping.update(
             {
@@ -306,7 +309,7 @@ class MergeQueueSettings(EmbeddedModelObject):
         return mapping
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Ruleset(ModelObject, abc.ABC):
     """
     Represents a Ruleset.
@@ -438,30 +441,12 @@ class Ruleset(ModelObject, abc.ABC):
         return True
 
     @classmethod
-    def from_model_data(cls, data: dict[str, Any]):
-        mapping = {k: OptionalS(k, default=UNSET) for k in (x.name for x in cls.all_fields())}
-
-        mapping.update(
-            {
-                "required_pull_request": If(
-                    OptionalS("required_pull_request", default=None) == K(None),
-                    K(None),
-                    S("required_pull_request") >> F(lambda x: PullRequestSettings.from_model_data(x)),
-                ),
-                "required_status_checks": If(
-                    OptionalS("required_status_checks", default=None) == K(None),
-                    K(None),
-                    S("required_status_checks") >> F(lambda x: StatusCheckSettings.from_model_data(x)),
-                ),
-                "required_merge_queue": If(
-                    OptionalS("required_merge_queue", default=None) == K(None),
-                    K(None),
-                    S("required_merge_queue") >> F(lambda x: MergeQueueSettings.from_model_data(x)),
-                ),
-            }
-        )
-
-        return cls(**bend(mapping, data))
+    def get_model_data_converters(cls) -> dict[str, Callable[[dict[str, Any]], Any]]:
+        return {
+            "required_pull_request": nested_model("required_pull_request", PullRequestSettings.from_model_data, None),
+            "required_status_checks": nested_model("required_status_checks", StatusCheckSettings.from_model_data, None),
+            "required_merge_queue": nested_model("required_merge_queue", MergeQueueSettings.from_model_data, None),
+        }
 
     @classmethod
     def from_provider_data(cls, org_id: str, data: dict[str, Any]):
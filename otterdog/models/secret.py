@@ -34,7 +34,7 @@ if TYPE_CHECKING:
 ST = TypeVar("ST", bound="Secret")
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Secret(ModelObject, abc.ABC):
     """
     Represents a Secret.
@@ -90,11 +90,6 @@ class Secret(ModelObject, abc.ABC):
     def include_for_live_patch(self, context: LivePatchContext) -> bool:
         return not self.has_dummy_secret()
 
-    @classmethod
-    def from_model_data(cls, data: dict[str, Any]):
-        mapping = {k: OptionalS(k, default=UNSET) for k in (x.name for x in cls.all_fields())}
-        return cls(**bend(mapping, data))
-
     @classmethod
     def from_provider_data(cls, org_id: str, data: dict[str, Any]):
         mapping = cls.get_mapping_from_provider(org_id, data)
@@ -23,7 +23,7 @@ if TYPE_CHECKING:
 VT = TypeVar("VT", bound="Variable")
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Variable(ModelObject, abc.ABC):
     """
     Represents a Variable.
@@ -39,11 +39,6 @@ class Variable(ModelObject, abc.ABC):
                 f"{self.get_model_header()} starts with prefix 'GITHUB_' which is not allowed for variables.",
             )
 
-    @classmethod
-    def from_model_data(cls, data: dict[str, Any]):
-        mapping = {k: OptionalS(k, default=UNSET) for k in (x.name for x in cls.all_fields())}
-        return cls(**bend(mapping, data))
-
     @classmethod
     def from_provider_data(cls, org_id: str, data: dict[str, Any]):
         mapping = cls.get_mapping_from_provider(org_id, data)
@@ -33,7 +33,7 @@ if TYPE_CHECKING:
 WT = TypeVar("WT", bound="Webhook")
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Webhook(ModelObject, abc.ABC):
     """
     Represents a Webhook.
@@ -107,11 +107,6 @@ class Webhook(ModelObject, abc.ABC):
                     f"'insecure_ssl' has value '{self.insecure_ssl}', " f"only values ('0' | '1') are allowed.",
                 )
 
-    @classmethod
-    def from_model_data(cls, data: dict[str, Any]):
-        mapping = {k: OptionalS(k, default=UNSET) for k in (x.name for x in cls.all_fields())}
-        return cls(**bend(mapping, data))
-
     @classmethod
     def from_provider_data(cls, org_id: str, data: dict[str, Any]):
         mapping = cls.get_mapping_from_provider(org_id, data)
@@ -28,7 +28,7 @@ if TYPE_CHECKING:
     from otterdog.providers.github import GitHubProvider
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class WorkflowSettings(ModelObject, abc.ABC):
     """
     Represents workflow settings on organizational / repository level.
@@ -108,11 +108,6 @@ class WorkflowSettings(ModelObject, abc.ABC):
 
         return True
 
-    @classmethod
-    def from_model_data(cls, data: dict[str, Any]):
-        mapping = {k: OptionalS(k, default=UNSET) for k in (x.name for x in cls.all_fields())}
-        return cls(**bend(mapping, data))
-
     @classmethod
     def from_provider_data(cls, org_id: str, data: dict[str, Any]):
         mapping = cls.get_mapping_from_provider(org_id, data)
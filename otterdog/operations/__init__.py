@@ -8,8 +8,9 @@
 
 from __future__ import annotations
 
+import copy
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TypeVar
 
 from otterdog.utils import Change, IndentingPrinter, is_unset, style
 
@@ -18,6 +19,8 @@ if TYPE_CHECKING:
 
     from otterdog.config import OrganizationConfig, OtterdogConfig
 
+OperationT = TypeVar("OperationT", bound="Operation")
+
 
 class Operation(ABC):
     _DEFAULT_WIDTH: int = 33
@@ -44,6 +47,15 @@ class Operation(ABC):
     def printer(self, value: IndentingPrinter):
         self._printer = value
 
+    def with_printer(self: OperationT, printer: IndentingPrinter) -> OperationT:
+        """
+        Returns a copy of this operation that prints its output to the given printer,
+        used to execute the operation for several organizations concurrently.
+        """
+        operation = copy.copy(self)
+        operation.printer = printer
+        return operation
+
     @abstractmethod
     def pre_execute(self) -> None: ...
 
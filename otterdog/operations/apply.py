@@ -11,6 +11,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from otterdog.models import LivePatch, LivePatchType
+from otterdog.models.patch_executor import DEFAULT_PATCH_CONCURRENCY, LivePatchExecutor
 from otterdog.utils import Change, IndentingPrinter, get_approval, style
 
 from .plan import PlanOperation
@@ -36,12 +37,14 @@ class ApplyOperation(PlanOperation):
         delete_resources: bool,
         resolve_secrets: bool = True,
         include_resources_with_secrets: bool = True,
+        patch_concurrency: int = DEFAULT_PATCH_CONCURRENCY,
     ):
         super().__init__(no_web_ui, repo_filter, update_webhooks, update_secrets, update_filter)
         self._force_processing = force_processing
         self._delete_resources = delete_resources
         self._resolve_secrets = resolve_secrets
         self._include_resources_with_secrets = include_resources_with_secrets
+        self._patch_concurrency = patch_concurrency
 
     def init(self, config: OtterdogConfig, printer: IndentingPrinter) -> None:
         super().init(config, printer)
@@ -119,20 +122,20 @@ class ApplyOperation(PlanOperation):
         # apply patches
         import click
 
-        errors = 0
+        patches_to_apply = [
+            patch for patch in patches if patch.patch_type != LivePatchType.REMOVE or self._delete_resources
+        ]
+
+        executor = LivePatchExecutor(org_id, self.gh_client, self._patch_concurrency)
 
         self.printer.println("\nApplying changes:\n")
-        with click.progressbar(patches, file=self.printer.writer) as bar:
-            for patch in bar:
-                if patch.patch_type == LivePatchType.REMOVE and not self._delete_resources:
-                    continue
-                else:
-                    try:
-                        await patch.apply(org_id, self.gh_client)
-                    except RuntimeError as ex:
-                        errors += 1
-                        self.printer.println()
-                        self.printer.print_error(f"failed to apply patch: {patch!r}\n{ex}")
+        with click.progressbar(length=len(patches_to_apply), file=self.printer.writer) as bar:
+            errors = await executor.execute(patches_to_apply, lambda _: bar.update(1))
+
+        for error in errors:
+            self.printer.print_error(f"failed to apply patch: {error.patch!r}\n{error.error}")
+
+        await self._invalidate_snapshot(org_id, patches)
 
         delete_snippet = "deleted" if self._delete_resources else "live resources ignored"
 
@@ -144,7 +147,30 @@ class ApplyOperation(PlanOperation):
             f"{diff_status.deletions} {delete_snippet}."
         )
 
-        return errors
+        return len(errors)
+
+    async def _invalidate_snapshot(self, org_id: str, patches: list[LivePatch]) -> None:
+        from otterdog.cache import get_snapshot_store
+        from otterdog.models.repository import Repository
+
+        snapshot_store = get_snapshot_store()
+        if snapshot_store is None:
+            return
+
+        modified_repos = set()
+        for patch in patches:
+            model_object = patch.expected_object if patch.expected_object is not None else patch.current_object
+
+            if isinstance(model_object, Repository):
+                modified_repos.add(model_object.name)
+            elif isinstance(patch.parent_object, Repository):
+                modified_repos.add(patch.parent_object.name)
+            else:
+                # changes to the organization might affect the effective settings of any repo
+                await snapshot_store.delete(org_id)
+                return
+
+        await snapshot_store.mark_dirty(org_id, modified_repos)
 
     def execute_custom_hook_if_present(
         self, org_config: OrganizationConfig, model_object: ModelObject, filename: str
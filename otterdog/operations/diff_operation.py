@@ -9,11 +9,11 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from typing import TYPE_CHECKING, Protocol
+from typing import TYPE_CHECKING, Protocol, TypeVar
 
 import aiofiles.ospath
 
-from otterdog.models import LivePatch, LivePatchContext, LivePatchType
+from otterdog.models import LivePatch, LivePatchContext, LivePatchType, resolve_secrets
 from otterdog.models.github_organization import GitHubOrganization
 from otterdog.providers.github import GitHubProvider
 from otterdog.utils import Change, IndentingPrinter, style
@@ -46,6 +46,9 @@ class CallbackFn(Protocol):
     def __call__(self, org_id: str, diff_status: DiffStatus, patches: list[LivePatch]) -> None: ...
 
 
+DiffOperationT = TypeVar("DiffOperationT", bound="DiffOperation")
+
+
 class DiffOperation(Operation):
     def __init__(
         self,
@@ -94,6 +97,11 @@ class DiffOperation(Operation):
         super().init(config, printer)
         self._validator.init(config, printer)
 
+    def with_printer(self: DiffOperationT, printer: IndentingPrinter) -> DiffOperationT:
+        operation = super().with_printer(printer)
+        operation._validator = self._validator.with_printer(printer)
+        return operation
+
     async def execute(self, org_config: OrganizationConfig) -> int:
         self._org_config = org_config
 
@@ -237,9 +245,10 @@ class DiffOperation(Operation):
 
         # resolve secrets for collected patches
         if self.resolve_secrets():
-            for live_patch in live_patches:
-                if live_patch.expected_object is not None:
-                    live_patch.expected_object.resolve_secrets(self.config.get_secret)
+            resolve_secrets(
+                [live_patch.expected_object for live_patch in live_patches if live_patch.expected_object is not None],
+                self.config,
+            )
 
         status = await self.handle_finish(github_id, diff_status, live_patches)
 
@@ -253,7 +262,13 @@ class DiffOperation(Operation):
 
     async def load_current_org(self, github_id: str, jsonnet_config: JsonnetConfig) -> GitHubOrganization:
         return await GitHubOrganization.load_from_provider(
-            github_id, jsonnet_config, self.gh_client, self.no_web_ui, self.printer, self.concurrency
+            github_id,
+            jsonnet_config,
+            self.gh_client,
+            self.no_web_ui,
+            self.printer,
+            self.concurrency,
+            self.config.github_bulk_load,
         )
 
     def preprocess_orgs(
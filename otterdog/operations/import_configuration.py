@@ -84,7 +84,12 @@ class ImportOperation(Operation):
 
             async with GitHubProvider(credentials) as provider:
                 organization = await GitHubOrganization.load_from_provider(
-                    github_id, jsonnet_config, provider, self.no_web_ui, self.printer
+                    github_id,
+                    jsonnet_config,
+                    provider,
+                    self.no_web_ui,
+                    self.printer,
+                    bulk_load=self.config.github_bulk_load,
                 )
 
             # copy secrets from existing configuration if it is present.
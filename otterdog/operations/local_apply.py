@@ -13,6 +13,7 @@ from typing import TYPE_CHECKING
 from aiofiles import ospath
 
 from otterdog.models.github_organization import GitHubOrganization
+from otterdog.models.patch_executor import DEFAULT_PATCH_CONCURRENCY
 
 from .apply import ApplyOperation
 
@@ -33,6 +34,7 @@ class LocalApplyOperation(ApplyOperation):
         delete_resources: bool,
         resolve_secrets: bool = True,
         include_resources_with_secrets: bool = True,
+        patch_concurrency: int = DEFAULT_PATCH_CONCURRENCY,
     ) -> None:
         super().__init__(
             force_processing=force_processing,
@@ -44,6 +46,7 @@ class LocalApplyOperation(ApplyOperation):
             delete_resources=delete_resources,
             resolve_secrets=resolve_secrets,
             include_resources_with_secrets=include_resources_with_secrets,
+            patch_concurrency=patch_concurrency,
         )
 
         self._suffix = suffix
@@ -59,7 +59,12 @@ class ShowLiveOperation(Operation):
                     )
 
                 organization = await GitHubOrganization.load_from_provider(
-                    github_id, jsonnet_config, provider, self.no_web_ui, self.printer
+                    github_id,
+                    jsonnet_config,
+                    provider,
+                    self.no_web_ui,
+                    self.printer,
+                    bulk_load=self.config.github_bulk_load,
                 )
 
             for model_object, parent_object in organization.get_model_objects():
@@ -11,18 +11,23 @@ from __future__ import annotations
 import contextlib
 import json
 from asyncio import CancelledError
+from functools import partial
 from typing import TYPE_CHECKING
 
 from importlib_resources import files
 
 from otterdog import resources
-from otterdog.utils import is_ghsa_repo, is_set_and_present, print_trace, print_warn
+from otterdog.utils import is_ghsa_repo, is_set_and_present, print_debug, print_trace, print_warn
+
+from .resource_ids import ResourceIdIndex
 
 if TYPE_CHECKING:
     from typing import Any
 
     from otterdog.credentials import Credentials
 
+# maximum number of concurrent requests when retrieving the data of a single repo
+MAX_REPO_CONCURRENCY = 8
 
 _ORG_SETTINGS_SCHEMA = json.loads(files(resources).joinpath("schemas/settings.json").read_text())
 
@@ -41,6 +46,8 @@ def is_org_settings_key_retrieved_via_web_ui(key: str) -> bool:
 class GitHubProvider:
     def __init__(self, credentials: Credentials | None):
         self._credentials = credentials
+        # ids of resources by their natural key, resolved at most once per run
+        self.resource_ids = ResourceIdIndex()
 
         if credentials is not None:
             self._init_clients()
@@ -64,12 +71,19 @@ class GitHubProvider:
         from otterdog.providers.github.auth import token_auth
 
         from .graphql import GraphQLClient
+        from .rate_limit import get_shared_rate_limiter
         from .rest import RestApi
         from .web import WebClient
 
-        self.rest_api = RestApi(token_auth(self._credentials.github_token), get_github_cache())
+        # share the rate limiter with all clients of the same account,
+        # e.g. when processing multiple organizations concurrently.
+        rate_limiter = get_shared_rate_limiter(self._credentials.account_key)
+
+        self.rest_api = RestApi(token_auth(self._credentials.github_token), get_github_cache(), rate_limiter)
         self.web_client = WebClient(self._credentials)
-        self.graphql_client = GraphQLClient(token_auth(self._credentials.github_token), get_github_cache())
+        self.graphql_client = GraphQLClient(
+            token_auth(self._credentials.github_token), get_github_cache(), rate_limiter
+        )
 
     async def get_content(self, org_id: str, repo_name: str, path: str, ref: str | None = None) -> str:
         return await self.rest_api.content.get_content(org_id, repo_name, path, ref)
@@ -106,13 +120,30 @@ class GitHubProvider:
         if not no_web_ui:
             required_web_keys = {x for x in included_keys if x in _SETTINGS_WEB_KEYS}
             if len(required_web_keys) > 0:
-                web_settings = await self.web_client.get_org_settings(org_id, required_web_keys)
+                web_settings = await self._get_org_web_settings(org_id, required_web_keys)
                 merged_settings.update(web_settings)
 
             print_trace(f"merged org settings = {merged_settings}")
 
         return merged_settings
 
+    async def _get_org_web_settings(self, org_id: str, required_web_keys: set[str]) -> dict[str, Any]:
+        from otterdog.cache import get_web_settings_cache
+
+        web_settings_cache = get_web_settings_cache()
+        if web_settings_cache is not None:
+            cached_settings = await web_settings_cache.load(org_id, required_web_keys)
+            if cached_settings is not None:
+                print_debug("reusing cached settings retrieved via web interface")
+                return cached_settings
+
+        web_settings = await self.web_client.get_org_settings(org_id, required_web_keys)
+
+        if web_settings_cache is not None:
+            await web_settings_cache.save(org_id, web_settings)
+
+        return web_settings
+
     async def update_org_settings(self, org_id: str, settings: dict[str, Any]) -> None:
         rest_fields = {}
         web_fields = {}
@@ -133,6 +164,13 @@ class GitHubProvider:
 
         # update any settings via the web interface
         if len(web_fields) > 0:
+            from otterdog.cache import get_web_settings_cache
+
+            # invalidate cached settings first, in case the update fails halfway
+            web_settings_cache = get_web_settings_cache()
+            if web_settings_cache is not None:
+                await web_settings_cache.delete(org_id)
+
             await self.web_client.update_org_settings(org_id, web_fields)
 
     async def get_org_workflow_settings(self, org_id: str) -> dict[str, Any]:
@@ -144,6 +182,9 @@ class GitHubProvider:
     async def get_org_custom_properties(self, org_id: str) -> list[dict[str, Any]]:
         return await self.rest_api.org.get_custom_properties(org_id)
 
+    async def get_org_custom_property_values(self, org_id: str) -> list[dict[str, Any]]:
+        return await self.rest_api.org.get_custom_property_values(org_id)
+
     async def add_org_custom_property(self, org_id: str, property_name: str, data: dict[str, str]) -> None:
         await self.rest_api.org.add_custom_property(org_id, property_name, data)
 
@@ -154,32 +195,65 @@ class GitHubProvider:
         await self.rest_api.org.delete_custom_property(org_id, property_name)
 
     async def get_org_webhooks(self, org_id: str) -> list[dict[str, Any]]:
-        return await self.rest_api.org.get_webhooks(org_id)
+        webhooks = await self.rest_api.org.get_webhooks(org_id)
+        self.resource_ids.add_all(
+            _org_webhooks_key(org_id), {webhook["config"]["url"]: webhook["id"] for webhook in webhooks}
+        )
+        return webhooks
 
     async def update_org_webhook(self, org_id: str, webhook_id: int, url: str, webhook: dict[str, Any]) -> None:
         if len(webhook) > 0:
             if not is_set_and_present(webhook_id):
-                webhook_id = await self.rest_api.org.get_webhook_id(org_id, url)
+                webhook_id = await self._get_org_webhook_id(org_id, url)
 
             await self.rest_api.org.update_webhook(org_id, webhook_id, webhook)
 
     async def add_org_webhook(self, org_id: str, data: dict[str, str]) -> None:
-        await self.rest_api.org.add_webhook(org_id, data)
+        try:
+            await self.rest_api.org.add_webhook(org_id, data)
+        finally:
+            # the id of the new webhook is not known, list the webhooks again when resolving an id
+            self.resource_ids.invalidate(_org_webhooks_key(org_id))
 
     async def delete_org_webhook(self, org_id: str, webhook_id: int, url: str) -> None:
         if not is_set_and_present(webhook_id):
-            webhook_id = await self.rest_api.org.get_webhook_id(org_id, url)
+            webhook_id = await self._get_org_webhook_id(org_id, url)
 
+        self.resource_ids.discard(_org_webhooks_key(org_id), url)
         await self.rest_api.org.delete_webhook(org_id, webhook_id, url)
 
+    async def _get_org_webhook_id(self, org_id: str, url: str) -> int:
+        webhook_id = await self.resource_ids.resolve(
+            _org_webhooks_key(org_id), url, partial(self.rest_api.org.get_webhook_ids, org_id)
+        )
+        if webhook_id is None:
+            raise RuntimeError(f"failed to find org webhook with url '{url}'")
+
+        return webhook_id
+
     async def get_repos(self, org_id: str) -> list[str]:
         # filter out repos which are created to work on GitHub Security Advisories
         # they should not be part of the visible configuration
         return list(filter(lambda name: not is_ghsa_repo(name), await self.rest_api.org.get_repos(org_id)))
 
+    async def get_repo_summaries(self, org_id: str) -> list[dict[str, Any]]:
+        return list(
+            filter(lambda repo: not is_ghsa_repo(repo["name"]), await self.rest_api.org.get_repo_summaries(org_id))
+        )
+
     async def get_repo_data(self, org_id: str, repo_name: str) -> dict[str, Any]:
         return await self.rest_api.repo.get_repo_data(org_id, repo_name)
 
+    async def get_bulk_repo_data(self, org_id: str, repo_names: list[str]) -> dict[str, dict[str, Any]]:
+        bulk_data = await self.graphql_client.get_bulk_repo_data(org_id, repo_names)
+
+        for repo_name, repo_data in bulk_data.items():
+            # branch protection rules are only included if all of them could be retrieved
+            if "branch_protection_rules" in repo_data:
+                self._add_branch_protection_rule_ids(org_id, repo_name, repo_data["branch_protection_rules"])
+
+        return bulk_data
+
     async def get_repo_by_id(self, repo_id: int) -> dict[str, Any]:
         return await self.rest_api.repo.get_repo_by_id(repo_id)
 
@@ -211,7 +285,9 @@ class GitHubProvider:
         await self.rest_api.repo.delete_repo(org_id, repo_name)
 
     async def get_branch_protection_rules(self, org_id: str, repo: str) -> list[dict[str, Any]]:
-        return await self.graphql_client.get_branch_protection_rules(org_id, repo)
+        rules = await self.graphql_client.get_branch_protection_rules(org_id, repo)
+        self._add_branch_protection_rule_ids(org_id, repo, rules)
+        return rules
 
     async def update_branch_protection_rule(
         self,
@@ -222,7 +298,7 @@ class GitHubProvider:
         data: dict[str, Any],
     ) -> None:
         if not is_set_and_present(rule_id):
-            rule_id = await self.graphql_client.get_branch_protection_rule_id(org_id, repo_name, rule_pattern)
+            rule_id = await self._get_branch_protection_rule_id(org_id, repo_name, rule_pattern)
 
         await self.graphql_client.update_branch_protection_rule(org_id, repo_name, rule_pattern, rule_id, data)
 
@@ -238,7 +314,10 @@ class GitHubProvider:
             repo_data = await self.rest_api.repo.get_simple_repo_data(org_id, repo_name)
             repo_node_id = repo_data["node_id"]
 
-        await self.graphql_client.add_branch_protection_rule(org_id, repo_name, repo_node_id, data)
+        try:
+            await self.graphql_client.add_branch_protection_rule(org_id, repo_name, repo_node_id, data)
+        finally:
+            self.resource_ids.invalidate(_branch_protection_rules_key(org_id, repo_name))
 
     async def delete_branch_protection_rule(
         self,
@@ -248,49 +327,103 @@ class GitHubProvider:
         rule_pattern: str,
     ) -> None:
         if not is_set_and_present(rule_id):
-            rule_id = await self.graphql_client.get_branch_protection_rule_id(org_id, repo_name, rule_pattern)
+            rule_id = await self._get_branch_protection_rule_id(org_id, repo_name, rule_pattern)
 
+        self.resource_ids.discard(_branch_protection_rules_key(org_id, repo_name), rule_pattern)
         await self.graphql_client.delete_branch_protection_rule(org_id, repo_name, rule_pattern, rule_id)
 
+    def _add_branch_protection_rule_ids(self, org_id: str, repo_name: str, rules: list[dict[str, Any]]) -> None:
+        self.resource_ids.add_all(
+            _branch_protection_rules_key(org_id, repo_name), {rule["pattern"]: rule["id"] for rule in rules}
+        )
+
+    async def _get_branch_protection_rule_id(self, org_id: str, repo_name: str, rule_pattern: str) -> str:
+        rule_id = await self.resource_ids.resolve(
+            _branch_protection_rules_key(org_id, repo_name),
+            rule_pattern,
+            partial(self.graphql_client.get_branch_protection_rule_ids, org_id, repo_name),
+        )
+        if rule_id is None:
+            raise RuntimeError(f"failed to find branch protection rule with pattern '{rule_pattern}'")
+
+        return rule_id
+
+    async def get_repo_rulesets(self, org_id: str, repo_name: str) -> list[dict[str, Any]]:
+        rulesets = await self.rest_api.repo.get_rulesets(org_id, repo_name)
+        self.resource_ids.add_all(
+            _repo_rulesets_key(org_id, repo_name), {ruleset["name"]: ruleset["id"] for ruleset in rulesets}
+        )
+        return rulesets
+
     async def update_repo_ruleset(
         self, org_id: str, repo_name: str, ruleset_id: int, name: str, ruleset: dict[str, Any]
     ) -> None:
         if len(ruleset) > 0:
             if not is_set_and_present(ruleset_id):
-                ruleset_id = await self.rest_api.repo.get_ruleset_id(org_id, repo_name, name)
+                ruleset_id = await self._get_repo_ruleset_id(org_id, repo_name, name)
 
             await self.rest_api.repo.update_ruleset(org_id, repo_name, ruleset_id, ruleset)
 
     async def add_repo_ruleset(self, org_id: str, repo_name: str, data: dict[str, str]) -> None:
-        await self.rest_api.repo.add_ruleset(org_id, repo_name, data)
+        try:
+            await self.rest_api.repo.add_ruleset(org_id, repo_name, data)
+        finally:
+            self.resource_ids.invalidate(_repo_rulesets_key(org_id, repo_name))
 
     async def delete_repo_ruleset(self, org_id: str, repo_name: str, ruleset_id: int, name: str) -> None:
         if not is_set_and_present(ruleset_id):
-            ruleset_id = await self.rest_api.repo.get_ruleset_id(org_id, repo_name, name)
+            ruleset_id = await self._get_repo_ruleset_id(org_id, repo_name, name)
 
+        self.resource_ids.discard(_repo_rulesets_key(org_id, repo_name), name)
         await self.rest_api.repo.delete_ruleset(org_id, repo_name, ruleset_id, name)
 
+    async def _get_repo_ruleset_id(self, org_id: str, repo_name: str, name: str) -> int:
+        ruleset_id = await self.resource_ids.resolve(
+            _repo_rulesets_key(org_id, repo_name), name, partial(self.rest_api.repo.get_ruleset_ids, org_id, repo_name)
+        )
+        if ruleset_id is None:
+            raise RuntimeError(f"failed to find repo ruleset with name '{name}'")
+
+        return ruleset_id
+
     async def get_repo_webhooks(self, org_id: str, repo_name: str) -> list[dict[str, Any]]:
-        return await self.rest_api.repo.get_webhooks(org_id, repo_name)
+        webhooks = await self.rest_api.repo.get_webhooks(org_id, repo_name)
+        self.resource_ids.add_all(
+            _repo_webhooks_key(org_id, repo_name), {webhook["config"]["url"]: webhook["id"] for webhook in webhooks}
+        )
+        return webhooks
 
     async def update_repo_webhook(
         self, org_id: str, repo_name: str, webhook_id: int, url: str, webhook: dict[str, Any]
     ) -> None:
         if len(webhook) > 0:
             if not is_set_and_present(webhook_id):
-                webhook_id = await self.rest_api.repo.get_webhook_id(org_id, repo_name, url)
+                webhook_id = await self._get_repo_webhook_id(org_id, repo_name, url)
 
             await self.rest_api.repo.update_webhook(org_id, repo_name, webhook_id, webhook)
 
     async def add_repo_webhook(self, org_id: str, repo_name: str, data: dict[str, str]) -> None:
-        await self.rest_api.repo.add_webhook(org_id, repo_name, data)
+        try:
+            await self.rest_api.repo.add_webhook(org_id, repo_name, data)
+        finally:
+            self.resource_ids.invalidate(_repo_webhooks_key(org_id, repo_name))
 
     async def delete_repo_webhook(self, org_id: str, repo_name: str, webhook_id: int, url: str) -> None:
         if not is_set_and_present(webhook_id):
-            webhook_id = await self.rest_api.repo.get_webhook_id(org_id, repo_name, url)
+            webhook_id = await self._get_repo_webhook_id(org_id, repo_name, url)
 
+        self.resource_ids.discard(_repo_webhooks_key(org_id, repo_name), url)
         await self.rest_api.repo.delete_webhook(org_id, repo_name, webhook_id, url)
 
+    async def _get_repo_webhook_id(self, org_id: str, repo_name: str, url: str) -> int:
+        webhook_id = await self.resource_ids.resolve(
+            _repo_webhooks_key(org_id, repo_name), url, partial(self.rest_api.repo.get_webhook_ids, org_id, repo_name)
+        )
+        if webhook_id is None:
+            raise RuntimeError(f"failed to find repo webhook with url '{url}'")
+
+        return webhook_id
+
     async def get_repo_environments(self, org_id: str, repo_name: str) -> list[dict[str, Any]]:
         return await self.rest_api.repo.get_environments(org_id, repo_name)
 
@@ -413,3 +546,19 @@ class GitHubProvider:
 
     async def get_ref_for_pull_request(self, org_id: str, repo_name: str, pull_number: str) -> str:
         return await self.rest_api.repo.get_ref_for_pull_request(org_id, repo_name, pull_number)
+
+
+def _org_webhooks_key(org_id: str) -> tuple[str, ...]:
+    return "org_webhooks", org_id
+
+
+def _repo_webhooks_key(org_id: str, repo_name: str) -> tuple[str, ...]:
+    return "repo_webhooks", org_id, repo_name
+
+
+def _repo_rulesets_key(org_id: str, repo_name: str) -> tuple[str, ...]:
+    return "repo_rulesets", org_id, repo_name
+
+
+def _branch_protection_rules_key(org_id: str, repo_name: str) -> tuple[str, ...]:
+    return "branch_protection_rules", org_id, repo_name
@@ -15,6 +15,8 @@ if TYPE_CHECKING:
     from collections.abc import MutableMapping
     from typing import Any
 
+    from .token import RefreshableTokenAuthStrategy
+
 
 class AuthImpl:
     @abstractmethod
@@ -36,3 +38,9 @@ def token_auth(github_token: str) -> AuthStrategy:
     from .token import TokenAuthStrategy
 
     return TokenAuthStrategy(github_token)
+
+
+def refreshable_token_auth(github_token: str) -> RefreshableTokenAuthStrategy:
+    from .token import RefreshableTokenAuthStrategy
+
+    return RefreshableTokenAuthStrategy(github_token)
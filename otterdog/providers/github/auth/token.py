@@ -40,3 +40,31 @@ class _TokenAuth(AuthImpl):
 
     def update_headers_with_authorization(self, headers: MutableMapping[str, Any]) -> None:
         headers["Authorization"] = f"Bearer {self.token}"
+
+
+class RefreshableTokenAuthStrategy(AuthStrategy):
+    """
+    An AuthStrategy using a token that can be replaced while in use,
+    e.g. to refresh an expiring installation token of a long-lived client.
+    """
+
+    def __init__(self, token: str):
+        self._auth = _RefreshableTokenAuth(token)
+
+    @property
+    def token(self) -> str:
+        return self._auth.token
+
+    def update_token(self, token: str) -> None:
+        self._auth.token = token
+
+    def get_auth(self) -> AuthImpl:
+        return self._auth
+
+
+class _RefreshableTokenAuth(AuthImpl):
+    def __init__(self, token: str):
+        self.token = token
+
+    def update_headers_with_authorization(self, headers: MutableMapping[str, Any]) -> None:
+        headers["Authorization"] = f"Bearer {self.token}"
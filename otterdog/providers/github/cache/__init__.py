@@ -26,3 +26,9 @@ class CacheStrategy(ABC):
 
     @abstractmethod
     def get_request_parameters(self) -> dict[str, Any]: ...
+
+    def get_max_stale(self) -> int:
+        """
+        Returns the number of seconds a cached response is used without revalidating it.
+        """
+        return 0
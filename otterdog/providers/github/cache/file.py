@@ -20,13 +20,14 @@ if TYPE_CHECKING:
 _AIOHTTP_CACHE_DIR = ".cache/async_http"
 
 
-def file_cache(cache_dir: str = _AIOHTTP_CACHE_DIR) -> CacheStrategy:
-    return _FileCache(cache_dir)
+def file_cache(cache_dir: str = _AIOHTTP_CACHE_DIR, max_stale: int = 0) -> CacheStrategy:
+    return _FileCache(cache_dir, max_stale)
 
 
 class _FileCache(CacheStrategy):
-    def __init__(self, cache_dir: str):
+    def __init__(self, cache_dir: str, max_stale: int):
         self._cache_dir = cache_dir
+        self._max_stale = max_stale
 
     def get_cache_backend(self) -> CacheBackend:
         from aiohttp_client_cache.backends import FileBackend
@@ -42,5 +43,8 @@ class _FileCache(CacheStrategy):
     def get_request_parameters(self) -> dict[str, Any]:
         return {"refresh": True}
 
+    def get_max_stale(self) -> int:
+        return self._max_stale
+
     def __str__(self):
-        return f"file-cache('{self._cache_dir}')"
+        return f"file-cache('{self._cache_dir}', max_stale={self._max_stale})"
@@ -19,14 +19,15 @@ if TYPE_CHECKING:
     from redis.asyncio.client import Redis
 
 
-def redis_cache(uri: str, connection: Redis | None = None) -> CacheStrategy:
-    return _RedisCache(uri, connection)
+def redis_cache(uri: str, connection: Redis | None = None, max_stale: int = 0) -> CacheStrategy:
+    return _RedisCache(uri, connection, max_stale)
 
 
 class _RedisCache(CacheStrategy):
-    def __init__(self, redis_uri: str, connection: Redis | None):
+    def __init__(self, redis_uri: str, connection: Redis | None, max_stale: int):
         self._redis_uri = redis_uri
         self._connection = connection
+        self._max_stale = max_stale
 
     def get_cache_backend(self) -> CacheBackend:
         from aiohttp_client_cache.backends import RedisBackend
@@ -39,5 +40,8 @@ class _RedisCache(CacheStrategy):
     def get_request_parameters(self) -> dict[str, Any]:
         return {"refresh": True}
 
+    def get_max_stale(self) -> int:
+        return self._max_stale
+
     def __str__(self):
-        return f"redis-cache('{self._redis_uri}')"
+        return f"redis-cache('{self._redis_uri}', max_stale={self._max_stale})"
@@ -8,6 +8,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 from functools import cache
 from typing import TYPE_CHECKING
@@ -15,6 +16,7 @@ from typing import TYPE_CHECKING
 from aiohttp.client import ClientSession, ClientTimeout, TCPConnector
 from aiohttp_retry import ExponentialRetry, RetryClient
 
+from otterdog.providers.github.rate_limit import RateLimiter
 from otterdog.providers.github.stats import RequestStatistics
 from otterdog.utils import is_trace_enabled, print_debug, print_trace, query_json
 
@@ -24,11 +26,47 @@ if TYPE_CHECKING:
     from otterdog.providers.github.auth import AuthStrategy
     from otterdog.providers.github.cache import CacheStrategy
 
+# repository settings that are retrieved in bulk, mapped to their key in the data returned by the rest api
+_BULK_REPO_SETTINGS = {
+    "databaseId": "id",
+    "id": "node_id",
+    "name": "name",
+    "description": "description",
+    "homepageUrl": "homepage",
+    "isPrivate": "private",
+    "isArchived": "archived",
+    "isTemplate": "is_template",
+    "hasIssuesEnabled": "has_issues",
+    "hasProjectsEnabled": "has_projects",
+    "hasWikiEnabled": "has_wiki",
+    "hasDiscussionsEnabled": "has_discussions",
+    "forkingAllowed": "allow_forking",
+    "mergeCommitAllowed": "allow_merge_commit",
+    "rebaseMergeAllowed": "allow_rebase_merge",
+    "squashMergeAllowed": "allow_squash_merge",
+    "autoMergeAllowed": "allow_auto_merge",
+    "allowUpdateBranch": "allow_update_branch",
+    "deleteBranchOnMerge": "delete_branch_on_merge",
+    "webCommitSignoffRequired": "web_commit_signoff_required",
+    "squashMergeCommitTitle": "squash_merge_commit_title",
+    "squashMergeCommitMessage": "squash_merge_commit_message",
+    "mergeCommitTitle": "merge_commit_title",
+    "mergeCommitMessage": "merge_commit_message",
+}
+
 
 class GraphQLClient:
     _GH_GRAPHQL_URL_ROOT = "api.github.com/graphql"
 
-    def __init__(self, auth_strategy: AuthStrategy, cache_strategy: CacheStrategy | None = None):
+    # number of retries for queries that hit a rate limit
+    _RATE_LIMIT_RETRIES = 3
+
+    def __init__(
+        self,
+        auth_strategy: AuthStrategy,
+        cache_strategy: CacheStrategy | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
         self._auth = auth_strategy.get_auth()
 
         self._headers = {
@@ -36,6 +74,7 @@ class GraphQLClient:
         }
 
         self._statistics = RequestStatistics()
+        self._rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
 
         self._cache_strategy = cache_strategy
 
@@ -48,7 +87,7 @@ class GraphQLClient:
 
         self._session = ClientSession(
             timeout=ClientTimeout(connect=3, sock_connect=3),
-            connector=TCPConnector(limit=10),
+            connector=TCPConnector(limit=self._rate_limiter.max_concurrency),
         )
 
         self._client = RetryClient(
@@ -69,17 +108,16 @@ class GraphQLClient:
     def statistics(self) -> RequestStatistics:
         return self._statistics
 
-    async def get_branch_protection_rule_id(self, org_id: str, repo_name: str, pattern: str) -> str:
-        print_debug(f"getting branch protection rule id for pattern '{pattern}' at repo '{org_id}/{repo_name}'")
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self._rate_limiter
+
+    async def get_branch_protection_rule_ids(self, org_id: str, repo_name: str) -> dict[str, str]:
+        print_debug(f"retrieving ids of branch protection rules for repo '{org_id}/{repo_name}'")
 
         variables = {"organization": org_id, "repository": repo_name}
         branch_protection_rules = await self._run_paged_query(variables, "get-branch-protection-rule-ids.gql")
-
-        for rule in branch_protection_rules:
-            if rule["pattern"] == pattern:
-                return rule["id"]
-
-        raise RuntimeError(f"failed to find branch protection rule with pattern '{pattern}'")
+        return {rule["pattern"]: rule["id"] for rule in branch_protection_rules}
 
     async def get_branch_protection_rules(self, org_id: str, repo_name: str) -> list[dict[str, Any]]:
         print_debug(f"retrieving branch protection rules for repo '{org_id}/{repo_name}'")
@@ -87,36 +125,111 @@ class GraphQLClient:
         variables = {"organization": org_id, "repository": repo_name}
         branch_protection_rules = await self._run_paged_query(variables, "get-branch-protection-rules.gql")
 
-        for branch_protection_rule in branch_protection_rules:
-            await self._fill_paged_results_if_needed(
+        await asyncio.gather(*[self._fill_branch_protection_rule_actors(rule) for rule in branch_protection_rules])
+        return branch_protection_rules
+
+    async def get_bulk_repo_data(self, org_id: str, repo_names: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Retrieves data for several repositories of an organization with a single query.
+
+        The returned dict maps the name of each repository to its data, containing the
+        settings of the repository using the same keys as the rest api, 'topics',
+        'dependabot_alerts_enabled' (only for non-archived repos), 'environments' (only if
+        the repository has no environments) and 'branch_protection_rules' (only if all
+        rules could be retrieved without paging). Repositories that could not be queried
+        are not included in the result.
+        """
+        print_debug(f"retrieving bulk data for {len(repo_names)} repos of org '{org_id}'")
+
+        variable_definitions = "".join(f", $repo{i}: String!" for i in range(len(repo_names)))
+        selections = "\n".join(
+            f"  repo{i}: repository(owner: $organization, name: $repo{i}) {{ ...BulkRepositoryData }}"
+            for i in range(len(repo_names))
+        )
+        query = (
+            f"query($organization: String!{variable_definitions}) {{\n{selections}\n}}\n"
+            f"{_get_query_from_file('get-bulk-repo-data.gql')}"
+        )
+
+        variables = {"organization": org_id}
+        variables.update({f"repo{i}": repo_name for i, repo_name in enumerate(repo_names)})
+
+        status, body = await self._request_raw("POST", query, variables)
+        json_data = json.loads(body)
+        if status >= 400 or json_data.get("data") is None:
+            raise RuntimeError(f"failed retrieving bulk repo data for org '{org_id}': {body}")
+
+        result = {}
+        rules_to_fill = []
+        for i, repo_name in enumerate(repo_names):
+            github_repo = json_data["data"].get(f"repo{i}")
+            if github_repo is None:
+                continue
+
+            repo_data: dict[str, Any] = {
+                key: github_repo[field] for field, key in _BULK_REPO_SETTINGS.items() if field in github_repo
+            }
+
+            if "templateRepository" in github_repo:
+                template_repository = github_repo["templateRepository"]
+                repo_data["template_repository"] = (
+                    {"full_name": template_repository["nameWithOwner"]} if template_repository is not None else None
+                )
+
+            # empty repositories have no default branch ref, it is read separately
+            default_branch_ref = github_repo.get("defaultBranchRef")
+            if default_branch_ref is not None:
+                repo_data["default_branch"] = default_branch_ref["name"]
+
+            repo_data["topics"] = [node["topic"]["name"] for node in github_repo["repositoryTopics"]["nodes"]]
+
+            # fields might be null if the token lacks the required permissions
+            vulnerability_alerts = github_repo.get("hasVulnerabilityAlertsEnabled")
+            if not github_repo["isArchived"] and vulnerability_alerts is not None:
+                repo_data["dependabot_alerts_enabled"] = vulnerability_alerts
+
+            # environments are only available with separate requests, skip them if there are none
+            if query_json("environments.totalCount", github_repo) == 0:
+                repo_data["environments"] = []
+
+            branch_protection_rules = github_repo["branchProtectionRules"]
+            if not branch_protection_rules["pageInfo"]["hasNextPage"]:
+                rules_to_fill.extend(branch_protection_rules["nodes"])
+                repo_data["branch_protection_rules"] = branch_protection_rules["nodes"]
+
+            result[repo_name] = repo_data
+
+        await asyncio.gather(*[self._fill_branch_protection_rule_actors(rule) for rule in rules_to_fill])
+        return result
+
+    async def _fill_branch_protection_rule_actors(self, branch_protection_rule: dict[str, Any]) -> None:
+        # each actor list is stored in a distinct key of the rule, so they can safely be filled concurrently
+        await asyncio.gather(
+            self._fill_paged_results_if_needed(
                 branch_protection_rule,
                 "pushAllowances",
                 "pushRestrictions",
                 "get-push-allowances.gql",
-            )
-
-            await self._fill_paged_results_if_needed(
+            ),
+            self._fill_paged_results_if_needed(
                 branch_protection_rule,
                 "reviewDismissalAllowances",
                 "reviewDismissalAllowances",
                 "get-review-dismissal-allowances.gql",
-            )
-
-            await self._fill_paged_results_if_needed(
+            ),
+            self._fill_paged_results_if_needed(
                 branch_protection_rule,
                 "bypassPullRequestAllowances",
                 "bypassPullRequestAllowances",
                 "get-bypass-pull-request-allowances.gql",
-            )
-
-            await self._fill_paged_results_if_needed(
+            ),
+            self._fill_paged_results_if_needed(
                 branch_protection_rule,
                 "bypassForcePushAllowances",
                 "bypassForcePushAllowances",
                 "get-bypass-force-push-allowances.gql",
-            )
-
-        return branch_protection_rules
+            ),
+        )
 
     async def _fill_paged_results_if_needed(
         self,
@@ -304,28 +417,37 @@ class GraphQLClient:
         else:
             kwargs = {}
 
-        async with self._client.request(
-            method,
-            url=self._base_url,
-            headers=headers,
-            json={"query": query, "variables": variables},
-            **kwargs,
-        ) as response:
-            self._statistics.sent_request()
+        cost = RateLimiter.get_cost("graphql", method, query.lstrip().startswith("mutation"))
 
-            text = await response.text()
-            status = response.status
+        attempt = 0
+        while True:
+            async with (
+                self._rate_limiter.limit("graphql", cost),
+                self._client.request(
+                    method,
+                    url=self._base_url,
+                    headers=headers,
+                    json={"query": query, "variables": variables},
+                    **kwargs,
+                ) as response,
+            ):
+                self._statistics.sent_request()
 
-            if status == 403 or status == 429:
-                print_trace(f"graphql '{method}' result = ({status}, {text})")
-                raise RuntimeError("failed running graphql query, hitting rate limit")
+                text = await response.text()
+                status = response.status
 
-            self._statistics.update_remaining_rate_limit(int(response.headers.get("x-ratelimit-remaining", -1)))
+                self._statistics.update_remaining_rate_limit(int(response.headers.get("x-ratelimit-remaining", -1)))
+                rate_limited = self._rate_limiter.update("graphql", status, response.headers, text)
 
-            if is_trace_enabled():
-                print_trace(f"graphql '{method}' result = ({status}, {text})")
+                if is_trace_enabled():
+                    print_trace(f"graphql '{method}' result = ({status}, {text})")
 
-            return status, text
+            if not rate_limited:
+                return status, text
+
+            attempt += 1
+            if attempt > self._RATE_LIMIT_RETRIES:
+                raise RuntimeError("failed running graphql query, hitting rate limit")
 
     @staticmethod
     def _transform_actors(actors: list[dict[str, Any]]) -> list[str]:
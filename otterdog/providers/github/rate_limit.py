@@ -0,0 +1,263 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+import weakref
+from typing import TYPE_CHECKING
+
+from otterdog.utils import print_debug, print_trace
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Mapping
+
+# limits as documented in
+# https://docs.github.com/en/rest/using-the-rest-api/rate-limits-for-the-rest-api#about-secondary-rate-limits
+_MAX_CONCURRENCY = 100
+_INITIAL_CONCURRENCY = 30
+_MIN_CONCURRENCY = 1
+
+_POINTS_PER_MINUTE = {
+    "core": 900,
+    "graphql": 2000,
+}
+
+# when less than this fraction of the primary rate limit is left,
+# requests are spread evenly until the rate limit is reset.
+_PRIMARY_RESERVE_RATIO = 0.1
+
+# the minimum time to wait after hitting a secondary rate limit without a retry-after header.
+_SECONDARY_RATE_LIMIT_BACKOFF = 60
+# the maximum time to wait after repeatedly hitting a secondary rate limit without a retry-after header.
+_MAX_SECONDARY_RATE_LIMIT_BACKOFF = 300
+
+
+class _TokenBucket:
+    """
+    A token bucket that supports reservations: a caller can reserve tokens ahead of time
+    and gets back the delay after which the reserved tokens are available.
+    """
+
+    def __init__(self, points_per_minute: int):
+        # allow bursts of 10s worth of points, the remaining points are refilled
+        # continuously so that no more than points_per_minute are consumed in any minute.
+        self._capacity = points_per_minute / 6
+        self._rate = (points_per_minute - self._capacity) / 60
+        self._tokens = self._capacity
+        self._last_refill = time.monotonic()
+
+    def reserve(self, cost: int, now: float) -> float:
+        self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+        self._tokens -= cost
+        return 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+
+
+class _PrimaryRateLimit:
+    def __init__(self) -> None:
+        self.limit = -1
+        self.remaining = -1
+        self.reset = 0.0
+        self.next_request = 0.0
+
+    def delay(self, now: float) -> float:
+        if self.remaining < 0 or self.reset <= now:
+            return 0.0
+
+        if self.remaining == 0:
+            return self.reset - now
+
+        if self.limit > 0 and self.remaining < self.limit * _PRIMARY_RESERVE_RATIO:
+            # spread the remaining requests evenly till the rate limit gets reset
+            interval = (self.reset - now) / self.remaining
+            scheduled = max(now, self.next_request)
+            self.next_request = scheduled + interval
+            return scheduled - now
+
+        return 0.0
+
+
+class RateLimiter:
+    """
+    Schedules requests to the GitHub API based on the primary and secondary rate limits.
+
+    A RateLimiter can be shared by multiple clients that use the same credentials, e.g.
+    a RestApi and a GraphQLClient. The number of concurrent requests is adjusted adaptively
+    (additive increase, multiplicative decrease) and requests are paced according to the cost
+    points GitHub assigns to them as well as the rate limit information received with each response.
+    """
+
+    def __init__(self, max_concurrency: int = _MAX_CONCURRENCY):
+        self._max_concurrency = max_concurrency
+        self._concurrency = min(_INITIAL_CONCURRENCY, max_concurrency)
+        self._active = 0
+        self._successes = 0
+        self._condition: asyncio.Condition | None = None
+
+        self._buckets = {resource: _TokenBucket(points) for resource, points in _POINTS_PER_MINUTE.items()}
+        self._primary: dict[str, _PrimaryRateLimit] = {}
+        self._paused_until = 0.0
+        self._consecutive_limits = 0
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    @property
+    def max_concurrency(self) -> int:
+        return self._max_concurrency
+
+    @staticmethod
+    def get_cost(resource: str, method: str, is_mutation: bool = False) -> int:
+        """
+        Returns the secondary rate limit points of a request.
+        """
+        if resource == "graphql":
+            return 5 if is_mutation else 1
+        else:
+            return 1 if method.upper() in ("GET", "HEAD", "OPTIONS") else 5
+
+    @contextlib.asynccontextmanager
+    async def limit(self, resource: str, cost: int) -> AsyncIterator[None]:
+        await self._wait_for_budget(resource, cost)
+        await self._acquire_slot()
+        try:
+            # a rate limit might have been hit while waiting for a free slot
+            await self._wait_for_pause()
+            yield
+        finally:
+            await self._release_slot()
+
+    def update(self, resource: str, status: int, headers: Mapping[str, str], body: str) -> bool:
+        """
+        Updates the rate limit information from a response.
+
+        Returns True if the request hit a rate limit and should be retried.
+        """
+        now = time.time()
+
+        remaining_header = headers.get("x-ratelimit-remaining")
+        if remaining_header is not None:
+            primary = self._primary.setdefault(headers.get("x-ratelimit-resource", resource), _PrimaryRateLimit())
+            primary.remaining = int(remaining_header)
+            primary.limit = int(headers.get("x-ratelimit-limit", primary.limit))
+            reset = headers.get("x-ratelimit-reset")
+            if reset is not None:
+                primary.reset = time.monotonic() + max(0, int(reset) - now)
+
+        if not self._is_rate_limited(status, headers, body):
+            self._consecutive_limits = 0
+            self._increase_concurrency()
+            return False
+
+        monotonic_now = time.monotonic()
+        # requests that were in flight when the limit was hit will likely hit it as well,
+        # only back off further for limits that are hit after the current pause.
+        if monotonic_now >= self._paused_until:
+            self._consecutive_limits += 1
+            self._concurrency = max(_MIN_CONCURRENCY, self._concurrency // 2)
+            self._successes = 0
+
+        retry_after = headers.get("retry-after")
+        if retry_after is not None:
+            wait_time = float(retry_after)
+        elif remaining_header == "0" and "x-ratelimit-reset" in headers:
+            wait_time = max(1.0, int(headers["x-ratelimit-reset"]) - now)
+        else:
+            wait_time = min(
+                _MAX_SECONDARY_RATE_LIMIT_BACKOFF,
+                _SECONDARY_RATE_LIMIT_BACKOFF * 2 ** (self._consecutive_limits - 1),
+            )
+
+        self._paused_until = max(self._paused_until, monotonic_now + wait_time)
+
+        print_debug(
+            f"hit rate limit for resource '{resource}', pausing requests for {wait_time}s, "
+            f"reducing concurrency to {self._concurrency}"
+        )
+        return True
+
+    @staticmethod
+    def _is_rate_limited(status: int, headers: Mapping[str, str], body: str) -> bool:
+        if status == 429:
+            return True
+
+        if status == 403:
+            return (
+                "retry-after" in headers or headers.get("x-ratelimit-remaining") == "0" or "rate limit" in body.lower()
+            )
+
+        return False
+
+    def _get_condition(self) -> asyncio.Condition:
+        # lazily create the condition to bind it to the running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def _wait_for_budget(self, resource: str, cost: int) -> None:
+        now = time.monotonic()
+
+        delay = self._buckets[resource].reserve(cost, now) if resource in self._buckets else 0.0
+
+        primary = self._primary.get(resource)
+        if primary is not None:
+            delay = max(delay, primary.delay(now))
+
+        if delay > 0:
+            print_trace(f"throttling request to resource '{resource}' for {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+        await self._wait_for_pause()
+
+    async def _wait_for_pause(self) -> None:
+        while (remaining := self._paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(remaining)
+
+    async def _acquire_slot(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._active < self._concurrency)
+            self._active += 1
+
+    async def _release_slot(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self._active -= 1
+            condition.notify_all()
+
+    def _increase_concurrency(self) -> None:
+        self._successes += 1
+        if self._successes >= self._concurrency and self._concurrency < self._max_concurrency:
+            self._concurrency += 1
+            self._successes = 0
+
+
+# rate limiters shared by all clients of the same account within an event loop
+_SHARED_RATE_LIMITERS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, RateLimiter]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_shared_rate_limiter(account_key: str) -> RateLimiter:
+    """
+    Returns a RateLimiter that is shared by all clients of the given account in the running
+    event loop, as GitHub enforces its rate limits per user / installation.
+
+    The key must identify the account rather than a token, e.g. the id of an installation,
+    as installation tokens are refreshed regularly.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return RateLimiter()
+
+    return _SHARED_RATE_LIMITERS.setdefault(loop, {}).setdefault(account_key, RateLimiter())
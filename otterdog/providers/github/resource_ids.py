@@ -0,0 +1,65 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+
+class ResourceIdIndex:
+    """
+    Maps the natural key of a resource, e.g. the url of a webhook or the name of a ruleset,
+    to its id, grouped by the collection containing the resource.
+
+    The index is filled with the resources that are retrieved while loading the live
+    configuration. Collections that have not been retrieved are listed once when an id
+    is resolved and the result is memoized. Collections have to be invalidated after
+    resources have been added to them, as the ids of new resources are not known.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[Hashable, dict[str, Any]] = {}
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+        # incremented whenever a collection is invalidated
+        self._generations: dict[Hashable, int] = {}
+
+    def add_all(self, collection: Hashable, ids: dict[str, Any]) -> None:
+        self._ids[collection] = ids
+
+    async def resolve(
+        self,
+        collection: Hashable,
+        key: str,
+        list_ids: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> Any | None:
+        ids = self._ids.get(collection)
+        if ids is None:
+            # concurrent lookups in the same collection share a single listing
+            async with self._locks.setdefault(collection, asyncio.Lock()):
+                ids = self._ids.get(collection)
+                if ids is None:
+                    generation = self._generations.get(collection, 0)
+                    ids = await list_ids()
+                    # a listing started before the collection has been invalidated might miss added resources
+                    if self._generations.get(collection, 0) == generation:
+                        self._ids[collection] = ids
+
+        return ids.get(key)
+
+    def discard(self, collection: Hashable, key: str) -> None:
+        ids = self._ids.get(collection)
+        if ids is not None:
+            ids.pop(key, None)
+
+    def invalidate(self, collection: Hashable) -> None:
+        self._ids.pop(collection, None)
+        self._generations[collection] = self._generations.get(collection, 0) + 1
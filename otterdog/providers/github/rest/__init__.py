@@ -14,11 +14,13 @@ from typing import TYPE_CHECKING
 
 from otterdog.providers.github.cache.file import file_cache
 
+from .prefetch import SubResourcePrefetcher, get_scoped_prefetcher
 from .requester import Requester
 
 if TYPE_CHECKING:
     from otterdog.providers.github.auth import AuthStrategy
     from otterdog.providers.github.cache import CacheStrategy
+    from otterdog.providers.github.rate_limit import RateLimiter
     from otterdog.providers.github.stats import RequestStatistics
 
 _DEFAULT_CACHE_STRATEGY = file_cache()
@@ -33,10 +35,17 @@ class RestApi:
         self,
         auth_strategy: AuthStrategy | None = None,
         cache_strategy: CacheStrategy = _DEFAULT_CACHE_STRATEGY,
+        rate_limiter: RateLimiter | None = None,
     ):
         self._auth_strategy = auth_strategy
         self._cache_strategy = cache_strategy
-        self._requester = Requester(auth_strategy, cache_strategy, self._GH_API_URL_ROOT, self._GH_API_VERSION)
+        self._requester = Requester(
+            auth_strategy,
+            cache_strategy,
+            self._GH_API_URL_ROOT,
+            self._GH_API_VERSION,
+            rate_limiter,
+        )
 
     async def __aenter__(self):
         return self
@@ -46,9 +55,9 @@ class RestApi:
 
     @property
     def token(self) -> str | None:
-        from otterdog.providers.github.auth.token import TokenAuthStrategy
+        from otterdog.providers.github.auth.token import RefreshableTokenAuthStrategy, TokenAuthStrategy
 
-        if isinstance(self._auth_strategy, TokenAuthStrategy):
+        if isinstance(self._auth_strategy, TokenAuthStrategy | RefreshableTokenAuthStrategy):
             return self._auth_strategy.token
         else:
             return None
@@ -64,6 +73,16 @@ class RestApi:
     def requester(self) -> Requester:
         return self._requester
 
+    @property
+    def prefetcher(self) -> SubResourcePrefetcher:
+        # a client might be shared, e.g. by tasks of the same installation, which use their own scope
+        scoped_prefetcher = get_scoped_prefetcher()
+        return scoped_prefetcher if scoped_prefetcher is not None else self._prefetcher
+
+    @cached_property
+    def _prefetcher(self) -> SubResourcePrefetcher:
+        return SubResourcePrefetcher()
+
     @cached_property
     def action(self):
         from .action_client import ActionClient
@@ -143,6 +162,10 @@ class RestClient:
     def requester(self) -> Requester:
         return self.__rest_api.requester
 
+    @property
+    def prefetcher(self) -> SubResourcePrefetcher:
+        return self.__rest_api.prefetcher
+
 
 def encrypt_value(public_key: str, secret_value: str) -> str:
     """
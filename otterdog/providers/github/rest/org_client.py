@@ -8,6 +8,7 @@
 
 import json
 import re
+from functools import partial
 from typing import Any
 
 from otterdog.providers.github.exception import GitHubException
@@ -126,6 +127,14 @@ class OrgClient(RestClient):
         except GitHubException as ex:
             raise RuntimeError(f"failed retrieving custom properties for org '{org_id}':\n{ex}") from ex
 
+    async def get_custom_property_values(self, org_id: str) -> list[dict[str, Any]]:
+        print_debug(f"retrieving custom property values for repos of org '{org_id}'")
+
+        try:
+            return await self.requester.request_paged_json("GET", f"/orgs/{org_id}/properties/values")
+        except GitHubException as ex:
+            raise RuntimeError(f"failed retrieving custom property values for org '{org_id}':\n{ex}") from ex
+
     async def add_custom_property(self, org_id: str, property_name: str, data: dict[str, Any]) -> None:
         print_debug(f"adding org custom property with name '{property_name}'")
 
@@ -154,16 +163,10 @@ class OrgClient(RestClient):
 
         print_debug(f"removed org custom property with name '{property_name}'")
 
-    async def get_webhook_id(self, org_id: str, url: str) -> str:
-        print_debug(f"retrieving id for org webhook with url '{url}' for org '{org_id}'")
-
-        webhooks = await self.get_webhooks(org_id)
-
-        for webhook in webhooks:
-            if webhook["config"]["url"] == url:
-                return webhook["id"]
+    async def get_webhook_ids(self, org_id: str) -> dict[str, int]:
+        print_debug(f"retrieving ids of org webhooks for org '{org_id}'")
 
-        raise RuntimeError(f"failed to find org webhook with url '{url}'")
+        return {webhook["config"]["url"]: webhook["id"] for webhook in await self.get_webhooks(org_id)}
 
     async def get_webhooks(self, org_id: str) -> list[dict[str, Any]]:
         print_debug(f"retrieving org webhooks for org '{org_id}'")
@@ -206,12 +209,14 @@ class OrgClient(RestClient):
         print_debug(f"removed org webhook with url '{url}'")
 
     async def get_repos(self, org_id: str) -> list[str]:
+        return [repo["name"] for repo in await self.get_repo_summaries(org_id)]
+
+    async def get_repo_summaries(self, org_id: str) -> list[dict[str, Any]]:
         print_debug(f"retrieving repos for organization {org_id}")
 
         params = {"type": "all"}
         try:
-            repos = await self.requester.request_paged_json("GET", f"/orgs/{org_id}/repos", params=params)
-            return [repo["name"] for repo in repos]
+            return await self.requester.request_paged_json("GET", f"/orgs/{org_id}/repos", params=params)
         except GitHubException as ex:
             raise RuntimeError(f"failed to retrieve repos for organization '{org_id}':\n{ex}") from ex
 
@@ -222,11 +227,16 @@ class OrgClient(RestClient):
             response = await self.requester.request_json("GET", f"/orgs/{org_id}/actions/secrets")
 
             secrets = response["secrets"]
-            for secret in secrets:
-                if secret["visibility"] == "selected":
-                    secret["selected_repositories"] = await self._get_selected_repositories_for_secret(
-                        org_id, secret["name"]
-                    )
+            selected_secrets = [x for x in secrets if x["visibility"] == "selected"]
+            selected_repositories = await self.prefetcher.fetch_all(
+                (
+                    _selected_repositories_key("secret", org_id, secret["name"]),
+                    partial(self._get_selected_repositories_for_secret, org_id, secret["name"]),
+                )
+                for secret in selected_secrets
+            )
+            for secret, repositories in zip(selected_secrets, selected_repositories, strict=True):
+                secret["selected_repositories"] = repositories
             return secrets
         except GitHubException as ex:
             raise RuntimeError(f"failed getting secrets for org '{org_id}':\n{ex}") from ex
@@ -250,6 +260,7 @@ class OrgClient(RestClient):
         status, _ = await self.requester.request_raw(
             "PUT", f"/orgs/{org_id}/actions/secrets/{secret_name}", json.dumps(data)
         )
+        self.prefetcher.invalidate(_selected_repositories_key("secret", org_id, secret_name))
 
         if status != 201:
             raise RuntimeError(f"failed to add org secret '{secret_name}'")
@@ -267,6 +278,7 @@ class OrgClient(RestClient):
         status, _ = await self.requester.request_raw(
             "PUT", f"/orgs/{org_id}/actions/secrets/{secret_name}", json.dumps(secret)
         )
+        self.prefetcher.invalidate(_selected_repositories_key("secret", org_id, secret_name))
 
         if status != 204:
             raise RuntimeError(f"failed to update org secret '{secret_name}'")
@@ -284,6 +296,7 @@ class OrgClient(RestClient):
         print_debug(f"deleting org secret '{secret_name}'")
 
         status, _ = await self.requester.request_raw("DELETE", f"/orgs/{org_id}/actions/secrets/{secret_name}")
+        self.prefetcher.invalidate(_selected_repositories_key("secret", org_id, secret_name))
         if status != 204:
             raise RuntimeError(f"failed to delete org secret '{secret_name}'")
 
@@ -296,11 +309,16 @@ class OrgClient(RestClient):
             response = await self.requester.request_json("GET", f"/orgs/{org_id}/actions/variables")
 
             secrets = response["variables"]
-            for secret in secrets:
-                if secret["visibility"] == "selected":
-                    secret["selected_repositories"] = await self._get_selected_repositories_for_variable(
-                        org_id, secret["name"]
-                    )
+            selected_secrets = [x for x in secrets if x["visibility"] == "selected"]
+            selected_repositories = await self.prefetcher.fetch_all(
+                (
+                    _selected_repositories_key("variable", org_id, secret["name"]),
+                    partial(self._get_selected_repositories_for_variable, org_id, secret["name"]),
+                )
+                for secret in selected_secrets
+            )
+            for secret, repositories in zip(selected_secrets, selected_repositories, strict=True):
+                secret["selected_repositories"] = repositories
             return secrets
         except GitHubException as ex:
             raise RuntimeError(f"failed getting variables for org '{org_id}':\n{ex}") from ex
@@ -325,6 +343,7 @@ class OrgClient(RestClient):
 
             url = f"/orgs/{org_id}/actions/variables/{variable_name}/repositories"
             status, _ = await self.requester.request_raw("PUT", url, json.dumps(data))
+            self.prefetcher.invalidate(_selected_repositories_key("variable", org_id, variable_name))
             if status != 204:
                 raise RuntimeError(f"failed to update selected repositories for variable '{variable_name}'")
 
@@ -372,6 +391,7 @@ class OrgClient(RestClient):
         print_debug(f"deleting org variable '{variable_name}'")
 
         status, body = await self.requester.request_raw("DELETE", f"/orgs/{org_id}/actions/variables/{variable_name}")
+        self.prefetcher.invalidate(_selected_repositories_key("variable", org_id, variable_name))
 
         if status != 204:
             raise RuntimeError(f"failed to delete org variable '{variable_name}': {body}")
@@ -572,3 +592,7 @@ class OrgClient(RestClient):
             return await self.requester.request_paged_json("GET", f"/orgs/{org_id}/members", params=params)
         except GitHubException as ex:
             raise RuntimeError(f"failed retrieving members:\n{ex}") from ex
+
+
+def _selected_repositories_key(resource_type: str, org_id: str, name: str) -> tuple[str, ...]:
+    return "selected-repositories", resource_type, org_id, name
@@ -0,0 +1,77 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable, Iterable, Iterator
+
+T = TypeVar("T")
+
+
+class SubResourcePrefetcher:
+    """
+    Retrieves sub-resources of a resource, e.g. the details of each ruleset of a repository,
+    concurrently instead of one after another and memoizes the results.
+
+    The requests are still scheduled by the rate limiter of the requester. Results are memoized
+    until they are invalidated, e.g. because the sub-resource has been updated, or the prefetcher
+    is cleared. Failed requests are not memoized.
+    """
+
+    def __init__(self) -> None:
+        self._results: dict[Hashable, asyncio.Future[Any]] = {}
+
+    async def fetch(self, key: Hashable, fetch_fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._results.get(key)
+        if future is None or future.get_loop() is not asyncio.get_running_loop():
+            future = asyncio.ensure_future(fetch_fn())
+            future.add_done_callback(lambda x: self._discard_if_failed(key, x))
+            self._results[key] = future
+
+        # callers that are cancelled must not cancel the retrieval for other callers
+        return await asyncio.shield(future)
+
+    async def fetch_all(self, requests: Iterable[tuple[Hashable, Callable[[], Awaitable[T]]]]) -> list[T]:
+        return list(await asyncio.gather(*[self.fetch(key, fetch_fn) for key, fetch_fn in requests]))
+
+    def invalidate(self, key: Hashable) -> None:
+        self._results.pop(key, None)
+
+    def clear(self) -> None:
+        self._results.clear()
+
+    def _discard_if_failed(self, key: Hashable, future: asyncio.Future[Any]) -> None:
+        if (future.cancelled() or future.exception() is not None) and self._results.get(key) is future:
+            del self._results[key]
+
+
+_SCOPED_PREFETCHER: ContextVar[SubResourcePrefetcher | None] = ContextVar("scoped_prefetcher", default=None)
+
+
+def get_scoped_prefetcher() -> SubResourcePrefetcher | None:
+    return _SCOPED_PREFETCHER.get()
+
+
+@contextlib.contextmanager
+def prefetch_scope() -> Iterator[SubResourcePrefetcher]:
+    """
+    Memoizes sub-resources retrieved within the current context separately from other contexts,
+    e.g. for tasks that share the same client.
+    """
+    prefetcher = SubResourcePrefetcher()
+    token = _SCOPED_PREFETCHER.set(prefetcher)
+    try:
+        yield prefetcher
+    finally:
+        _SCOPED_PREFETCHER.reset(token)
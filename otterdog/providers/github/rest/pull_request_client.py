@@ -6,6 +6,8 @@
 #  SPDX-License-Identifier: EPL-2.0
 #  *******************************************************************************
 
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from typing import Any
 
 from otterdog.providers.github.exception import GitHubException
@@ -48,6 +50,11 @@ class PullRequestClient(RestClient):
     async def get_pull_requests(
         self, org_id: str, repo_name: str, state: str = "all", base_ref: str | None = None
     ) -> list[dict[str, Any]]:
+        return [pr async for pr in self.iter_pull_requests(org_id, repo_name, state, base_ref)]
+
+    async def iter_pull_requests(
+        self, org_id: str, repo_name: str, state: str = "all", base_ref: str | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
         print_debug(f"getting pull requests from repo '{org_id}/{repo_name}'")
 
         try:
@@ -56,7 +63,12 @@ class PullRequestClient(RestClient):
             if base_ref is not None:
                 params.update({"base": base_ref})
 
-            return await self.requester.request_paged_json("GET", f"/repos/{org_id}/{repo_name}/pulls", params=params)
+            # close the pages explicitly to cancel pending requests as soon as the iteration is stopped
+            async with aclosing(
+                self.requester.iter_paged_json("GET", f"/repos/{org_id}/{repo_name}/pulls", params=params)
+            ) as pull_requests:
+                async for pr in pull_requests:
+                    yield pr
         except GitHubException as ex:
             raise RuntimeError(f"failed retrieving pull requests:\n{ex}") from ex
 
@@ -6,17 +6,20 @@
 #  SPDX-License-Identifier: EPL-2.0
 #  *******************************************************************************
 
+import asyncio
 import json
 import os
 import pathlib
 import re
 import tempfile
 import zipfile
+from functools import partial
 from typing import Any
 
 import aiofiles
 import chevron
 
+from otterdog.providers.github import MAX_REPO_CONCURRENCY
 from otterdog.providers.github.exception import GitHubException
 from otterdog.providers.github.rest import RestApi, RestClient, encrypt_value
 from otterdog.utils import (
@@ -27,6 +30,40 @@ from otterdog.utils import (
     query_json,
 )
 
+# keys of the repo data that are required to skip retrieving the repo itself when data has been prefetched
+_SIMPLE_REPO_DATA_KEYS = frozenset(
+    {
+        "id",
+        "node_id",
+        "name",
+        "description",
+        "homepage",
+        "private",
+        "archived",
+        "is_template",
+        "template_repository",
+        "default_branch",
+        "has_issues",
+        "has_projects",
+        "has_wiki",
+        "has_discussions",
+        "has_pages",
+        "allow_forking",
+        "allow_merge_commit",
+        "allow_rebase_merge",
+        "allow_squash_merge",
+        "allow_auto_merge",
+        "allow_update_branch",
+        "delete_branch_on_merge",
+        "web_commit_signoff_required",
+        "squash_merge_commit_title",
+        "squash_merge_commit_message",
+        "merge_commit_title",
+        "merge_commit_message",
+        "security_and_analysis",
+    }
+)
+
 
 class RepoClient(RestClient):
     def __init__(self, rest_api: RestApi):
@@ -46,24 +83,56 @@ class RepoClient(RestClient):
         repo_data = await self.get_simple_repo_data(org_id, repo_name)
         return repo_data["default_branch"]
 
-    async def get_repo_data(self, org_id: str, repo_name: str) -> dict[str, Any]:
+    async def get_repo_data(
+        self,
+        org_id: str,
+        repo_name: str,
+        prefetched_data: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
         print_debug(f"retrieving repo data for '{org_id}/{repo_name}'")
 
         try:
-            repo_data = await self.get_simple_repo_data(org_id, repo_name)
+            if prefetched_data is not None and _SIMPLE_REPO_DATA_KEYS.issubset(prefetched_data):
+                repo_data = dict(prefetched_data)
+            else:
+                repo_data = await self.get_simple_repo_data(org_id, repo_name)
+                if prefetched_data is not None:
+                    repo_data.update(prefetched_data)
+
+            fill_methods = []
 
             archived = repo_data.get("archived", False)
             if not archived:
-                await self._fill_vulnerability_alerts(org_id, repo_name, repo_data)
+                fill_methods.append(("dependabot_alerts_enabled", self._fill_vulnerability_alerts))
 
                 private = repo_data.get("private", False)
                 if not private:
-                    await self._fill_private_vulnerability_reporting(org_id, repo_name, repo_data)
+                    fill_methods.append(
+                        ("private_vulnerability_reporting_enabled", self._fill_private_vulnerability_reporting)
+                    )
+
+            # repos without a github pages site have no config
+            if repo_data.get("has_pages", True):
+                fill_methods.append(("gh_pages", self._fill_github_pages_config))
 
-            await self._fill_github_pages_config(org_id, repo_name, repo_data)
-            await self._fill_topics(org_id, repo_name, repo_data)
-            await self._fill_code_scanning_config(org_id, repo_name, repo_data)
-            await self._fill_custom_properties(org_id, repo_name, repo_data)
+            fill_methods.extend(
+                [
+                    ("topics", self._fill_topics),
+                    ("code_scanning_default_config", self._fill_code_scanning_config),
+                    ("custom_properties", self._fill_custom_properties),
+                ]
+            )
+
+            # each method fills distinct keys of the repo data, so they can safely run concurrently
+            sem = asyncio.Semaphore(MAX_REPO_CONCURRENCY)
+
+            async def fill(method) -> None:
+                async with sem:
+                    await method(org_id, repo_name, repo_data)
+
+            await asyncio.gather(
+                *[fill(method) for key, method in fill_methods if prefetched_data is None or key not in prefetched_data]
+            )
 
             return repo_data
         except GitHubException as ex:
@@ -200,9 +269,7 @@ class RepoClient(RestClient):
                             break
                         except RuntimeError:
                             print_trace(f"waiting for repo '{org_id}/{repo_name}' to be initialized, " f"try {i} of 10")
-                            import time
-
-                            time.sleep(1)
+                            await asyncio.sleep(1)
 
                     if initialized is False:
                         raise RuntimeError(
@@ -263,16 +330,10 @@ class RepoClient(RestClient):
         except GitHubException as ex:
             raise RuntimeError(f"failed to add repo with name '{org_id}/{repo_name}':\n{ex}") from ex
 
-    async def get_webhook_id(self, org_id: str, repo_name: str, url: str) -> str:
-        print_debug(f"retrieving id for repo webhook with url '{url}' for repo '{org_id}/{repo_name}'")
-
-        webhooks = await self.get_webhooks(org_id, repo_name)
+    async def get_webhook_ids(self, org_id: str, repo_name: str) -> dict[str, int]:
+        print_debug(f"retrieving ids of webhooks for repo '{org_id}/{repo_name}'")
 
-        for webhook in webhooks:
-            if webhook["config"]["url"] == url:
-                return webhook["id"]
-
-        raise RuntimeError(f"failed to find repo webhook with url '{url}'")
+        return {webhook["config"]["url"]: webhook["id"] for webhook in await self.get_webhooks(org_id, repo_name)}
 
     async def get_webhooks(self, org_id: str, repo_name: str) -> list[dict[str, Any]]:
         print_debug(f"retrieving webhooks for repo '{org_id}/{repo_name}'")
@@ -314,29 +375,34 @@ class RepoClient(RestClient):
 
         print_debug(f"removed repo webhook with url '{url}'")
 
-    async def get_ruleset_id(self, org_id: str, repo_name: str, name: str) -> str:
-        print_debug(f"retrieving id for repo ruleset with name '{name}' for repo '{org_id}/{repo_name}'")
-
-        rulesets = await self.get_rulesets(org_id, repo_name)
+    async def get_ruleset_ids(self, org_id: str, repo_name: str) -> dict[str, int]:
+        print_debug(f"retrieving ids of rulesets for repo '{org_id}/{repo_name}'")
 
-        for ruleset in rulesets:
-            if ruleset["name"] == name:
-                return ruleset["id"]
-
-        raise RuntimeError(f"failed to find repo ruleset with name '{name}'")
+        try:
+            params = {"includes_parents": str(False)}
+            # the listing already contains the name of each ruleset, no need to retrieve the rulesets itself
+            response = await self.requester.request_paged_json(
+                "GET", f"/repos/{org_id}/{repo_name}/rulesets", params=params
+            )
+            return {ruleset["name"]: ruleset["id"] for ruleset in response}
+        except GitHubException as ex:
+            raise RuntimeError(f"failed retrieving rulesets for repo '{org_id}/{repo_name}':\n{ex}") from ex
 
     async def get_rulesets(self, org_id: str, repo_name: str) -> list[dict[str, Any]]:
         print_debug(f"retrieving rulesets for repo '{org_id}/{repo_name}'")
 
         try:
-            result = []
             params = {"includes_parents": str(False)}
             response = await self.requester.request_paged_json(
                 "GET", f"/repos/{org_id}/{repo_name}/rulesets", params=params
             )
-            for ruleset in response:
-                result.append(await self.get_ruleset(org_id, repo_name, str(ruleset["id"])))
-            return result
+            return await self.prefetcher.fetch_all(
+                (
+                    _ruleset_key(org_id, repo_name, ruleset["id"]),
+                    partial(self.get_ruleset, org_id, repo_name, str(ruleset["id"])),
+                )
+                for ruleset in response
+            )
         except GitHubException as ex:
             raise RuntimeError(f"failed retrieving rulesets for repo '{org_id}/{repo_name}':\n{ex}") from ex
 
@@ -359,6 +425,8 @@ class RepoClient(RestClient):
             print_debug(f"updated repo ruleset '{ruleset_id}'")
         except GitHubException as ex:
             raise RuntimeError(f"failed to update repo ruleset {ruleset_id}:\n{ex}") from ex
+        finally:
+            self.prefetcher.invalidate(_ruleset_key(org_id, repo_name, ruleset_id))
 
     async def add_ruleset(self, org_id: str, repo_name: str, data: dict[str, Any]) -> None:
         name = data["name"]
@@ -374,6 +442,7 @@ class RepoClient(RestClient):
         print_debug(f"deleting repo ruleset with name '{name}' for repo '{org_id}/{repo_name}'")
 
         status, _ = await self.requester.request_raw("DELETE", f"/repos/{org_id}/{repo_name}/rulesets/{ruleset_id}")
+        self.prefetcher.invalidate(_ruleset_key(org_id, repo_name, ruleset_id))
 
         if status != 204:
             raise RuntimeError(f"failed to delete repo ruleset with name '{name}'")
@@ -434,9 +503,7 @@ class RepoClient(RestClient):
                     break
 
                 print_trace(f"waiting for repo '{org_id}/{repo_name}' to be initialized, " f"try {i} of 3")
-                import time
-
-                time.sleep(1)
+                await asyncio.sleep(1)
 
             current_gh_pages: Any = current_repo_data.get("gh_pages")
             if current_gh_pages is not None:
@@ -637,12 +704,20 @@ class RepoClient(RestClient):
             response = await self.requester.request_json("GET", f"/repos/{org_id}/{repo_name}/environments")
 
             environments = response["environments"]
-            for env in environments:
-                env_name = env["name"]
-                has_branch_policies = bool(query_json("deployment_branch_policy.custom_branch_policies", env) or False)
-
-                if has_branch_policies:
-                    env["branch_policies"] = await self._get_deployment_branch_policies(org_id, repo_name, env_name)
+            environments_with_branch_policies = [
+                env
+                for env in environments
+                if bool(query_json("deployment_branch_policy.custom_branch_policies", env) or False)
+            ]
+            branch_policies = await self.prefetcher.fetch_all(
+                (
+                    _deployment_branch_policies_key(org_id, repo_name, env["name"]),
+                    partial(self._get_deployment_branch_policies, org_id, repo_name, env["name"]),
+                )
+                for env in environments_with_branch_policies
+            )
+            for env, env_branch_policies in zip(environments_with_branch_policies, branch_policies, strict=True):
+                env["branch_policies"] = env_branch_policies
             return environments
         except GitHubException:
             # querying the environments might fail for private repos, ignore exceptions
@@ -665,6 +740,8 @@ class RepoClient(RestClient):
             print_debug(f"updated repo environment '{env_name}'")
         except GitHubException as ex:
             raise RuntimeError(f"failed to update repo environment '{env_name}':\n{ex}") from ex
+        finally:
+            self.prefetcher.invalidate(_deployment_branch_policies_key(org_id, repo_name, env_name))
 
     async def add_environment(self, org_id: str, repo_name: str, env_name: str, data: dict[str, Any]) -> None:
         print_debug(f"adding environment '{env_name}' for repo '{org_id}/{repo_name}'")
@@ -675,6 +752,7 @@ class RepoClient(RestClient):
         print_debug(f"deleting repo environment '{env_name} for repo '{org_id}/{repo_name}'")
 
         status, _ = await self.requester.request_raw("DELETE", f"/repos/{org_id}/{repo_name}/environments/{env_name}")
+        self.prefetcher.invalidate(_deployment_branch_policies_key(org_id, repo_name, env_name))
 
         if status != 204:
             raise RuntimeError(f"failed to delete repo environment '{env_name}'")
@@ -1070,3 +1148,11 @@ class RepoClient(RestClient):
             raise RuntimeError(
                 f"failed retrieving repository archive from " f"repo '{org_id}/{repo_name}':\n{ex}"
             ) from ex
+
+
+def _ruleset_key(org_id: str, repo_name: str, ruleset_id: int | str) -> tuple[str, ...]:
+    return "ruleset", org_id, repo_name, str(ruleset_id)
+
+
+def _deployment_branch_policies_key(org_id: str, repo_name: str, env_name: str) -> tuple[str, ...]:
+    return "deployment-branch-policies", org_id, repo_name, env_name
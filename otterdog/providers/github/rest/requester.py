@@ -6,28 +6,51 @@
 #  SPDX-License-Identifier: EPL-2.0
 #  *******************************************************************************
 
+import asyncio
 import json
-from collections.abc import AsyncIterable
+import re
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Mapping
+from datetime import datetime, timezone
 from typing import Any
+from urllib.parse import parse_qsl, urlparse
 
 from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from aiohttp_client_cache.backends import CacheBackend
+from aiohttp_client_cache.response import CachedResponse
 from aiohttp_client_cache.session import CachedSession as AsyncCachedSession
 from aiohttp_retry import ExponentialRetry, RetryClient
 
 from otterdog.providers.github.auth import AuthStrategy
 from otterdog.providers.github.cache import CacheStrategy
 from otterdog.providers.github.exception import BadCredentialsException, GitHubException
+from otterdog.providers.github.rate_limit import RateLimiter
 from otterdog.providers.github.stats import RequestStatistics
 from otterdog.utils import is_trace_enabled, print_trace
 
+# number of pages of a paged resource that are requested concurrently
+_PREFETCH_PAGES = 4
+
+_LINK_PATTERN = re.compile(r'<([^>]*)>\s*;\s*rel="([^"]*)"')
+
+# key of the time of the last modification made via the api, stored along with the redirects of the cache
+_LAST_MODIFIED_KEY = "otterdog:last-modified"
+
+# non-GET requests that do not modify any resource, e.g. creating installation access tokens
+_NON_MODIFYING_PATHS = re.compile(r"^/app/installations/[^/]+/access_tokens$")
+
 
 class Requester:
+    # number of retries for requests that hit a rate limit
+    _RATE_LIMIT_RETRIES = 3
+
     def __init__(
         self,
         auth_strategy: AuthStrategy | None,
         cache_strategy: CacheStrategy,
         base_url: str,
         api_version: str,
+        rate_limiter: RateLimiter | None = None,
     ):
         self._auth = auth_strategy.get_auth() if auth_strategy is not None else None
 
@@ -39,6 +62,7 @@ class Requester:
 
         self._statistics = RequestStatistics()
         self._cache_strategy = cache_strategy
+        self._rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
 
         if self._cache_strategy.is_external():
             self._base_url = f"http://{base_url}"
@@ -49,7 +73,7 @@ class Requester:
                 cache=self._cache_strategy.get_cache_backend(),
                 timeout=ClientTimeout(connect=3, sock_connect=3),
                 connector=TCPConnector(
-                    limit=30,
+                    limit=self._rate_limiter.max_concurrency,
                 ),
             )
 
@@ -62,6 +86,10 @@ class Requester:
     def statistics(self) -> RequestStatistics:
         return self._statistics
 
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self._rate_limiter
+
     async def close(self) -> None:
         await self._session.close()
 
@@ -75,24 +103,76 @@ class Requester:
         data: dict[str, Any] | None = None,
         params: dict[str, str] | None = None,
     ) -> list[dict[str, Any]]:
-        result = []
-        current_page = 1
-        while current_page > 0:
-            query_params = {"per_page": "100", "page": current_page}
-            if params is not None:
-                query_params.update(params)
-
-            response: list[dict[str, Any]] = await self.request_json(method, url_path, data, query_params)
-
-            if len(response) == 0:
-                current_page = -1
-            else:
+        return [item async for item in self.iter_paged_json(method, url_path, data, params)]
+
+    async def iter_paged_json(
+        self,
+        method: str,
+        url_path: str,
+        data: dict[str, Any] | None = None,
+        params: dict[str, str] | None = None,
+        prefetch_pages: int = _PREFETCH_PAGES,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Iterates over the items of a paged resource, the next page is determined by the 'Link' header
+        of the current page.
+
+        Once the number of pages is known, up to prefetch_pages pages are requested concurrently.
+        Stopping the iteration early cancels requests for pages that are not needed anymore.
+        """
+        query_params: dict[str, Any] = {"per_page": "100", "page": "1"}
+        if params is not None:
+            query_params.update(params)
+
+        response, links = await self._request_page(method, url_path, data, query_params)
+        for item in response:
+            yield item
+
+        last_page = _get_page_number(links.get("last"))
+        next_page = _get_page_number(links.get("next"))
+
+        if last_page is not None and next_page is not None and prefetch_pages > 1:
+            pending: deque[asyncio.Future[tuple[list[dict[str, Any]], dict[str, str]]]] = deque()
+            try:
+                while next_page <= last_page or len(pending) > 0:
+                    while next_page <= last_page and len(pending) < prefetch_pages:
+                        page_params = {**query_params, "page": str(next_page)}
+                        pending.append(asyncio.ensure_future(self._request_page(method, url_path, data, page_params)))
+                        next_page += 1
+
+                    response, _ = await pending.popleft()
+                    for item in response:
+                        yield item
+            finally:
+                for future in pending:
+                    future.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+        else:
+            while True:
+                if "next" in links:
+                    query_params = _get_query_params(links["next"])
+                elif len(links) == 0 and len(response) >= int(query_params.get("per_page", 0)) > 0:
+                    # the 'Link' header might be dropped by a proxy, continue until an empty page is returned
+                    query_params = {**query_params, "page": str(int(query_params.get("page", 1)) + 1)}
+                else:
+                    break
+
+                response, links = await self._request_page(method, url_path, data, query_params)
                 for item in response:
-                    result.append(item)
+                    yield item
 
-                current_page += 1
+    async def _request_page(
+        self,
+        method: str,
+        url_path: str,
+        data: dict[str, Any] | None,
+        params: dict[str, Any],
+    ) -> tuple[list[dict[str, Any]], dict[str, str]]:
+        input_data = json.dumps(data) if data is not None else None
 
-        return result
+        status, body, headers = await self._request(method, url_path, input_data, params)
+        self._check_response(url_path, status, body)
+        return json.loads(body), _parse_link_header(headers.get("Link"))
 
     async def request_json(
         self,
@@ -116,6 +196,16 @@ class Requester:
         data: str | None = None,
         params: dict[str, Any] | None = None,
     ) -> tuple[int, str]:
+        status, text, _ = await self._request(method, url_path, data, params)
+        return status, text
+
+    async def _request(
+        self,
+        method: str,
+        url_path: str,
+        data: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> tuple[int, str, Mapping[str, str]]:
         print_trace(f"'{method}' url = {url_path}, data = {data}, params = {params}, headers = {self._headers}")
 
         headers = self._headers.copy()
@@ -123,32 +213,66 @@ class Requester:
             self._auth.update_headers_with_authorization(headers)
 
         url = self._build_url(url_path)
-        async with self._client.request(
-            method,
-            url=url,
-            headers=headers,
-            params=params,
-            data=data,
-            **self._cache_strategy.get_request_parameters(),
-        ) as response:
+
+        # serve responses that have been validated recently without contacting the server
+        if (cached_response := await self._get_fresh_cached_response(method, url, data, params)) is not None:
             self._statistics.sent_request()
+            self._statistics.received_cached_response()
+
+            text = await cached_response.text()
+            if is_trace_enabled():
+                print_trace(f"'{method}' result = ({cached_response.status}, {text}) [fresh from cache]")
+
+            return cached_response.status, text, cached_response.headers
 
-            text = await response.text()
-            status = response.status
+        cost = RateLimiter.get_cost("core", method)
 
-            if (
-                hasattr(response, "from_cache")
-                and response.from_cache
-                or response.headers.get("X-From-Cache", 0) == "1"
+        for attempt in range(self._RATE_LIMIT_RETRIES + 1):
+            async with (
+                self._rate_limiter.limit("core", cost),
+                self._client.request(
+                    method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    data=data,
+                    **self._cache_strategy.get_request_parameters(),
+                ) as response,
             ):
-                self._statistics.received_cached_response()
-            else:
-                self._statistics.update_remaining_rate_limit(int(response.headers.get("x-ratelimit-remaining", -1)))
+                self._statistics.sent_request()
 
-            if is_trace_enabled():
-                print_trace(f"'{method}' result = ({status}, {text})")
+                text = await response.text()
+                status = response.status
+                response_headers = response.headers
+
+                if (
+                    hasattr(response, "from_cache")
+                    and response.from_cache
+                    or response.headers.get("X-From-Cache", 0) == "1"
+                ):
+                    # a cached response is returned if the server replied with a 304 (Not Modified)
+                    # to the conditional request, which does not count towards the primary rate limit.
+                    self._statistics.received_cached_response()
+                    rate_limited = False
+
+                    if isinstance(response, CachedResponse):
+                        await self._mark_as_validated(method, url, data, params, response)
+                else:
+                    self._statistics.update_remaining_rate_limit(int(response.headers.get("x-ratelimit-remaining", -1)))
+                    rate_limited = self._rate_limiter.update("core", status, response.headers, text)
+
+                if is_trace_enabled():
+                    print_trace(f"'{method}' result = ({status}, {text})")
+
+            if not rate_limited or attempt == self._RATE_LIMIT_RETRIES:
+                break
 
-            return status, text
+            print_trace(f"'{method}' url = {url_path} hit rate limit, retrying")
+
+        if status < 400:
+            await self._mark_as_modified(method, url_path)
+
+        return status, text, response_headers
 
     async def request_stream(
         self,
@@ -164,17 +288,81 @@ class Requester:
             self._auth.update_headers_with_authorization(headers)
 
         url = self._build_url(url_path)
-        async with self._client.request(
-            method,
-            url=url,
-            headers=headers,
-            params=params,
-            data=data,
-            **self._cache_strategy.get_request_parameters(),
-        ) as response:
+        async with (
+            self._rate_limiter.limit("core", RateLimiter.get_cost("core", method)),
+            self._client.request(
+                method,
+                url=url,
+                headers=headers,
+                params=params,
+                data=data,
+                **self._cache_strategy.get_request_parameters(),
+            ) as response,
+        ):
             async for chunk, _ in response.content.iter_chunks():
                 yield chunk
 
+    def _get_cache(self) -> CacheBackend:
+        assert isinstance(self._session, AsyncCachedSession)
+        return self._session.cache
+
+    def _get_max_stale(self, method: str) -> int:
+        if method.upper() != "GET" or self._cache_strategy.is_external():
+            return 0
+        else:
+            return self._cache_strategy.get_max_stale()
+
+    async def _get_fresh_cached_response(
+        self,
+        method: str,
+        url: str,
+        data: str | None,
+        params: dict[str, Any] | None,
+    ) -> CachedResponse | None:
+        max_stale = self._get_max_stale(method)
+        if max_stale <= 0:
+            return None
+
+        cache = self._get_cache()
+        response = await cache.get_response(cache.create_key(method, url, params=params, data=data))
+        if response is None or response.status >= 400:
+            return None
+
+        age = (_utcnow() - response.created_at).total_seconds()
+        if age >= max_stale:
+            return None
+
+        # responses retrieved before the last modification might be outdated, e.g. when planning after an apply
+        last_modified = await cache.redirects.read(_LAST_MODIFIED_KEY)
+        if isinstance(last_modified, str) and response.created_at <= datetime.fromisoformat(last_modified):
+            return None
+
+        return response
+
+    async def _mark_as_modified(self, method: str, url_path: str) -> None:
+        # the modified resources are not known in general, stop serving any cached response without revalidating it.
+        # the time is stored in the cache as it might be shared by several processes.
+        if method.upper() == "GET" or _NON_MODIFYING_PATHS.match(url_path) or self._get_max_stale("GET") <= 0:
+            return
+
+        await self._get_cache().redirects.write(_LAST_MODIFIED_KEY, _utcnow().isoformat())
+
+    async def _mark_as_validated(
+        self,
+        method: str,
+        url: str,
+        data: str | None,
+        params: dict[str, Any] | None,
+        response: CachedResponse,
+    ) -> None:
+        # restart the max-stale window of a cached response after it has been revalidated
+        if self._get_max_stale(method) <= 0:
+            return
+
+        cache = self._get_cache()
+        response.created_at = _utcnow()
+        await cache.responses.write(cache.create_key(method, url, params=params, data=data), response)
+
     def _check_response(self, url_path: str, status_code: int, body: str) -> None:
         if status_code >= 400:
             self._create_exception(self._build_url(url_path), status_code, body)
@@ -185,3 +373,30 @@ class Requester:
             raise BadCredentialsException(url, status_code, body)
         else:
             raise GitHubException(url, status_code, body)
+
+
+def _utcnow() -> datetime:
+    # the cache stores timestamps as timezone-naive datetimes in UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _parse_link_header(value: str | None) -> dict[str, str]:
+    # e.g. '<https://api.github.com/...?page=2>; rel="next", <https://api.github.com/...?page=5>; rel="last"'
+    if not value:
+        return {}
+
+    return {rel: url for url, rel in _LINK_PATTERN.findall(value)}
+
+
+def _get_query_params(url: str) -> dict[str, str]:
+    # the path of links might differ from the requested path, e.g. use the id of a repo instead of its name,
+    # only take the query parameters into account
+    return dict(parse_qsl(urlparse(url).query))
+
+
+def _get_page_number(url: str | None) -> int | None:
+    if url is None:
+        return None
+
+    page = _get_query_params(url).get("page")
+    return int(page) if page is not None and page.isdigit() else None
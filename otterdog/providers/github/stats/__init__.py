@@ -28,6 +28,16 @@ class RequestStatistics:
         else:
             self.remaining_rate_limit = min(self.remaining_rate_limit, other.remaining_rate_limit)
 
+    def since(self, start: RequestStatistics) -> RequestStatistics:
+        """
+        Returns the statistics of the requests that have been sent since the given snapshot has been taken.
+        """
+        return RequestStatistics(
+            self.total_requests - start.total_requests,
+            self.cached_responses - start.cached_responses,
+            self.remaining_rate_limit,
+        )
+
     def sent_request(self) -> None:
         self.total_requests += 1
 
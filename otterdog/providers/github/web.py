@@ -8,7 +8,14 @@
 
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import hashlib
+import json
+import os
 import re
+import time
+import weakref
 from asyncio import gather
 from contextlib import asynccontextmanager
 from functools import cached_property
@@ -20,11 +27,164 @@ from playwright.async_api import Page, async_playwright
 from otterdog.utils import is_debug_enabled, print_debug, print_trace, print_warn
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import AsyncIterator, Iterator
     from typing import Any
 
+    from playwright.async_api import Browser, BrowserContext, Playwright, StorageState
+
     from otterdog.credentials import Credentials
 
+_WEB_SESSION_DIR = ".cache/web-sessions"
+
+# the number of seconds after which a stored web session is not used anymore and a new login is performed
+_WEB_SESSION_MAX_AGE = 12 * 60 * 60
+
+# the number of seconds after which a stored web session is checked to be still logged in before using it
+_WEB_SESSION_VERIFICATION_INTERVAL = 10 * 60
+
+
+@dataclasses.dataclass
+class _WebSession:
+    storage_state: StorageState
+    created_at: float
+    verified_at: float
+
+    def is_expired(self, now: float) -> bool:
+        return now - self.created_at > _WEB_SESSION_MAX_AGE
+
+    def needs_verification(self, now: float) -> bool:
+        return now - self.verified_at > _WEB_SESSION_VERIFICATION_INTERVAL
+
+
+class _WebSessionStore:
+    """
+    Stores the authenticated state of web sessions per account, so that a login
+    is only needed once for all organizations and operations until the session expires.
+    """
+
+    def __init__(self, session_dir: str = _WEB_SESSION_DIR):
+        self._session_dir = session_dir
+        self._sessions: dict[str, _WebSession] = {}
+
+    def get(self, username: str, now: float) -> _WebSession | None:
+        key = self._get_key(username)
+
+        session = self._sessions.get(key)
+        if session is None:
+            session = self._load(key)
+
+        if session is None or session.is_expired(now):
+            self._sessions.pop(key, None)
+            return None
+
+        self._sessions[key] = session
+        return session
+
+    def put(self, username: str, session: _WebSession) -> None:
+        key = self._get_key(username)
+        self._sessions[key] = session
+
+        try:
+            os.makedirs(self._session_dir, exist_ok=True)
+            # the session grants access to the account, make it only readable by the current user
+            fd = os.open(self._get_file(key), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as file:
+                json.dump(dataclasses.asdict(session), file)
+        except OSError as ex:
+            print_debug(f"failed to store web session: {ex!s}")
+
+    def _load(self, key: str) -> _WebSession | None:
+        try:
+            with open(self._get_file(key)) as file:
+                return _WebSession(**json.load(file))
+        except FileNotFoundError:
+            return None
+        except (OSError, TypeError, ValueError) as ex:
+            print_debug(f"failed to load stored web session: {ex!s}")
+            return None
+
+    def _get_file(self, key: str) -> str:
+        return os.path.join(self._session_dir, f"{key}.json")
+
+    @staticmethod
+    def _get_key(username: str) -> str:
+        return hashlib.sha256(username.encode("utf-8")).hexdigest()
+
+
+class _BrowserPool:
+    """
+    A headless browser that is shared by all web clients running in the same event loop.
+    """
+
+    def __init__(self) -> None:
+        self._playwright_manager: Any = None
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._lock = asyncio.Lock()
+        self._login_locks: dict[str, asyncio.Lock] = {}
+
+    async def get_browser(self) -> Browser:
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright_manager = async_playwright()
+                    self._playwright = await self._playwright_manager.start()
+
+                print_debug("launching browser")
+                self._browser = await _launch_browser(self._playwright, headless=True)
+
+            return self._browser
+
+    def get_login_lock(self, username: str) -> asyncio.Lock:
+        return self._login_locks.setdefault(username, asyncio.Lock())
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+
+            if self._playwright_manager is not None:
+                await self._playwright_manager.__aexit__()
+                self._playwright_manager = None
+                self._playwright = None
+
+
+_WEB_SESSIONS = _WebSessionStore()
+
+_BROWSER_POOLS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _BrowserPool] = weakref.WeakKeyDictionary()
+
+
+def _get_browser_pool() -> _BrowserPool:
+    loop = asyncio.get_running_loop()
+
+    pool = _BROWSER_POOLS.get(loop)
+    if pool is None:
+        pool = _BrowserPool()
+        _BROWSER_POOLS[loop] = pool
+
+    return pool
+
+
+async def close_browsers() -> None:
+    """
+    Closes the browser that is shared by web clients in the current event loop, if any.
+    """
+    pool = _BROWSER_POOLS.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
+
+
+async def _launch_browser(playwright: Playwright, headless: bool) -> Browser:
+    try:
+        return await playwright.firefox.launch(headless=headless)
+    except Exception as e:
+        tb = e.__traceback__
+        raise RuntimeError(
+            "unable to launch browser, make sure you have installed required dependencies using: "
+            "'otterdog install-deps'"
+        ).with_traceback(tb) from None
+
 
 class WebClient:
     # use 10s as default timeout
@@ -50,38 +210,18 @@ class WebClient:
     async def get_org_settings(self, org_id: str, included_keys: set[str]) -> dict[str, Any]:
         print_debug("retrieving settings via web interface")
 
-        async with async_playwright() as playwright:
-            try:
-                browser = await playwright.firefox.launch()
-            except Exception as e:
-                tb = e.__traceback__
-                raise RuntimeError(
-                    "unable to launch browser, make sure you have installed required dependencies using: "
-                    "'otterdog install-deps'"
-                ).with_traceback(tb) from None
-
-            context = await browser.new_context()
-
-            login_page = await context.new_page()
-            login_page.set_default_timeout(self._DEFAULT_TIMEOUT)
-            await self._login_if_required(login_page)
+        async with self._authenticated_context() as context:
 
             async def process_page(page_url, page_def) -> dict[str, Any]:
-                page = await context.new_page()
-                page.set_default_timeout(self._DEFAULT_TIMEOUT)
-                return await self._retrieve_settings(org_id, page_url, page_def, included_keys, page)
+                page = await self._new_page(context)
+                try:
+                    return await self._retrieve_settings(org_id, page_url, page_def, included_keys, page)
+                finally:
+                    await page.close()
 
             tasks = [process_page(page_url, page_def) for page_url, page_def in self._get_pages(included_keys)]
             settings_list = await gather(*tasks)
-            settings = {k: v for d in settings_list for k, v in d.items()}
-
-            await self._logout(login_page)
-
-            await login_page.close()
-            await context.close()
-            await browser.close()
-
-            return settings
+            return {k: v for d in settings_list for k, v in d.items()}
 
     def _get_pages(self, included_keys: set[str]) -> Iterator[tuple[str, Any]]:
         for page_url, page_def in self.web_settings_definition.items():
@@ -170,25 +310,9 @@ class WebClient:
     async def update_org_settings(self, org_id: str, data: dict[str, Any]) -> None:
         print_debug("updating settings via web interface")
 
-        async with async_playwright() as playwright:
-            try:
-                browser = await playwright.firefox.launch()
-            except Exception as e:
-                tb = e.__traceback__
-                raise RuntimeError(
-                    "unable to launch browser, make sure you have installed required dependencies using: "
-                    "'otterdog install-deps'"
-                ).with_traceback(tb) from None
-
-            page = await browser.new_page()
-            page.set_default_timeout(self._DEFAULT_TIMEOUT)
-
-            await self._login_if_required(page)
+        async with self._authenticated_context() as context:
+            page = await self._new_page(context)
             await self._update_settings(org_id, data, page)
-            await self._logout(page)
-
-            await page.close()
-            await browser.close()
 
             print_debug(f"updated {len(data)} setting(s) via web interface")
 
@@ -267,15 +391,7 @@ class WebClient:
         print_debug("opening browser window")
 
         async with async_playwright() as playwright:
-            try:
-                browser = await playwright.firefox.launch(headless=False)
-            except Exception as e:
-                tb = e.__traceback__
-                raise RuntimeError(
-                    "unable to launch browser, make sure you have installed required dependencies using: "
-                    "'otterdog install-deps'"
-                ).with_traceback(tb) from None
-
+            browser = await _launch_browser(playwright, headless=False)
             context = await browser.new_context(no_viewport=True)
 
             page = await context.new_page()
@@ -298,22 +414,8 @@ class WebClient:
     async def install_github_app(self, org_int_id: str, app_slug: str) -> None:
         print_debug(f"installing github app '{app_slug}'")
 
-        async with async_playwright() as playwright:
-            try:
-                browser = await playwright.firefox.launch(headless=True)
-            except Exception as e:
-                tb = e.__traceback__
-                raise RuntimeError(
-                    "unable to launch browser, make sure you have installed required dependencies using: "
-                    "'otterdog install-deps'"
-                ).with_traceback(tb) from None
-
-            context = await browser.new_context(no_viewport=True)
-
-            page = await context.new_page()
-            page.set_default_timeout(self._DEFAULT_TIMEOUT)
-
-            await self._login_if_required(page)
+        async with self._authenticated_context(no_viewport=True) as context:
+            page = await self._new_page(context)
 
             await page.goto(
                 f"https://github.com/apps/{app_slug}/installations/new/permissions"
@@ -322,31 +424,11 @@ class WebClient:
 
             await page.locator('button:text("Install")').click()
 
-            await self._logout(page)
-
-            await page.close()
-            await context.close()
-            await browser.close()
-
     async def uninstall_github_app(self, org_id: str, installation_id: str) -> None:
         print_debug(f"deleting app installation with id '{installation_id}'")
 
-        async with async_playwright() as playwright:
-            try:
-                browser = await playwright.firefox.launch(headless=True)
-            except Exception as e:
-                tb = e.__traceback__
-                raise RuntimeError(
-                    "unable to launch browser, make sure you have installed required dependencies using: "
-                    "'otterdog install-deps'"
-                ).with_traceback(tb) from None
-
-            context = await browser.new_context(no_viewport=True)
-
-            page = await context.new_page()
-            page.set_default_timeout(self._DEFAULT_TIMEOUT)
-
-            await self._login_if_required(page)
+        async with self._authenticated_context(no_viewport=True) as context:
+            page = await self._new_page(context)
 
             async def accept_dialog(dialog):
                 await dialog.accept()
@@ -355,52 +437,71 @@ class WebClient:
 
             await page.goto(f"https://github.com/organizations/{org_id}/settings/installations/{installation_id}")
             await page.locator('input:text("Uninstall")').click()
-            await self._logout(page)
-
-            await page.close()
-            await context.close()
-            await browser.close()
 
     @asynccontextmanager
-    async def get_logged_in_page(self):
-        context_manager = async_playwright()
+    async def get_logged_in_page(self) -> AsyncIterator[Page]:
+        async with self._authenticated_context(no_viewport=True) as context:
+            yield await self._new_page(context)
 
-        page = None
-        context = None
-        browser = None
-
-        try:
-            playwright = await context_manager.start()
+    @asynccontextmanager
+    async def _authenticated_context(self, **context_options: Any) -> AsyncIterator[BrowserContext]:
+        """
+        Creates a new browser context in the shared browser that is logged in with the configured account.
+
+        The authenticated state of the session is stored and reused by subsequent contexts,
+        a login is only performed when there is no stored session or it has expired.
+        """
+        pool = _get_browser_pool()
+        browser = await pool.get_browser()
+        username = self.credentials.username
+
+        # avoid concurrent logins with the same account when the stored session needs to be refreshed
+        async with pool.get_login_lock(username):
+            now = time.time()
+            session = _WEB_SESSIONS.get(username, now)
+
+            context = await browser.new_context(
+                storage_state=session.storage_state if session is not None else None,
+                **context_options,
+            )
 
             try:
-                browser = await playwright.firefox.launch(headless=True)
-            except Exception as e:
-                tb = e.__traceback__
-                raise RuntimeError(
-                    "unable to launch browser, make sure you have installed required dependencies using: "
-                    "'otterdog install-deps'"
-                ).with_traceback(tb) from None
+                if session is None or session.needs_verification(now):
+                    session = await self._refresh_session(context, session, now)
+                    _WEB_SESSIONS.put(username, session)
+            except BaseException:
+                await context.close()
+                raise
 
-            context = await browser.new_context(no_viewport=True)
+        try:
+            yield context
+        finally:
+            await context.close()
 
-            page = await context.new_page()
-            page.set_default_timeout(self._DEFAULT_TIMEOUT)
+    async def _refresh_session(self, context: BrowserContext, session: _WebSession | None, now: float) -> _WebSession:
+        page = await self._new_page(context)
 
-            await self._login_if_required(page)
+        try:
+            actor = await self._logged_in_as(page)
+
+            if actor is None:
+                print_debug("logging in via web interface")
+                await self._login(page)
+                created_at = now
+            elif actor != self.credentials.username:
+                raise RuntimeError(f"logged in with unexpected user {actor}")
+            else:
+                print_trace("re-using existing web session")
+                created_at = session.created_at if session is not None else now
 
-            yield page
+            return _WebSession(await context.storage_state(), created_at, now)
         finally:
-            if page is not None:
-                await self._logout(page)
-                await page.close()
-
-            if context is not None:
-                await context.close()
-
-            if browser is not None:
-                await browser.close()
+            await page.close()
 
-            await context_manager.__aexit__()
+    async def _new_page(self, context: BrowserContext) -> Page:
+        page = await context.new_page()
+        page.set_default_timeout(self._DEFAULT_TIMEOUT)
+        return page
 
     @staticmethod
     async def get_requested_permission_updates(org_id: str, page: Page) -> dict[str, dict[str, str]]:
@@ -0,0 +1,99 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import TYPE_CHECKING
+
+import aiofiles
+
+from otterdog.utils import print_debug, print_trace
+
+if TYPE_CHECKING:
+    from typing import Any
+
+_WEB_SETTINGS_DIR = ".cache/web-settings"
+
+
+def file_web_settings_cache(
+    max_age: int, refresh: bool = False, cache_dir: str = _WEB_SETTINGS_DIR
+) -> WebSettingsCache:
+    return WebSettingsCache(max_age, refresh, cache_dir)
+
+
+class WebSettingsCache:
+    """
+    Persists the settings of organizations that can only be retrieved via the web interface.
+    Cached settings are reused within max_age seconds after they have been retrieved, unless
+    a refresh is requested in which case settings are always retrieved again.
+    """
+
+    def __init__(self, max_age: int, refresh: bool, cache_dir: str):
+        self._max_age = max_age
+        self._refresh = refresh
+        self._cache_dir = cache_dir
+
+    @property
+    def max_age(self) -> int:
+        return self._max_age
+
+    def _get_cache_file(self, github_id: str) -> str:
+        return os.path.join(self._cache_dir, f"{github_id}.json")
+
+    async def load(self, github_id: str, keys: set[str]) -> dict[str, Any] | None:
+        """
+        Returns the cached settings for the given keys, or None if any of them is not cached or outdated.
+        """
+        if self._refresh:
+            return None
+
+        cache_file = self._get_cache_file(github_id)
+        if not os.path.exists(cache_file):
+            return None
+
+        print_trace(f"loading web settings from '{cache_file}'")
+        async with aiofiles.open(cache_file) as file:
+            try:
+                data = json.loads(await file.read())
+                created_at = data["created_at"]
+                settings = data["settings"]
+            except (ValueError, KeyError):
+                return None
+
+        if time.time() - created_at > self._max_age:
+            print_debug("discarding cached web settings, maximum age exceeded")
+            return None
+
+        if not keys.issubset(settings):
+            print_debug("discarding cached web settings, requested settings differ")
+            return None
+
+        return {k: settings[k] for k in keys}
+
+    async def save(self, github_id: str, settings: dict[str, Any]) -> None:
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+        cache_file = self._get_cache_file(github_id)
+        print_trace(f"saving web settings to '{cache_file}'")
+
+        # write to a temporary file first to avoid leaving a corrupt cache file behind
+        async with aiofiles.open(f"{cache_file}.tmp", "w") as file:
+            await file.write(json.dumps({"created_at": time.time(), "settings": settings}))
+
+        os.replace(f"{cache_file}.tmp", cache_file)
+
+    async def delete(self, github_id: str) -> None:
+        cache_file = self._get_cache_file(github_id)
+        if os.path.exists(cache_file):
+            os.remove(cache_file)
+
+    def __str__(self):
+        return f"file-web-settings-cache('{self._cache_dir}', max_age={self.max_age}, refresh={self._refresh})"
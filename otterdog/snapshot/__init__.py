@@ -0,0 +1,154 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+from __future__ import annotations
+
+import dataclasses
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+from otterdog.utils import print_debug
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Any
+
+# version of the snapshot format, snapshots with a different version are discarded
+_SNAPSHOT_VERSION = 2
+
+
+@dataclasses.dataclass
+class RepositorySnapshot:
+    """
+    The live state of a repository as retrieved from the provider at the given time.
+    """
+
+    updated_at: str | None
+    pushed_at: str | None
+    data: dict[str, Any]
+    fetched_at: float = dataclasses.field(default_factory=time.time)
+
+    def is_up_to_date(self, repo_summary: dict[str, Any]) -> bool:
+        return self.updated_at == repo_summary.get("updated_at") and self.pushed_at == repo_summary.get("pushed_at")
+
+    def to_dict(self) -> dict[str, Any]:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> RepositorySnapshot:
+        return cls(data.get("updated_at"), data.get("pushed_at"), data["data"], data["fetched_at"])
+
+
+@dataclasses.dataclass
+class OrganizationSnapshot:
+    """
+    A snapshot of the live state of the repositories of an organization.
+
+    The resources indicate which kind of repository resources have been retrieved,
+    a snapshot can only be reused if the same resources are requested. Dirty repositories
+    have been modified since the snapshot was taken and need to be retrieved again.
+    Repositories are reused from a snapshot at most max_age seconds after they have been retrieved.
+    """
+
+    resources: list[str]
+    repositories: dict[str, RepositorySnapshot]
+    dirty_repositories: set[str] = dataclasses.field(default_factory=set)
+    created_at: float = dataclasses.field(default_factory=time.time)
+
+    def get_reusable_repositories(
+        self,
+        repo_summaries: list[dict[str, Any]],
+        resources: list[str],
+        max_age: int,
+    ) -> dict[str, RepositorySnapshot]:
+        """
+        Returns the repository snapshots that are still up-to-date according to the given summaries
+        as returned when listing the repositories of an organization.
+        """
+        if self.resources != resources:
+            print_debug("discarding snapshot, retrieved resources differ")
+            return {}
+
+        now = time.time()
+        result = {}
+        for repo_summary in repo_summaries:
+            repo_name = repo_summary["name"]
+            if repo_name in self.dirty_repositories:
+                continue
+
+            repo_snapshot = self.repositories.get(repo_name)
+            if (
+                repo_snapshot is not None
+                and now - repo_snapshot.fetched_at <= max_age
+                and repo_snapshot.is_up_to_date(repo_summary)
+            ):
+                result[repo_name] = repo_snapshot
+
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": _SNAPSHOT_VERSION,
+            "created_at": self.created_at,
+            "resources": self.resources,
+            "dirty_repositories": sorted(self.dirty_repositories),
+            "repositories": {k: v.to_dict() for k, v in self.repositories.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> OrganizationSnapshot | None:
+        if data.get("version") != _SNAPSHOT_VERSION:
+            return None
+
+        return cls(
+            data["resources"],
+            {k: RepositorySnapshot.from_dict(v) for k, v in data["repositories"].items()},
+            set(data.get("dirty_repositories", [])),
+            data["created_at"],
+        )
+
+
+class SnapshotStore(ABC):
+    """
+    Persists snapshots of the live state of organizations. A snapshot is only
+    reused within max_age seconds after it has been taken.
+    """
+
+    def __init__(self, max_age: int):
+        self._max_age = max_age
+
+    @property
+    def max_age(self) -> int:
+        return self._max_age
+
+    @abstractmethod
+    async def load(self, github_id: str) -> OrganizationSnapshot | None: ...
+
+    @abstractmethod
+    async def save(self, github_id: str, snapshot: OrganizationSnapshot) -> None: ...
+
+    @abstractmethod
+    async def delete(self, github_id: str) -> None: ...
+
+    async def update(self, github_id: str, snapshot: OrganizationSnapshot, cleared_repos: Iterable[str]) -> None:
+        """
+        Saves a snapshot that replaces a previously loaded one. Repositories that have been marked dirty
+        since then stay dirty, only the given repositories that have been retrieved again are cleared.
+        """
+        current_snapshot = await self.load(github_id)
+        if current_snapshot is not None:
+            snapshot.dirty_repositories.update(current_snapshot.dirty_repositories.difference(cleared_repos))
+
+        await self.save(github_id, snapshot)
+
+    async def mark_dirty(self, github_id: str, repo_names: Iterable[str]) -> None:
+        snapshot = await self.load(github_id)
+        if snapshot is not None:
+            snapshot.dirty_repositories.update(repo_names)
+            await self.save(github_id, snapshot)
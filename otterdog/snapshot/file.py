@@ -0,0 +1,65 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+from __future__ import annotations
+
+import json
+import os
+
+import aiofiles
+
+from otterdog.utils import print_trace
+
+from . import OrganizationSnapshot, SnapshotStore
+
+_SNAPSHOT_DIR = ".cache/snapshots"
+
+
+def file_snapshot_store(max_age: int, snapshot_dir: str = _SNAPSHOT_DIR) -> SnapshotStore:
+    return _FileSnapshotStore(max_age, snapshot_dir)
+
+
+class _FileSnapshotStore(SnapshotStore):
+    def __init__(self, max_age: int, snapshot_dir: str):
+        super().__init__(max_age)
+        self._snapshot_dir = snapshot_dir
+
+    def _get_snapshot_file(self, github_id: str) -> str:
+        return os.path.join(self._snapshot_dir, f"{github_id}.json")
+
+    async def load(self, github_id: str) -> OrganizationSnapshot | None:
+        snapshot_file = self._get_snapshot_file(github_id)
+        if not os.path.exists(snapshot_file):
+            return None
+
+        print_trace(f"loading snapshot from '{snapshot_file}'")
+        async with aiofiles.open(snapshot_file) as file:
+            try:
+                return OrganizationSnapshot.from_dict(json.loads(await file.read()))
+            except (ValueError, KeyError):
+                return None
+
+    async def save(self, github_id: str, snapshot: OrganizationSnapshot) -> None:
+        os.makedirs(self._snapshot_dir, exist_ok=True)
+
+        snapshot_file = self._get_snapshot_file(github_id)
+        print_trace(f"saving snapshot to '{snapshot_file}'")
+
+        # write to a temporary file first to avoid leaving a corrupt snapshot behind
+        async with aiofiles.open(f"{snapshot_file}.tmp", "w") as file:
+            await file.write(json.dumps(snapshot.to_dict()))
+
+        os.replace(f"{snapshot_file}.tmp", snapshot_file)
+
+    async def delete(self, github_id: str) -> None:
+        snapshot_file = self._get_snapshot_file(github_id)
+        if os.path.exists(snapshot_file):
+            os.remove(snapshot_file)
+
+    def __str__(self):
+        return f"file-snapshot-store('{self._snapshot_dir}', max_age={self.max_age})"
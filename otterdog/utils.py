@@ -8,6 +8,7 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import re
 import sys
@@ -281,6 +282,47 @@ def multi_associate_by_key(input_list: Sequence[T], key_func: Callable[[T], list
     return result
 
 
+class _PrefixTrieNode(Generic[T]):
+    __slots__ = ("children", "entry")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _PrefixTrieNode[T]] = {}
+        self.entry: tuple[int, T] | None = None
+
+
+class PrefixTrie(Generic[T]):
+    """
+    Associates items with key prefixes, each item having a rank.
+    A lookup returns the item with the lowest rank among all prefixes of a given key.
+    """
+
+    def __init__(self) -> None:
+        self._root: _PrefixTrieNode[T] = _PrefixTrieNode()
+
+    def insert(self, prefix: str, rank: int, item: T) -> None:
+        node = self._root
+        for char in prefix:
+            node = node.children.setdefault(char, _PrefixTrieNode())
+
+        if node.entry is None or rank < node.entry[0]:
+            node.entry = (rank, item)
+
+    def find_first(self, key: str) -> T | None:
+        result: tuple[int, T] | None = None
+
+        node = self._root
+        for char in key:
+            next_node = node.children.get(char)
+            if next_node is None:
+                break
+
+            node = next_node
+            if node.entry is not None and (result is None or node.entry[0] < result[0]):
+                result = node.entry
+
+        return result[1] if result is not None else None
+
+
 class LogLevel(Enum):
     GLOBAL = 0
     INFO = 1
@@ -590,9 +632,16 @@ def query_json(expr: str, data: dict[str, Any]) -> Any:
     """
     Evaluates a jsonata expression on the given dictionary.
     """
+    compiled_expr = _compile_jsonata_expression(expr)
+    # evaluate the input in a separate frame, otherwise the cached expression would bind it in its shared environment
+    return compiled_expr.evaluate(data, compiled_expr.create_frame(compiled_expr.environment))
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_jsonata_expression(expr: str) -> Any:
     from jsonata import Jsonata  # type: ignore
 
-    return Jsonata.jsonata(expr).evaluate(data)
+    return Jsonata.jsonata(expr)
 
 
 def deep_merge_dict(source: dict[str, Any], destination: dict[str, Any]):
@@ -22,7 +22,7 @@ from quart.json.provider import DefaultJSONProvider
 from quart_auth import QuartAuth
 from quart_redis import RedisHandler  # type: ignore
 
-from otterdog.cache import set_github_cache
+from otterdog.cache import set_github_cache, set_snapshot_store, set_template_store_dir
 
 from .db import Mongo, init_mongo_database
 from .filters import register_filters
@@ -51,6 +51,12 @@ def register_extensions(app):
     oauth_github.init_app(app)
 
 
+def register_task_queue(app) -> None:
+    from otterdog.webapp.tasks.queue import init_task_queue
+
+    init_task_queue(app)
+
+
 def register_github_webhook(app) -> None:
     webhook_fqn = "otterdog.webapp.webhook"
     spec = find_spec(webhook_fqn)
@@ -103,8 +109,16 @@ def create_app(app_config: AppConfig):
         return {"asset": asset}
 
     set_github_cache(get_github_ghproxy_cache(app.config))
+    # share checkouts of base templates between tasks which use separate working directories
+    set_template_store_dir(os.path.join(app.config["APP_ROOT"], "templates"))
+
+    if app.config["SNAPSHOT_MAX_AGE"] > 0:
+        from otterdog.webapp.db.snapshot import mongo_snapshot_store
+
+        set_snapshot_store(mongo_snapshot_store(app.config["SNAPSHOT_MAX_AGE"]))
 
     register_extensions(app)
+    register_task_queue(app)
     register_github_webhook(app)
     register_blueprints(app)
     configure_database(app)
@@ -19,8 +19,9 @@ from ariadne import (
     snake_case_fallback_resolvers,
 )
 
-from otterdog.utils import query_json
-from otterdog.webapp.db.service import get_configurations
+from otterdog.webapp.db.service import get_configuration_shas, get_configurations_by_github_ids
+
+from .query_index import QueryIndex
 
 query = QueryType()
 type_defs = load_schema_from_path(os.path.join(os.path.dirname(__file__), "schema.graphql"))
@@ -28,29 +29,68 @@ type_defs = load_schema_from_path(os.path.join(os.path.dirname(__file__), "schem
 configuration_type = ObjectType("Configuration")
 
 
+class _IndexedConfigurations:
+    """
+    Keeps the stored configurations in memory together with indexes to filter them,
+    only configurations that have changed are retrieved again.
+    """
+
+    def __init__(self) -> None:
+        self._shas: dict[str, str] = {}
+        self._projects = QueryIndex([])
+        self._repositories: dict[str, QueryIndex] = {}
+
+    async def get_projects(self) -> QueryIndex:
+        shas = await get_configuration_shas()
+        if shas == self._shas:
+            return self._projects
+
+        projects = {project["github_id"]: project for project in self._projects.items}
+        changed_github_ids = [github_id for github_id, sha in shas.items() if self._shas.get(github_id) != sha]
+        for github_id, configuration in (await get_configurations_by_github_ids(changed_github_ids)).items():
+            projects[github_id] = configuration.model_dump()
+
+        # a configuration might have been deleted since retrieving the shas
+        self._projects = QueryIndex([projects[github_id] for github_id in shas if github_id in projects])
+        self._repositories = {
+            project["github_id"]: QueryIndex(project["config"].get("repositories", []))
+            for project in self._projects.items
+        }
+        self._shas = {project["github_id"]: project["sha"] for project in self._projects.items}
+        return self._projects
+
+    def get_repositories(self, config: dict[str, Any]) -> QueryIndex:
+        repositories = config["repositories"]
+        index = self._repositories.get(config.get("github_id", ""))
+        if index is not None and index.items is repositories:
+            return index
+        else:
+            return QueryIndex(repositories)
+
+
+_configurations = _IndexedConfigurations()
+
+
 @query.field("projects")
 async def resolve_projects(*_, filter=None):
-    configurations = await get_configurations()
+    projects = await _configurations.get_projects()
 
     if filter:
         filter = filter.replace("'", '"')
-        data = [x.model_dump(exclude="id") for x in configurations]
-        result = query_json(f"$[{filter}][]", data)
-        configurations = result if result else []
-
-    return configurations
+        return projects.query(filter)
+    else:
+        return projects.items
 
 
 @configuration_type.field("repositories")
 async def resolve_repositories(config: dict[str, Any], *_, filter=None):
-    repositories = config["repositories"]
+    repositories = _configurations.get_repositories(config)
 
     if filter:
         filter = filter.replace("'", '"')
-        result = query_json(f"$[{filter}][]", repositories)
-        repositories = result if result else []
-
-    return repositories
+        return repositories.query(filter)
+    else:
+        return repositories.items
 
 
 schema = make_executable_schema(type_defs, query, configuration_type, snake_case_fallback_resolvers)
@@ -0,0 +1,86 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+from otterdog.utils import query_json
+
+# conditions comparing a field with a string or boolean literal combined with 'and', e.g. 'name = "otterdog"'
+_LITERAL = r'"[^"\\]*"|true|false'
+_FIELD = r"(?!(?:and|or|in|true|false|null)\b)[A-Za-z_][A-Za-z0-9_]*"
+_CONDITION = rf"\s*({_FIELD})\s*=\s*({_LITERAL})\s*"
+_CONDITION_PATTERN = re.compile(_CONDITION)
+_FILTER_PATTERN = re.compile(rf"{_CONDITION}(?:(?<![A-Za-z0-9_])and(?![A-Za-z0-9_]){_CONDITION})*")
+
+
+class QueryIndex:
+    """
+    Filters a list of objects using jsonata predicates, e.g. 'archived = false'.
+
+    Predicates that only compare fields of the objects with a string or boolean literal,
+    optionally combined with 'and', are answered using an index of the respective fields
+    that is built once, other predicates are evaluated on each object.
+    """
+
+    def __init__(self, items: list[dict[str, Any]]):
+        self.items = items
+        self._indexes: dict[str, dict[str | bool, list[int]] | None] = {}
+
+    def query(self, filter: str) -> list[dict[str, Any]]:
+        conditions = _parse_conditions(filter)
+        if conditions is not None:
+            result = self._query_indexes(conditions)
+            if result is not None:
+                return result
+
+        result = query_json(f"$[{filter}][]", self.items)  # type: ignore
+        return result if result else []
+
+    def _query_indexes(self, conditions: list[tuple[str, str | bool]]) -> list[dict[str, Any]] | None:
+        positions: set[int] | None = None
+        for field, value in conditions:
+            index = self._get_index(field)
+            if index is None:
+                return None
+
+            matches = set(index.get(value, []))
+            positions = matches if positions is None else positions & matches
+
+        return [self.items[position] for position in sorted(positions or [])]
+
+    def _get_index(self, field: str) -> dict[str | bool, list[int]] | None:
+        if field not in self._indexes:
+            self._indexes[field] = _build_index(self.items, field)
+
+        return self._indexes[field]
+
+
+def _build_index(items: list[dict[str, Any]], field: str) -> dict[str | bool, list[int]] | None:
+    index: dict[str | bool, list[int]] = {}
+    for position, item in enumerate(items):
+        value = item.get(field)
+        if value is None:
+            continue
+        elif not isinstance(value, str | bool):
+            # jsonata compares other values, e.g. lists, differently, they can not be indexed
+            return None
+        else:
+            index.setdefault(value, []).append(position)
+
+    return index
+
+
+def _parse_conditions(filter: str) -> list[tuple[str, str | bool]] | None:
+    if _FILTER_PATTERN.fullmatch(filter) is None:
+        return None
+
+    return [(match.group(1), json.loads(match.group(2))) for match in _CONDITION_PATTERN.finditer(filter)]
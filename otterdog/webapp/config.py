@@ -28,6 +28,16 @@ class AppConfig:
     REDIS_URI = config("REDIS_URI", default="redis://redis:6379")
     GHPROXY_URI = config("GHPROXY_URI", default="http://ghproxy:8888")
 
+    # number of seconds cached responses from GitHub are used without revalidation
+    CACHE_MAX_STALE = config("CACHE_MAX_STALE", default=0, cast=int)
+
+    # number of seconds a snapshot of the live state of an organization is reused, 0 disables snapshots
+    SNAPSHOT_MAX_AGE = config("SNAPSHOT_MAX_AGE", default=0, cast=int)
+
+    # number of queued tasks executed concurrently per process, and per organization across all processes
+    TASK_QUEUE_WORKERS = config("TASK_QUEUE_WORKERS", default=8, cast=int)
+    TASK_QUEUE_TASKS_PER_ORG = config("TASK_QUEUE_TASKS_PER_ORG", default=2, cast=int)
+
     OTTERDOG_CONFIG_OWNER = config("OTTERDOG_CONFIG_OWNER", default=None)
     OTTERDOG_CONFIG_REPO = config("OTTERDOG_CONFIG_REPO", default=None)
     OTTERDOG_CONFIG_PATH = config("OTTERDOG_CONFIG_PATH", default=None)
@@ -41,9 +41,12 @@ class Mongo:
 async def init_mongo_database(mongo: Mongo) -> None:
     from .models import (
         ConfigurationModel,
+        DashboardStatisticsModel,
         InstallationModel,
+        LiveStateSnapshotModel,
         PolicyModel,
         PullRequestModel,
+        RepositorySnapshotModel,
         StatisticsModel,
         TaskModel,
         UserModel,
@@ -56,7 +59,10 @@ async def init_mongo_database(mongo: Mongo) -> None:
             ConfigurationModel,
             PullRequestModel,
             StatisticsModel,
+            DashboardStatisticsModel,
             UserModel,
             PolicyModel,
+            LiveStateSnapshotModel,
+            RepositorySnapshotModel,
         ]  # type: ignore
     )
@@ -12,7 +12,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from odmantic import EmbeddedModel, Field, Model
+from odmantic import EmbeddedModel, Field, Index, Model
+from odmantic.config import ODMConfigDict
 
 from otterdog.webapp.utils import current_utc_time
 
@@ -109,6 +110,13 @@ class PullRequestModel(Model):
     closed_at: Optional[datetime] = None
     merged_at: Optional[datetime] = Field(index=True, default=None)
 
+    # pull requests are looked up by the fields of their id rather than the id as a whole
+    model_config = ODMConfigDict(
+        indexes=lambda: [
+            Index(PullRequestModel.id.org_id, PullRequestModel.id.repo_name, PullRequestModel.id.pull_request)
+        ]
+    )
+
     def can_be_automerged(self) -> bool:
         return (
             self.valid is True
@@ -132,6 +140,28 @@ class StatisticsModel(Model):
     repos_with_private_vulnerability_reporting: int
 
 
+class DashboardStatisticsModel(Model):
+    """
+    A summary of the statistics of all organizations and pull requests, updated incrementally.
+    """
+
+    key: str = Field(primary_field=True)
+    total_projects: int = 0
+    two_factor_enforced: int = 0
+    total_repos: int = 0
+    archived_repos: int = 0
+    repos_with_secret_scanning: int = 0
+    repos_with_secret_scanning_push_protection: int = 0
+    repos_with_branch_protection: int = 0
+    repos_with_dependabot_alerts: int = 0
+    repos_with_dependabot_security_updates: int = 0
+    repos_with_private_vulnerability_reporting: int = 0
+    open_or_incomplete_pull_requests: int = 0
+    merged_pull_requests: int = 0
+    # incremented with each incremental update to detect concurrent updates when computing the statistics as a whole
+    version: int = 0
+
+
 class UserModel(Model):
     node_id: str = Field(primary_field=True)
     username: str
@@ -148,3 +178,24 @@ class PolicyId(EmbeddedModel):
 class PolicyModel(Model):
     id: PolicyId = Field(primary_field=True)
     config: dict
+
+
+class LiveStateSnapshotModel(Model):
+    github_id: str = Field(primary_field=True)
+    resources: list[str]
+    dirty_repos: list[str] = Field(default_factory=list)
+    created_at: float
+
+
+class RepositorySnapshotId(EmbeddedModel):
+    org_id: str
+    repo_name: str
+
+
+class RepositorySnapshotModel(Model):
+    id: RepositorySnapshotId = Field(primary_field=True)
+    updated_at: Optional[str] = None
+    pushed_at: Optional[str] = None
+    data: dict
+    # repositories stored without the time they have been retrieved are never reused
+    fetched_at: float = 0.0
@@ -10,10 +10,11 @@ from __future__ import annotations
 
 import dataclasses
 from logging import getLogger
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from odmantic import query
-from quart import current_app
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
 
 from otterdog.webapp import mongo
 from otterdog.webapp.utils import (
@@ -25,13 +26,17 @@ from otterdog.webapp.utils import (
 from .models import (
     ApplyStatus,
     ConfigurationModel,
+    DashboardStatisticsModel,
     InstallationModel,
     InstallationStatus,
+    LiveStateSnapshotModel,
     PolicyId,
     PolicyModel,
     PullRequestId,
     PullRequestModel,
     PullRequestStatus,
+    RepositorySnapshotId,
+    RepositorySnapshotModel,
     StatisticsModel,
     TaskModel,
     TaskStatus,
@@ -39,6 +44,9 @@ from .models import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from odmantic import Model
     from odmantic.query import QueryExpression
 
     from otterdog.config import OtterdogConfig
@@ -158,6 +166,7 @@ async def cleanup_data() -> None:
     await cleanup_statistics(valid_orgs)
     await cleanup_configurations(valid_orgs)
     await cleanup_policies(valid_orgs)
+    await refresh_statistics()
 
 
 async def update_app_installations(
@@ -169,22 +178,26 @@ async def update_app_installations(
     rest_api = get_rest_api_for_app()
     all_installations = await rest_api.app.get_app_installations()
 
-    async with mongo.odm.session() as session:
-        for app_installation in all_installations:
-            installation_id = app_installation["id"]
-            github_id = app_installation["account"]["login"]
-            suspended_at = app_installation["suspended_at"]
-            installation_status = InstallationStatus.INSTALLED if suspended_at is None else InstallationStatus.SUSPENDED
+    models = await get_installations_by_github_ids([x["account"]["login"] for x in all_installations])
 
-            model = await get_installation_by_github_id(github_id)
-            if model is not None:
-                model.installation_id = int(installation_id)
-                model.installation_status = installation_status
+    for app_installation in all_installations:
+        installation_id = app_installation["id"]
+        github_id = app_installation["account"]["login"]
+        suspended_at = app_installation["suspended_at"]
+        installation_status = InstallationStatus.INSTALLED if suspended_at is None else InstallationStatus.SUSPENDED
+
+        model = models.get(github_id)
+        if model is not None:
+            model.installation_id = int(installation_id)
+            model.installation_status = installation_status
+
+    await _save_all(list(models.values()))
 
-                await session.save(model)
+    active_installations = await get_active_installations()
+    configurations = await get_configurations_by_github_ids([x.github_id for x in active_installations])
 
-    for installation in await get_active_installations():
-        configuration_model = await get_configuration_by_github_id(installation.github_id)
+    for installation in active_installations:
+        configuration_model = configurations.get(installation.github_id)
         if configuration_model is None or (
             project_names_to_force_update is not None and installation.project_name in project_names_to_force_update
         ):
@@ -196,10 +209,11 @@ async def update_app_installations(
 async def update_data_for_installation(installation: InstallationModel) -> None:
     from otterdog.webapp.tasks.fetch_all_pull_requests import FetchAllPullRequestsTask
     from otterdog.webapp.tasks.fetch_config import FetchConfigTask
+    from otterdog.webapp.tasks.queue import queue_task
 
     assert installation.config_repo is not None
 
-    current_app.add_background_task(
+    queue_task(
         FetchConfigTask(
             installation.installation_id,
             installation.github_id,
@@ -207,7 +221,7 @@ async def update_data_for_installation(installation: InstallationModel) -> None:
         )
     )
 
-    current_app.add_background_task(
+    queue_task(
         FetchAllPullRequestsTask(
             installation.installation_id,
             installation.github_id,
@@ -218,10 +232,11 @@ async def update_data_for_installation(installation: InstallationModel) -> None:
 
 async def update_policies_for_installation(installation: InstallationModel, global_policies: list[Policy]) -> None:
     from otterdog.webapp.tasks.fetch_policies import FetchPoliciesTask
+    from otterdog.webapp.tasks.queue import queue_task
 
     assert installation.config_repo is not None
 
-    current_app.add_background_task(
+    queue_task(
         FetchPoliciesTask(
             installation.installation_id,
             installation.github_id,
@@ -239,12 +254,17 @@ async def get_installation_by_github_id(github_id: str) -> InstallationModel | N
     return await mongo.odm.find_one(InstallationModel, InstallationModel.github_id == github_id)
 
 
+async def get_installations_by_github_ids(github_ids: list[str]) -> dict[str, InstallationModel]:
+    installations = await mongo.odm.find(InstallationModel, query.in_(InstallationModel.github_id, github_ids))
+    return {x.github_id: x for x in installations}
+
+
 async def get_installation_by_project_name(project_name: str) -> InstallationModel | None:
     return await mongo.odm.find_one(InstallationModel, InstallationModel.project_name == project_name)
 
 
 async def get_all_installations_count() -> int:
-    return await mongo.odm.count(InstallationModel)
+    return await mongo.odm.get_collection(InstallationModel).estimated_document_count()
 
 
 async def get_installations() -> list[InstallationModel]:
@@ -310,6 +330,53 @@ async def get_configuration_by_github_id(github_id: str) -> ConfigurationModel |
     return await mongo.odm.find_one(ConfigurationModel, ConfigurationModel.github_id == github_id)
 
 
+async def get_configurations_by_github_ids(github_ids: list[str]) -> dict[str, ConfigurationModel]:
+    configurations = await mongo.odm.find(ConfigurationModel, query.in_(ConfigurationModel.github_id, github_ids))
+    return {x.github_id: x for x in configurations}
+
+
+async def get_configuration_shas() -> dict[str, str]:
+    """
+    Returns the sha of each configuration without retrieving the configurations themselves.
+    """
+    collection = mongo.odm.get_collection(ConfigurationModel)
+    return {x["_id"]: x["sha"] async for x in collection.find({}, {"sha": True})}
+
+
+@dataclasses.dataclass(frozen=True)
+class ConfigurationSummary:
+    github_id: str
+    two_factor_requirement: bool | None
+    default_workflow_permissions: str | None
+    total_repos: int
+
+
+async def get_configuration_summaries() -> list[ConfigurationSummary]:
+    """
+    Returns a summary of all configurations without retrieving the configurations themselves.
+    """
+    pipeline = [
+        {
+            "$project": {
+                "two_factor_requirement": "$config.settings.two_factor_requirement",
+                "default_workflow_permissions": "$config.settings.workflows.default_workflow_permissions",
+                "total_repos": {"$size": {"$ifNull": ["$config.repositories", []]}},
+            }
+        }
+    ]
+
+    collection = mongo.odm.get_collection(ConfigurationModel)
+    return [
+        ConfigurationSummary(
+            x["_id"],
+            x.get("two_factor_requirement"),
+            x.get("default_workflow_permissions"),
+            x["total_repos"],
+        )
+        async for x in collection.aggregate(pipeline)
+    ]
+
+
 async def get_configuration_by_project_name(project_name: str) -> ConfigurationModel | None:
     return await mongo.odm.find_one(ConfigurationModel, ConfigurationModel.project_name == project_name)
 
@@ -382,26 +449,12 @@ async def update_or_create_pull_request(
     has_required_approvals: bool | None = None,
     apply_status: ApplyStatus | None = None,
 ) -> PullRequestModel:
-    pull_request_status = PullRequestStatus[pull_request.get_pr_status()]
-
-    pr_model = await find_pull_request(owner, repo, pull_request.number)
-    if pr_model is None:
-        pr_model = PullRequestModel(  # type: ignore
-            id=PullRequestId(org_id=owner, repo_name=repo, pull_request=pull_request.number),
-            draft=pull_request.draft,
-            status=pull_request_status,
-            created_at=pull_request.created_at,
-            updated_at=pull_request.updated_at,
-            closed_at=pull_request.closed_at,
-            merged_at=pull_request.merged_at,
-        )
-    else:
-        pr_model.draft = pull_request.draft
-        pr_model.status = pull_request_status
-        pr_model.created_at = pull_request.created_at
-        pr_model.updated_at = pull_request.updated_at
-        pr_model.closed_at = pull_request.closed_at
-        pr_model.merged_at = pull_request.merged_at
+    pr_model = _update_or_create_pull_request_model(
+        await find_pull_request(owner, repo, pull_request.number),
+        owner,
+        repo,
+        pull_request,
+    )
 
     if apply_status is not None:
         pr_model.apply_status = apply_status
@@ -428,8 +481,109 @@ async def update_or_create_pull_request(
     return pr_model
 
 
+async def update_or_create_pull_requests(
+    owner: str,
+    repo: str,
+    pull_requests: Sequence[tuple[PullRequest, ApplyStatus | None]],
+) -> None:
+    """
+    Updates or creates the models for multiple pull requests of a repository at once.
+    """
+    existing_models = await mongo.odm.find(
+        PullRequestModel,
+        PullRequestModel.id.org_id == owner,
+        PullRequestModel.id.repo_name == repo,
+        query.in_(PullRequestModel.id.pull_request, [x.number for x, _ in pull_requests]),
+    )
+    pr_models = {x.id.pull_request: x for x in existing_models}
+    previous_states = {x.id.pull_request: (x.status, x.apply_status) for x in existing_models}
+
+    for pull_request, apply_status in pull_requests:
+        pr_model = _update_or_create_pull_request_model(pr_models.get(pull_request.number), owner, repo, pull_request)
+
+        if apply_status is not None:
+            pr_model.apply_status = apply_status
+
+        pr_models[pull_request.number] = pr_model
+
+    await _save_all(list(pr_models.values()))
+
+    increments: dict[str, int] = {}
+    for number, pr_model in pr_models.items():
+        previous_state = previous_states.get(number)
+        _add_pull_request_increments(
+            increments,
+            _get_pull_request_counter(*previous_state) if previous_state is not None else None,
+            _get_pull_request_counter(pr_model.status, pr_model.apply_status),
+        )
+
+    await _increment_statistics(increments)
+
+
+def _update_or_create_pull_request_model(
+    pr_model: PullRequestModel | None,
+    owner: str,
+    repo: str,
+    pull_request: PullRequest,
+) -> PullRequestModel:
+    pull_request_status = PullRequestStatus[pull_request.get_pr_status()]
+
+    if pr_model is None:
+        return PullRequestModel(  # type: ignore
+            id=PullRequestId(org_id=owner, repo_name=repo, pull_request=pull_request.number),
+            draft=pull_request.draft,
+            status=pull_request_status,
+            created_at=pull_request.created_at,
+            updated_at=pull_request.updated_at,
+            closed_at=pull_request.closed_at,
+            merged_at=pull_request.merged_at,
+        )
+    else:
+        pr_model.draft = pull_request.draft
+        pr_model.status = pull_request_status
+        pr_model.created_at = pull_request.created_at
+        pr_model.updated_at = pull_request.updated_at
+        pr_model.closed_at = pull_request.closed_at
+        pr_model.merged_at = pull_request.merged_at
+        return pr_model
+
+
 async def update_pull_request(pull_request: PullRequestModel) -> None:
-    await mongo.odm.save(pull_request)
+    # similar to AIOEngine.save, but also retrieve the previous state to update the statistics
+    previous = await mongo.odm.get_collection(PullRequestModel).find_one_and_update(
+        pull_request.model_dump_doc(include={pull_request.__primary_field__}),
+        {"$set": pull_request.model_dump_doc()},
+        upsert=True,
+        projection=["status", "apply_status"],
+        return_document=ReturnDocument.BEFORE,
+    )
+    object.__setattr__(pull_request, "__fields_modified__", set())
+
+    increments: dict[str, int] = {}
+    _add_pull_request_increments(
+        increments,
+        _get_pull_request_counter(previous["status"], previous["apply_status"]) if previous is not None else None,
+        _get_pull_request_counter(pull_request.status, pull_request.apply_status),
+    )
+    await _increment_statistics(increments)
+
+
+def _get_pull_request_counter(status: str, apply_status: str) -> str | None:
+    # needs to be consistent with _open_or_incomplete_pull_requests_query and _merged_pull_requests_query
+    if status == PullRequestStatus.OPEN:
+        return "open_or_incomplete_pull_requests"
+    elif status == PullRequestStatus.MERGED:
+        return "merged_pull_requests" if apply_status == ApplyStatus.COMPLETED else "open_or_incomplete_pull_requests"
+    else:
+        return None
+
+
+def _add_pull_request_increments(increments: dict[str, int], previous: str | None, current: str | None) -> None:
+    if previous != current:
+        if previous is not None:
+            increments[previous] = increments.get(previous, 0) - 1
+        if current is not None:
+            increments[current] = increments.get(current, 0) + 1
 
 
 async def get_open_or_incomplete_pull_requests() -> list[PullRequestModel]:
@@ -535,8 +689,101 @@ async def cleanup_pull_requests(valid_orgs: list[str]) -> None:
     await mongo.odm.remove(PullRequestModel, query.not_in(PullRequestModel.id.org_id, valid_orgs))
 
 
+# the statistics of an organization that are summed up in the dashboard statistics
+_ORG_STATISTICS_FIELDS = (
+    "two_factor_enforced",
+    "total_repos",
+    "archived_repos",
+    "repos_with_branch_protection",
+    "repos_with_secret_scanning",
+    "repos_with_secret_scanning_push_protection",
+    "repos_with_dependabot_alerts",
+    "repos_with_dependabot_security_updates",
+    "repos_with_private_vulnerability_reporting",
+)
+
+_DASHBOARD_STATISTICS_KEY = "dashboard"
+
+# the number of attempts to compute the dashboard statistics without a concurrent incremental update
+_REFRESH_STATISTICS_ATTEMPTS = 3
+
+
 async def save_statistics(model: StatisticsModel) -> None:
-    await mongo.odm.save(model)
+    doc = model.model_dump_doc()
+    previous = await mongo.odm.get_collection(StatisticsModel).find_one_and_replace(
+        {"_id": doc["_id"]},
+        doc,
+        upsert=True,
+        return_document=ReturnDocument.BEFORE,
+    )
+    object.__setattr__(model, "__fields_modified__", set())
+
+    await _increment_statistics(_get_org_statistics_increments(previous, doc))
+
+
+def _get_org_statistics_increments(previous: Mapping[str, Any] | None, current: Mapping[str, Any]) -> dict[str, int]:
+    increments = {"total_projects": 0 if previous is not None else 1}
+    for field in _ORG_STATISTICS_FIELDS:
+        increments[field] = current[field] - (previous[field] if previous is not None else 0)
+
+    return increments
+
+
+async def _increment_statistics(increments: dict[str, int]) -> None:
+    increments = {k: v for k, v in increments.items() if v != 0}
+    if len(increments) == 0:
+        return
+
+    # the statistics are only updated incrementally once they have been computed as a whole
+    await mongo.odm.get_collection(DashboardStatisticsModel).update_one(
+        {"_id": _DASHBOARD_STATISTICS_KEY},
+        {"$inc": {**increments, "version": 1}},
+    )
+
+
+async def refresh_statistics() -> DashboardStatisticsModel:
+    """
+    Computes the dashboard statistics from the statistics of all organizations and pull requests.
+
+    The statistics are only replaced if they have not been updated incrementally in the meantime,
+    otherwise they are computed again. An incremental update of statistics that have already been
+    taken into account might still be applied afterwards, the small drift is accepted and corrected
+    when the statistics are computed again.
+    """
+    group: dict[str, Any] = {"_id": None, "total_projects": {"$sum": 1}}
+    group.update({field: {"$sum": f"${field}"} for field in _ORG_STATISTICS_FIELDS})
+
+    collection = mongo.odm.get_collection(DashboardStatisticsModel)
+
+    for attempt in range(_REFRESH_STATISTICS_ATTEMPTS):
+        current = await collection.find_one({"_id": _DASHBOARD_STATISTICS_KEY}, {"version": 1})
+        version = current.get("version", 0) if current is not None else 0
+
+        stats_list = await mongo.odm.get_collection(StatisticsModel).aggregate([{"$group": group}]).to_list(1)
+        stats = stats_list[0] if stats_list else {}
+
+        model = DashboardStatisticsModel(  # type: ignore
+            key=_DASHBOARD_STATISTICS_KEY,
+            total_projects=stats.get("total_projects", 0),
+            open_or_incomplete_pull_requests=await get_open_or_incomplete_pull_requests_count(),
+            merged_pull_requests=await get_merged_pull_requests_count(),
+            version=version,
+            **{field: stats.get(field, 0) for field in _ORG_STATISTICS_FIELDS},
+        )
+
+        # replace the statistics regardless of concurrent updates on the last attempt
+        selector: dict[str, Any] = {"_id": _DASHBOARD_STATISTICS_KEY}
+        if attempt < _REFRESH_STATISTICS_ATTEMPTS - 1:
+            selector["version"] = version
+
+        try:
+            await collection.replace_one(selector, model.model_dump_doc(), upsert=True)
+            break
+        except DuplicateKeyError:
+            # the statistics have been updated incrementally in the meantime, the selector did not match
+            continue
+
+    return model
 
 
 @dataclasses.dataclass(frozen=True)
@@ -551,6 +798,8 @@ class Statistics:
     repos_with_dependabot_alerts: int = 0
     repos_with_dependabot_security_updates: int = 0
     repos_with_private_vulnerability_reporting: int = 0
+    open_or_incomplete_pull_requests: int = 0
+    merged_pull_requests: int = 0
 
     @property
     def active_repos(self) -> int:
@@ -558,42 +807,28 @@ class Statistics:
 
 
 async def get_statistics() -> Statistics:
-    pipeline = [
-        {
-            "$group": {
-                "_id": None,
-                "total_projects": {"$sum": 1},
-                "two_factor_enforced": {"$sum": "$two_factor_enforced"},
-                "total_repos": {"$sum": "$total_repos"},
-                "archived_repos": {"$sum": "$archived_repos"},
-                "repos_with_branch_protection": {"$sum": "$repos_with_branch_protection"},
-                "repos_with_secret_scanning": {"$sum": "$repos_with_secret_scanning"},
-                "repos_with_secret_scanning_push_protection": {"$sum": "$repos_with_secret_scanning_push_protection"},
-                "repos_with_dependabot_alerts": {"$sum": "$repos_with_dependabot_alerts"},
-                "repos_with_dependabot_security_updates": {"$sum": "$repos_with_dependabot_security_updates"},
-                "repos_with_private_vulnerability_reporting": {"$sum": "$repos_with_private_vulnerability_reporting"},
-            },
-        }
-    ]
+    model = await mongo.odm.find_one(
+        DashboardStatisticsModel,
+        DashboardStatisticsModel.key == _DASHBOARD_STATISTICS_KEY,
+    )
 
-    collection = mongo.odm.get_collection(StatisticsModel)
-    stats_list = await collection.aggregate(pipeline).to_list(1)
-    if stats_list is None or len(stats_list) == 0:
-        return Statistics()
-    else:
-        stats = stats_list[0]
-        return Statistics(
-            stats["total_projects"],
-            stats["two_factor_enforced"],
-            stats["total_repos"],
-            stats["archived_repos"],
-            stats["repos_with_branch_protection"],
-            stats["repos_with_secret_scanning"],
-            stats["repos_with_secret_scanning_push_protection"],
-            stats["repos_with_dependabot_alerts"],
-            stats["repos_with_dependabot_security_updates"],
-            stats["repos_with_private_vulnerability_reporting"],
-        )
+    if model is None:
+        model = await refresh_statistics()
+
+    return Statistics(
+        model.total_projects,
+        model.two_factor_enforced,
+        model.total_repos,
+        model.archived_repos,
+        model.repos_with_branch_protection,
+        model.repos_with_secret_scanning,
+        model.repos_with_secret_scanning_push_protection,
+        model.repos_with_dependabot_alerts,
+        model.repos_with_dependabot_security_updates,
+        model.repos_with_private_vulnerability_reporting,
+        model.open_or_incomplete_pull_requests,
+        model.merged_pull_requests,
+    )
 
 
 async def cleanup_statistics(valid_orgs: list[str]) -> None:
@@ -645,3 +880,112 @@ async def cleanup_policies_of_owner(owner: str, valid_types: list[str]) -> None:
     await mongo.odm.remove(
         PolicyModel, PolicyModel.id.org_id == owner, query.not_in(PolicyModel.id.policy_type, valid_types)
     )
+
+
+async def get_live_state_snapshot(
+    github_id: str,
+) -> tuple[LiveStateSnapshotModel, list[RepositorySnapshotModel]] | None:
+    snapshot_model = await mongo.odm.find_one(LiveStateSnapshotModel, LiveStateSnapshotModel.github_id == github_id)
+    if snapshot_model is None:
+        return None
+
+    repo_models = await mongo.odm.find(RepositorySnapshotModel, RepositorySnapshotModel.id.org_id == github_id)
+    return snapshot_model, repo_models
+
+
+async def save_live_state_snapshot(
+    snapshot_model: LiveStateSnapshotModel,
+    repo_models: list[RepositorySnapshotModel],
+) -> None:
+    await mongo.odm.remove(RepositorySnapshotModel, RepositorySnapshotModel.id.org_id == snapshot_model.github_id)
+    await mongo.odm.save_all(repo_models)
+    await mongo.odm.save(snapshot_model)
+
+
+async def update_live_state_snapshot(
+    snapshot_model: LiveStateSnapshotModel,
+    repo_models: list[RepositorySnapshotModel],
+    cleared_dirty_repos: list[str],
+) -> None:
+    await mongo.odm.remove(RepositorySnapshotModel, RepositorySnapshotModel.id.org_id == snapshot_model.github_id)
+    await mongo.odm.save_all(repo_models)
+
+    # keep repos that have been marked dirty concurrently, only clear the given ones
+    await mongo.odm.get_collection(LiveStateSnapshotModel).update_one(
+        {"_id": snapshot_model.github_id},
+        [
+            {
+                "$set": {
+                    "resources": snapshot_model.resources,
+                    "created_at": snapshot_model.created_at,
+                    "dirty_repos": {
+                        "$setUnion": [
+                            snapshot_model.dirty_repos,
+                            {"$setDifference": [{"$ifNull": ["$dirty_repos", []]}, cleared_dirty_repos]},
+                        ]
+                    },
+                }
+            }
+        ],
+        upsert=True,
+    )
+
+
+async def delete_live_state_snapshot(github_id: str) -> None:
+    await mongo.odm.remove(LiveStateSnapshotModel, LiveStateSnapshotModel.github_id == github_id)
+    await mongo.odm.remove(RepositorySnapshotModel, RepositorySnapshotModel.id.org_id == github_id)
+
+
+async def mark_repos_dirty_in_live_state_snapshot(github_id: str, repo_names: list[str]) -> None:
+    await mongo.odm.get_collection(LiveStateSnapshotModel).update_one(
+        {"_id": github_id},
+        {"$addToSet": {"dirty_repos": {"$each": repo_names}}},
+    )
+
+
+def create_repository_snapshot_model(
+    org_id: str,
+    repo_name: str,
+    updated_at: str | None,
+    pushed_at: str | None,
+    data: dict,
+    fetched_at: float,
+) -> RepositorySnapshotModel:
+    return RepositorySnapshotModel(
+        id=RepositorySnapshotId(org_id=org_id, repo_name=repo_name),
+        updated_at=updated_at,
+        pushed_at=pushed_at,
+        data=data,
+        fetched_at=fetched_at,
+    )
+
+
+async def _save_all(models: Sequence[Model]) -> None:
+    """
+    Saves multiple models of the same type with a single bulk write instead of a request per model.
+    """
+    updates = _get_bulk_updates(models)
+    if len(updates) == 0:
+        return
+
+    await mongo.odm.get_collection(type(models[0])).bulk_write(updates, ordered=False)
+
+    for model in models:
+        object.__setattr__(model, "__fields_modified__", set())
+
+
+def _get_bulk_updates(models: Sequence[Model]) -> list[UpdateOne]:
+    # similar to AIOEngine.save, only modified fields are written and unmodified models are skipped
+    updates = []
+    for model in models:
+        fields_to_update = model.__fields_modified__ | model.__mutable_fields__
+        if len(fields_to_update) > 0:
+            updates.append(
+                UpdateOne(
+                    model.model_dump_doc(include={model.__primary_field__}),
+                    {"$set": model.model_dump_doc(include=fields_to_update)},
+                    upsert=True,
+                )
+            )
+
+    return updates
@@ -0,0 +1,101 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from otterdog.snapshot import OrganizationSnapshot, RepositorySnapshot, SnapshotStore
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .models import LiveStateSnapshotModel, RepositorySnapshotModel
+
+
+def mongo_snapshot_store(max_age: int) -> SnapshotStore:
+    return _MongoSnapshotStore(max_age)
+
+
+class _MongoSnapshotStore(SnapshotStore):
+    """
+    Stores snapshots in the database, each repository is stored as separate document
+    to stay below the document size limit for large organizations.
+    """
+
+    async def load(self, github_id: str) -> OrganizationSnapshot | None:
+        from .service import get_live_state_snapshot
+
+        result = await get_live_state_snapshot(github_id)
+        if result is None:
+            return None
+
+        snapshot_model, repo_models = result
+        return OrganizationSnapshot(
+            snapshot_model.resources,
+            {
+                repo_model.id.repo_name: RepositorySnapshot(
+                    repo_model.updated_at, repo_model.pushed_at, repo_model.data, repo_model.fetched_at
+                )
+                for repo_model in repo_models
+            },
+            set(snapshot_model.dirty_repos),
+            snapshot_model.created_at,
+        )
+
+    async def save(self, github_id: str, snapshot: OrganizationSnapshot) -> None:
+        from .service import save_live_state_snapshot
+
+        await save_live_state_snapshot(*self._to_models(github_id, snapshot))
+
+    async def update(self, github_id: str, snapshot: OrganizationSnapshot, cleared_repos: Iterable[str]) -> None:
+        from .service import update_live_state_snapshot
+
+        await update_live_state_snapshot(*self._to_models(github_id, snapshot), list(cleared_repos))
+
+    @staticmethod
+    def _to_models(
+        github_id: str,
+        snapshot: OrganizationSnapshot,
+    ) -> tuple[LiveStateSnapshotModel, list[RepositorySnapshotModel]]:
+        from .models import LiveStateSnapshotModel
+        from .service import create_repository_snapshot_model
+
+        snapshot_model = LiveStateSnapshotModel(  # type: ignore
+            github_id=github_id,
+            resources=snapshot.resources,
+            dirty_repos=sorted(snapshot.dirty_repositories),
+            created_at=snapshot.created_at,
+        )
+
+        repo_models = [
+            create_repository_snapshot_model(
+                github_id,
+                repo_name,
+                repo_snapshot.updated_at,
+                repo_snapshot.pushed_at,
+                repo_snapshot.data,
+                repo_snapshot.fetched_at,
+            )
+            for repo_name, repo_snapshot in snapshot.repositories.items()
+        ]
+
+        return snapshot_model, repo_models
+
+    async def delete(self, github_id: str) -> None:
+        from .service import delete_live_state_snapshot
+
+        await delete_live_state_snapshot(github_id)
+
+    async def mark_dirty(self, github_id: str, repo_names: Iterable[str]) -> None:
+        from .service import mark_repos_dirty_in_live_state_snapshot
+
+        await mark_repos_dirty_in_live_state_snapshot(github_id, list(repo_names))
+
+    def __str__(self):
+        return f"mongo-snapshot-store(max_age={self.max_age})"
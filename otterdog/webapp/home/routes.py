@@ -24,13 +24,12 @@ from otterdog.models.github_organization import GitHubOrganization
 from otterdog.utils import associate_by_key
 from otterdog.webapp.db.service import (
     get_active_installations,
+    get_all_installations_count,
     get_configuration_by_github_id,
     get_configuration_by_project_name,
-    get_configurations,
+    get_configuration_summaries,
     get_installations,
-    get_merged_pull_requests_count,
     get_open_or_incomplete_pull_requests,
-    get_open_or_incomplete_pull_requests_count,
     get_statistics,
     get_tasks,
 )
@@ -51,9 +50,6 @@ async def static_from_root():
 
 @blueprint.route("/index")
 async def index():
-    installations = await get_installations()
-    configurations = await get_configurations()
-    configurations_by_key = associate_by_key(configurations, lambda x: x.github_id)
     stats = await get_statistics()
 
     two_factor_data = [
@@ -105,10 +101,9 @@ async def index():
 
     return await render_home_template(
         "index.html",
-        open_pull_request_count=await get_open_or_incomplete_pull_requests_count(),
-        merged_pull_request_count=await get_merged_pull_requests_count(),
-        installations=installations,
-        configurations=configurations_by_key,
+        open_pull_request_count=stats.open_or_incomplete_pull_requests,
+        merged_pull_request_count=stats.merged_pull_requests,
+        installation_count=await get_all_installations_count(),
         total_repository_count=stats.total_repos,
         active_repository_count=stats.active_repos,
         archived_repository_count=stats.archived_repos,
@@ -131,7 +126,7 @@ async def myprojects():
     projects = set(await current_user.projects)
 
     installations = list(filter(lambda x: x.project_name in projects, await get_installations()))
-    configurations = await get_configurations()
+    configurations = await get_configuration_summaries()
     configurations_by_key = associate_by_key(configurations, lambda x: x.github_id)
     return await render_home_template(
         "projects.html",
@@ -144,7 +139,7 @@ async def myprojects():
 @blueprint.route("/allprojects")
 async def allprojects():
     installations = await get_installations()
-    configurations = await get_configurations()
+    configurations = await get_configuration_summaries()
     configurations_by_key = associate_by_key(configurations, lambda x: x.github_id)
     return await render_home_template(
         "projects.html",
@@ -14,12 +14,12 @@ from logging import getLogger
 from typing import TYPE_CHECKING
 
 from pydantic import BaseModel
-from quart import current_app
 
 from otterdog.models.github_organization import GitHubOrganization
 from otterdog.webapp.db.service import get_configuration_by_github_id, get_installation_by_github_id
 from otterdog.webapp.policies import Policy, PolicyType
 from otterdog.webapp.tasks.check_file import CheckFileTask
+from otterdog.webapp.tasks.queue import queue_task
 
 if TYPE_CHECKING:
     from otterdog.models.repository import Repository
@@ -69,7 +69,7 @@ class RequiredFilePolicy(Policy):
                     title = f"Adding required file {required_file.path}"
                     body = "This PR has been automatically created by otterdog due to a violated policy."
 
-                    current_app.add_background_task(
+                    queue_task(
                         CheckFileTask(
                             installation.installation_id,
                             github_id,
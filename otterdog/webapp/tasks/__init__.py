@@ -9,15 +9,22 @@
 from __future__ import annotations
 
 import contextlib
+import dataclasses
+import importlib
+import pkgutil
 from abc import ABC, abstractmethod
+from enum import IntEnum
 from functools import cached_property
 from logging import Logger, getLogger
-from typing import TYPE_CHECKING, Any, Generic, Protocol, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, Protocol, TypeVar, get_type_hints
 
 import aiofiles
-from quart import current_app
+from pydantic import TypeAdapter
 
 from otterdog.config import OrganizationConfig
+from otterdog.providers.github.graphql import GraphQLClient  # noqa: TCH001 (resolved by get_type_hints)
+from otterdog.providers.github.rest import RestApi  # noqa: TCH001 (resolved by get_type_hints)
+from otterdog.providers.github.rest.prefetch import prefetch_scope
 from otterdog.providers.github.stats import RequestStatistics
 from otterdog.webapp.db.service import (
     create_task,
@@ -27,23 +34,69 @@ from otterdog.webapp.db.service import (
     schedule_task,
 )
 from otterdog.webapp.utils import (
+    get_account_key_for_installation,
     get_graphql_api_for_installation,
     get_rest_api_for_installation,
     get_temporary_base_directory,
+    release_installation_client,
 )
 
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator, Iterable
 
     from otterdog.providers.github import GitHubProvider
-    from otterdog.providers.github.graphql import GraphQLClient
-    from otterdog.providers.github.rest import RestApi
     from otterdog.webapp.db.models import InstallationModel, TaskModel
 
 T = TypeVar("T")
 
+# task types by name, used to restore queued tasks
+_TASK_TYPES: dict[str, type[Task]] = {}
+
+
+class TaskPriority(IntEnum):
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
 
 class Task(ABC, Generic[T]):
+    # queued tasks with a higher priority are executed first
+    priority = TaskPriority.NORMAL
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _TASK_TYPES[cls.__name__] = cls
+
+    def to_json(self) -> dict[str, Any]:
+        """
+        Returns the parameters of this task as json, the task can be restored from them using from_json.
+        """
+        return {
+            name: TypeAdapter(field_type).dump_python(getattr(self, name), mode="json")
+            for name, field_type in self._get_field_types().items()
+        }
+
+    @classmethod
+    def from_json(cls, params: dict[str, Any]) -> Task:
+        field_types = cls._get_field_types()
+        # parameters of fields that have been removed in the meantime are ignored
+        return cls(
+            **{
+                name: TypeAdapter(field_types[name]).validate_python(value)
+                for name, value in params.items()
+                if name in field_types
+            }
+        )
+
+    @classmethod
+    def _get_field_types(cls) -> dict[str, Any]:
+        if not dataclasses.is_dataclass(cls):
+            raise TypeError(f"task type '{cls.__name__}' is not a dataclass and can not be serialized")
+
+        # annotations are postponed in some modules, resolve them in the namespace of the module
+        type_hints = get_type_hints(cls)
+        return {field.name: type_hints[field.name] for field in dataclasses.fields(cls) if field.init}
+
     @cached_property
     def logger(self) -> Logger:
         return getLogger(type(self).__name__)
@@ -51,10 +104,21 @@ class Task(ABC, Generic[T]):
     def create_task_model(self) -> TaskModel | None:
         return None
 
+    def get_coalescing_key(self) -> str | None:
+        """
+        Returns a key to coalesce queued tasks, only the most recently queued task with the same key is executed.
+        """
+        return None
+
     async def __call__(self, *args, **kwargs):
         await self.execute()
 
     async def execute(self) -> T | None:
+        # sub-resources are only memoized for the duration of a single task
+        with prefetch_scope():
+            return await self._execute_task()
+
+    async def _execute_task(self) -> T | None:
         self.logger.debug(f"executing task '{self!r}'")
 
         task_model = self.create_task_model()
@@ -108,6 +172,22 @@ class Task(ABC, Generic[T]):
         pass
 
 
+def create_task_from_json(task_type: str, params: dict[str, Any]) -> Task:
+    """
+    Restores a task of the given type from the parameters returned by Task.to_json.
+    """
+    if task_type not in _TASK_TYPES:
+        # task types are registered when their module is imported, some modules are only imported on demand
+        for module in pkgutil.iter_modules(__path__):
+            importlib.import_module(f"{__name__}.{module.name}")
+
+    cls = _TASK_TYPES.get(task_type)
+    if cls is None:
+        raise RuntimeError(f"unknown task type '{task_type}'")
+
+    return cls.from_json(params)
+
+
 class InstallationBasedTask(Protocol):
     installation_id: int
 
@@ -117,10 +197,15 @@ class InstallationBasedTask(Protocol):
     __rest_statistics: RequestStatistics | None = None
     __graphql_statistics: RequestStatistics | None = None
 
+    # the clients are shared, keep track of their statistics when acquired to report only requests of this task
+    __rest_api_start_statistics: RequestStatistics | None = None
+    __graphql_api_start_statistics: RequestStatistics | None = None
+
     @property
     async def rest_api(self) -> RestApi:
         if self.__rest_api is None:
             self.__rest_api = await get_rest_api_for_installation(self.installation_id)
+            self.__rest_api_start_statistics = dataclasses.replace(self.__rest_api.statistics)
         return self.__rest_api
 
     @property
@@ -139,6 +224,7 @@ class InstallationBasedTask(Protocol):
     async def graphql_api(self) -> GraphQLClient:
         if self.__graphql_api is None:
             self.__graphql_api = await get_graphql_api_for_installation(self.installation_id)
+            self.__graphql_api_start_statistics = dataclasses.replace(self.__graphql_api.statistics)
         return self.__graphql_api
 
     def _merge_rest_statistics(self, other: RequestStatistics) -> None:
@@ -153,10 +239,12 @@ class InstallationBasedTask(Protocol):
 
     def _update_task_model(self, task: TaskModel) -> None:
         if self.__rest_api is not None:
-            self._merge_rest_statistics(self.__rest_api.statistics)
+            assert self.__rest_api_start_statistics is not None
+            self._merge_rest_statistics(self.__rest_api.statistics.since(self.__rest_api_start_statistics))
 
         if self.__graphql_api is not None:
-            self._merge_graphql_statistics(self.__graphql_api.statistics)
+            assert self.__graphql_api_start_statistics is not None
+            self._merge_graphql_statistics(self.__graphql_api.statistics.since(self.__graphql_api_start_statistics))
 
         if self.rest_statistics.total_requests == 0:
             cache_stats = "rest: no requests"
@@ -184,6 +272,16 @@ class InstallationBasedTask(Protocol):
         task.cache_stats = cache_stats
         task.rate_limit_remaining = rate_limit
 
+    async def _cleanup(self) -> None:
+        # the clients are shared, release them to allow closing them once they are idle
+        if self.__rest_api is not None:
+            release_installation_client(self.installation_id)
+            self.__rest_api = None
+
+        if self.__graphql_api is not None:
+            release_installation_client(self.installation_id)
+            self.__graphql_api = None
+
     # Ignore pycharm warning:
     # https://youtrack.jetbrains.com/issue/PY-66517/False-unexpected-argument-with-asynccontextmanager-defined-as-a-method
     @contextlib.asynccontextmanager
@@ -244,8 +342,9 @@ class InstallationBasedTask(Protocol):
 
     def schedule_automerge_task(self, org_id: str, repo_name: str, pull_request_number: int) -> None:
         from .auto_merge_comment import AutoMergeCommentTask
+        from .queue import queue_task
 
-        current_app.add_background_task(
+        queue_task(
             AutoMergeCommentTask(
                 self.installation_id,
                 org_id,
@@ -254,13 +353,6 @@ class InstallationBasedTask(Protocol):
             )
         )
 
-    async def _cleanup(self) -> None:
-        if self.__rest_api is not None:
-            await self.__rest_api.close()
-
-        if self.__graphql_api is not None:
-            await self.__graphql_api.close()
-
 
 async def get_organization_config(org_model: InstallationModel, token: str, work_dir: str) -> OrganizationConfig:
     assert org_model.project_name is not None
@@ -272,7 +364,11 @@ async def get_organization_config(org_model: InstallationModel, token: str, work
         org_model.github_id,
         org_model.config_repo,
         org_model.base_template,
-        {"provider": "inmemory", "api_token": token},
+        {
+            "provider": "inmemory",
+            "api_token": token,
+            "account": get_account_key_for_installation(org_model.installation_id),
+        },
         work_dir,
     )
 
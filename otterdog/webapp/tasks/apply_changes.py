@@ -15,7 +15,7 @@ from otterdog.operations.local_apply import LocalApplyOperation
 from otterdog.utils import IndentingPrinter, LogLevel
 from otterdog.webapp.db.models import ApplyStatus, TaskModel
 from otterdog.webapp.db.service import find_pull_request, update_pull_request
-from otterdog.webapp.tasks import InstallationBasedTask, Task
+from otterdog.webapp.tasks import InstallationBasedTask, Task, TaskPriority
 from otterdog.webapp.utils import (
     escape_for_github,
     fetch_config_from_github,
@@ -43,6 +43,8 @@ class ApplyChangesTask(InstallationBasedTask, Task[ApplyResult]):
     pull_request_or_number: PullRequest | int
     author: str | None = None
 
+    priority = TaskPriority.HIGH
+
     @property
     def pull_request_number(self) -> int:
         return (
@@ -22,7 +22,7 @@ from otterdog.webapp.db.service import (
     get_latest_sync_task_for_organization,
     update_or_create_pull_request,
 )
-from otterdog.webapp.tasks import InstallationBasedTask, Task
+from otterdog.webapp.tasks import InstallationBasedTask, Task, TaskPriority
 from otterdog.webapp.utils import (
     backoff_if_needed,
     current_utc_time,
@@ -48,6 +48,8 @@ class CheckConfigurationInSyncTask(InstallationBasedTask, Task[bool]):
     repo_name: str
     pull_request_or_number: PullRequest | int
 
+    priority = TaskPriority.LOW
+
     @property
     def pull_request_number(self) -> int:
         return (
@@ -70,6 +72,10 @@ class CheckConfigurationInSyncTask(InstallationBasedTask, Task[bool]):
             pull_request=self.pull_request_number,
         )
 
+    def get_coalescing_key(self) -> str | None:
+        # only check the most recent state of a pull request
+        return f"{type(self).__name__}:{self.org_id}/{self.repo_name}#{self.pull_request_number}"
+
     async def _pre_execute(self) -> bool:
         self.logger.info(
             "checking if base ref is in sync for pull request #%d of repo '%s/%s'",
@@ -157,8 +163,6 @@ class CheckConfigurationInSyncTask(InstallationBasedTask, Task[bool]):
             output = StringIO()
             printer = IndentingPrinter(output, log_level=LogLevel.ERROR)
             operation = PlanOperation(True, "*", False, False, "")
-            # set concurrency to 20 to avoid hitting secondary rate limits with installation tokens
-            operation.concurrency = 20
 
             config_in_sync = True
 
@@ -6,13 +6,17 @@
 #  SPDX-License-Identifier: EPL-2.0
 #  *******************************************************************************
 
+from contextlib import aclosing
 from dataclasses import dataclass
 
 from otterdog.webapp.db.models import ApplyStatus, TaskModel
-from otterdog.webapp.db.service import update_or_create_pull_request
+from otterdog.webapp.db.service import update_or_create_pull_requests
 from otterdog.webapp.tasks import InstallationBasedTask, Task
 from otterdog.webapp.webhook.github_models import PullRequest
 
+# number of pull requests that are stored at once
+_BATCH_SIZE = 100
+
 
 @dataclass(repr=False)
 class FetchAllPullRequestsTask(InstallationBasedTask, Task[None]):
@@ -36,23 +40,27 @@ class FetchAllPullRequestsTask(InstallationBasedTask, Task[None]):
 
         rest_api = await self.rest_api
 
-        all_pull_requests = await rest_api.pull_request.get_pull_requests(
-            self.org_id, self.repo_name, state="all", base_ref="main"
-        )
+        pull_requests: list[tuple[PullRequest, ApplyStatus | None]] = []
+
+        # store pull requests in batches while the remaining pages are still being retrieved,
+        # pending page requests are cancelled right away if storing them fails.
+        async with aclosing(
+            rest_api.pull_request.iter_pull_requests(self.org_id, self.repo_name, state="all", base_ref="main")
+        ) as prs:
+            async for pr in prs:
+                pr_from_github = PullRequest.model_validate(pr)
 
-        for pr in all_pull_requests:
-            pr_from_github = PullRequest.model_validate(pr)
+                # when importing already closed PRs we consider them being applied already
+                pr_status = pr_from_github.get_pr_status()
+                apply_status = ApplyStatus.COMPLETED if pr_status == "MERGED" else None
 
-            # when importing already closed PRs we consider them being applied already
-            pr_status = pr_from_github.get_pr_status()
-            apply_status = ApplyStatus.COMPLETED if pr_status == "MERGED" else None
+                pull_requests.append((pr_from_github, apply_status))
+                if len(pull_requests) >= _BATCH_SIZE:
+                    await update_or_create_pull_requests(self.org_id, self.repo_name, pull_requests)
+                    pull_requests = []
 
-            await update_or_create_pull_request(
-                self.org_id,
-                self.repo_name,
-                pr_from_github,
-                apply_status=apply_status,
-            )
+        if len(pull_requests) > 0:
+            await update_or_create_pull_requests(self.org_id, self.repo_name, pull_requests)
 
     def __repr__(self) -> str:
         return f"FetchAllPullRequestsTask(repo='{self.org_id}/{self.repo_name}')"
@@ -7,6 +7,7 @@
 #  *******************************************************************************
 
 from dataclasses import dataclass
+from typing import Any
 
 from otterdog.models.github_organization import GitHubOrganization
 from otterdog.utils import jsonnet_evaluate_file
@@ -58,52 +59,58 @@ class FetchConfigTask(InstallationBasedTask, Task[None]):
             )
             await save_config(config)
 
-            # save statistics
-            github_organization = GitHubOrganization.from_model_data(config_data)
-
-            archived_repos = 0
-            repos_with_branch_protections = 0
-            repos_with_secret_scanning = 0
-            repos_with_secret_scanning_push_protection = 0
-            repos_with_dependabot_alerts = 0
-            repos_with_dependabot_security_updates = 0
-            repos_with_private_vulnerability_reporting = 0
-
-            for repo in github_organization.repositories:
-                if repo.archived is True:
-                    archived_repos += 1
-                    continue
-
-                if repo.private_vulnerability_reporting_enabled is True:
-                    repos_with_private_vulnerability_reporting += 1
-
-                if repo.dependabot_security_updates_enabled is True:
-                    repos_with_dependabot_security_updates += 1
-                elif repo.dependabot_alerts_enabled is True:
-                    repos_with_dependabot_alerts += 1
-
-                if len(repo.branch_protection_rules) > 0 or len(repo.rulesets) > 0:
-                    repos_with_branch_protections += 1
-
-                if repo.secret_scanning_push_protection == "enabled":
-                    repos_with_secret_scanning_push_protection += 1
-                elif repo.secret_scanning == "enabled":
-                    repos_with_secret_scanning += 1
-
-            statistics = StatisticsModel(  # type: ignore
-                project_name=org_config.name,
-                github_id=self.org_id,
-                two_factor_enforced=1 if github_organization.settings.two_factor_requirement is True else 0,
-                total_repos=len(github_organization.repositories),
-                archived_repos=archived_repos,
-                repos_with_branch_protection=repos_with_branch_protections,
-                repos_with_private_vulnerability_reporting=repos_with_private_vulnerability_reporting,
-                repos_with_secret_scanning=repos_with_secret_scanning,
-                repos_with_secret_scanning_push_protection=repos_with_secret_scanning_push_protection,
-                repos_with_dependabot_alerts=repos_with_dependabot_alerts,
-                repos_with_dependabot_security_updates=repos_with_dependabot_security_updates,
-            )
-            await save_statistics(statistics)
+            # save statistics, reporting invalid configs as failure
+            GitHubOrganization.validate_config(config_data)
+            await save_statistics(_get_statistics(org_config.name, self.org_id, config_data))
 
     def __repr__(self) -> str:
         return f"FetchConfigTask(repo='{self.org_id}/{self.repo_name}')"
+
+
+def _get_statistics(project_name: str, github_id: str, config_data: dict[str, Any]) -> StatisticsModel:
+    # only a few settings are needed, read them from the config data instead of loading the whole organization
+    archived_repos = 0
+    repos_with_branch_protections = 0
+    repos_with_secret_scanning = 0
+    repos_with_secret_scanning_push_protection = 0
+    repos_with_dependabot_alerts = 0
+    repos_with_dependabot_security_updates = 0
+    repos_with_private_vulnerability_reporting = 0
+
+    repositories = config_data.get("repositories", [])
+    for repo in repositories:
+        if repo.get("archived") is True:
+            archived_repos += 1
+            continue
+
+        if repo.get("private_vulnerability_reporting_enabled") is True:
+            repos_with_private_vulnerability_reporting += 1
+
+        if repo.get("dependabot_security_updates_enabled") is True:
+            repos_with_dependabot_security_updates += 1
+        elif repo.get("dependabot_alerts_enabled") is True:
+            repos_with_dependabot_alerts += 1
+
+        if len(repo.get("branch_protection_rules", [])) > 0 or len(repo.get("rulesets", [])) > 0:
+            repos_with_branch_protections += 1
+
+        if repo.get("secret_scanning_push_protection") == "enabled":
+            repos_with_secret_scanning_push_protection += 1
+        elif repo.get("secret_scanning") == "enabled":
+            repos_with_secret_scanning += 1
+
+    two_factor_requirement = config_data.get("settings", {}).get("two_factor_requirement")
+
+    return StatisticsModel(  # type: ignore
+        project_name=project_name,
+        github_id=github_id,
+        two_factor_enforced=1 if two_factor_requirement is True else 0,
+        total_repos=len(repositories),
+        archived_repos=archived_repos,
+        repos_with_branch_protection=repos_with_branch_protections,
+        repos_with_private_vulnerability_reporting=repos_with_private_vulnerability_reporting,
+        repos_with_secret_scanning=repos_with_secret_scanning,
+        repos_with_secret_scanning_push_protection=repos_with_secret_scanning_push_protection,
+        repos_with_dependabot_alerts=repos_with_dependabot_alerts,
+        repos_with_dependabot_security_updates=repos_with_dependabot_security_updates,
+    )
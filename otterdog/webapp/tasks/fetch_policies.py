@@ -7,6 +7,7 @@
 #  *******************************************************************************
 
 from dataclasses import dataclass
+from typing import Any
 
 from otterdog.providers.github.rest import RestApi
 from otterdog.utils import print_error
@@ -15,7 +16,7 @@ from otterdog.webapp.db.service import (
     cleanup_policies_of_owner,
     update_or_create_policy,
 )
-from otterdog.webapp.policies import Policy, PolicyType
+from otterdog.webapp.policies import Policy, PolicyType, read_policy
 from otterdog.webapp.tasks import InstallationBasedTask, Task
 
 
@@ -26,6 +27,26 @@ class FetchPoliciesTask(InstallationBasedTask, Task[None]):
     repo_name: str
     global_policies: list[Policy]
 
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "installation_id": self.installation_id,
+            "org_id": self.org_id,
+            "repo_name": self.repo_name,
+            # policies are polymorphic, keep their type to restore them
+            "global_policies": [
+                {"type": policy.type.value, "config": policy.model_dump(mode="json")} for policy in self.global_policies
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, params: dict[str, Any]) -> Task:
+        return cls(
+            params["installation_id"],
+            params["org_id"],
+            params["repo_name"],
+            [read_policy(policy) for policy in params["global_policies"]],
+        )
+
     def create_task_model(self):
         return TaskModel(
             type=type(self).__name__,
@@ -60,8 +81,6 @@ async def fetch_policies(
 ) -> dict[PolicyType, Policy]:
     import yaml
 
-    from otterdog.webapp.policies import read_policy
-
     config_file_path = "otterdog/policies"
     policies = {p.type: p for p in global_policies}
     try:
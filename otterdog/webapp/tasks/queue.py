@@ -0,0 +1,351 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import uuid
+from logging import getLogger
+from typing import TYPE_CHECKING, Any
+
+from quart import current_app
+from quart_redis import get_redis  # type: ignore
+
+from otterdog.webapp.tasks import create_task_from_json
+
+if TYPE_CHECKING:
+    from quart import Quart
+
+    from otterdog.webapp.tasks import Task
+
+logger = getLogger(__name__)
+
+_KEY_PREFIX = "otterdog:tasks"
+
+# queued task ids ordered by priority and time of queuing
+_QUEUE_KEY = f"{_KEY_PREFIX}:queue"
+# json encoded type and parameters of tasks by id
+_DATA_KEY = f"{_KEY_PREFIX}:data"
+# json encoded metadata of tasks by id
+_META_KEY = f"{_KEY_PREFIX}:meta"
+# the id of the most recently queued task by coalescing key
+_COALESCE_KEY = f"{_KEY_PREFIX}:keys"
+# ids of tasks being processed ordered by the time of their last heartbeat
+_PROCESSING_KEY = f"{_KEY_PREFIX}:processing"
+# number of tasks being processed by organization
+_RUNNING_KEY = f"{_KEY_PREFIX}:running"
+# coalescing keys of tasks being processed
+_ACTIVE_KEY = f"{_KEY_PREFIX}:active"
+
+# the number of queued tasks to look at when claiming a task
+_CLAIM_WINDOW = 100
+
+# the number of seconds between heartbeats of tasks being processed
+_HEARTBEAT_INTERVAL = 30
+
+# the number of seconds without a heartbeat after which a task is considered lost, e.g. due to a restart
+_PROCESSING_TIMEOUT = 300
+
+# the number of seconds between checks for lost tasks
+_RECOVERY_INTERVAL = 60
+
+# the number of seconds to wait for new tasks before polling the queue again
+_POLL_INTERVAL = 1
+
+_ENQUEUE_SCRIPT = """
+local queue, data, meta, keys = KEYS[1], KEYS[2], KEYS[3], KEYS[4]
+local id, score, payload, metadata, key = ARGV[1], ARGV[2], ARGV[3], ARGV[4], ARGV[5]
+
+if key ~= "" then
+    local previous = redis.call("HGET", keys, key)
+    if previous and redis.call("ZREM", queue, previous) == 1 then
+        redis.call("HDEL", data, previous)
+        redis.call("HDEL", meta, previous)
+    end
+    redis.call("HSET", keys, key, id)
+end
+
+redis.call("HSET", data, id, payload)
+redis.call("HSET", meta, id, metadata)
+redis.call("ZADD", queue, score, id)
+"""
+
+_CLAIM_SCRIPT = """
+local queue, meta, processing, running, active = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5]
+local now, limit, window = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3])
+
+for _, id in ipairs(redis.call("ZRANGE", queue, 0, window - 1)) do
+    local encoded = redis.call("HGET", meta, id)
+    if not encoded then
+        -- the task has been removed, e.g. by completing it after it has been queued again
+        redis.call("ZREM", queue, id)
+    else
+        local metadata = cjson.decode(encoded)
+        local org_running = tonumber(redis.call("HGET", running, metadata.org) or "0")
+
+        if org_running < limit and (metadata.key == "" or redis.call("SISMEMBER", active, metadata.key) == 0) then
+            redis.call("ZREM", queue, id)
+            redis.call("ZADD", processing, now, id)
+            redis.call("HINCRBY", running, metadata.org, 1)
+            if metadata.key ~= "" then
+                redis.call("SADD", active, metadata.key)
+            end
+            return id
+        end
+    end
+end
+
+return false
+"""
+
+_COMPLETE_SCRIPT = """
+local processing, running, active, data, meta, keys, queue = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5], KEYS[6], KEYS[7]
+local id = ARGV[1]
+
+if redis.call("ZREM", processing, id) == 1 then
+    local encoded = redis.call("HGET", meta, id)
+    if encoded then
+        local metadata = cjson.decode(encoded)
+        redis.call("HINCRBY", running, metadata.org, -1)
+        if metadata.key ~= "" then
+            redis.call("SREM", active, metadata.key)
+            if redis.call("HGET", keys, metadata.key) == id then
+                redis.call("HDEL", keys, metadata.key)
+            end
+        end
+    end
+elseif redis.call("ZSCORE", queue, id) then
+    -- the task has been considered lost and queued again, keep it
+    return 0
+end
+
+redis.call("HDEL", data, id)
+redis.call("HDEL", meta, id)
+return 1
+"""
+
+_RECOVER_SCRIPT = """
+local processing, queue, meta, running, active = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5]
+local deadline = ARGV[1]
+
+local recovered = 0
+for _, id in ipairs(redis.call("ZRANGEBYSCORE", processing, "-inf", deadline)) do
+    redis.call("ZREM", processing, id)
+
+    local encoded = redis.call("HGET", meta, id)
+    if encoded then
+        local metadata = cjson.decode(encoded)
+        redis.call("HINCRBY", running, metadata.org, -1)
+        if metadata.key ~= "" then
+            redis.call("SREM", active, metadata.key)
+        end
+        redis.call("ZADD", queue, metadata.score, id)
+        recovered = recovered + 1
+    end
+end
+
+return recovered
+"""
+
+
+class TaskQueue:
+    """
+    A durable task queue backed by redis that is shared by all processes of the app.
+
+    Tasks are executed by priority and in the order they have been queued. Queuing a task
+    replaces an already queued task with the same coalescing key, e.g. validating the same
+    pull request, and tasks with the same coalescing key are never executed concurrently.
+    The number of tasks that are executed concurrently for the same organization is limited.
+
+    Processes send a regular heartbeat for the tasks they are executing. Tasks that have
+    been claimed by a process but did not send a heartbeat in time, e.g. because the
+    process was restarted, are queued again.
+    """
+
+    def __init__(self, max_workers: int, max_tasks_per_org: int):
+        self._max_workers = max_workers
+        self._max_tasks_per_org = max_tasks_per_org
+        self._workers = asyncio.Semaphore(max_workers)
+        self._new_task = asyncio.Event()
+        self._stopped = False
+
+    async def enqueue(self, task: Task, payload: str | None = None) -> None:
+        if payload is None:
+            payload = serialize_task(task)
+
+        task_id = uuid.uuid4().hex
+        # order by priority first and then by the time a task has been queued
+        score = int(task.priority) * 10**13 + int(time.time() * 1000)
+        key = task.get_coalescing_key() or ""
+        metadata = {
+            # tasks not related to a specific organization share a common limit
+            "org": getattr(task, "org_id", ""),
+            "key": key,
+            "score": score,
+        }
+
+        try:
+            await self._eval(
+                _ENQUEUE_SCRIPT,
+                [_QUEUE_KEY, _DATA_KEY, _META_KEY, _COALESCE_KEY],
+                [task_id, score, payload, json.dumps(metadata), key],
+            )
+        except Exception:
+            logger.exception(f"failed to queue task '{task!r}', executing it directly")
+            current_app.add_background_task(task)
+            return
+
+        logger.debug(f"queued task '{task!r}' with id '{task_id}'")
+        self._new_task.set()
+
+    async def run(self) -> None:
+        next_recovery = 0.0
+
+        while not self._stopped:
+            try:
+                if time.monotonic() >= next_recovery:
+                    await self._recover_lost_tasks()
+                    next_recovery = time.monotonic() + _RECOVERY_INTERVAL
+
+                await self._workers.acquire()
+                try:
+                    task_id = await self._claim()
+                except Exception:
+                    self._workers.release()
+                    raise
+
+                if task_id is None:
+                    self._workers.release()
+                    await self._wait_for_new_task()
+                    continue
+
+                current_app.add_background_task(self._execute, task_id)
+            except Exception:
+                logger.exception("failed to process task queue")
+                await asyncio.sleep(_POLL_INTERVAL)
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._new_task.set()
+
+    async def _execute(self, task_id: str) -> None:
+        heartbeat = asyncio.create_task(self._send_heartbeats(task_id))
+
+        try:
+            payload = await get_redis().hget(_DATA_KEY, task_id)
+            if payload is not None:
+                task = deserialize_task(payload)
+                logger.debug(f"executing queued task '{task!r}' with id '{task_id}'")
+                await task.execute()
+        except Exception:
+            logger.exception(f"failed to execute queued task with id '{task_id}'")
+        finally:
+            heartbeat.cancel()
+            self._workers.release()
+            await self._complete(task_id)
+            # completing a task might allow another queued task of the same organization to be claimed
+            self._new_task.set()
+
+    @staticmethod
+    async def _send_heartbeats(task_id: str) -> None:
+        while True:
+            await asyncio.sleep(_HEARTBEAT_INTERVAL)
+
+            try:
+                # only refresh tasks that are still being processed, never add them again
+                await get_redis().zadd(_PROCESSING_KEY, {task_id: time.time()}, xx=True)
+            except Exception:
+                logger.warning(f"failed to send heartbeat for queued task with id '{task_id}'", exc_info=True)
+
+    async def _claim(self) -> str | None:
+        task_id = await self._eval(
+            _CLAIM_SCRIPT,
+            [_QUEUE_KEY, _META_KEY, _PROCESSING_KEY, _RUNNING_KEY, _ACTIVE_KEY],
+            [time.time(), self._max_tasks_per_org, _CLAIM_WINDOW],
+        )
+
+        if task_id is None:
+            return None
+        elif isinstance(task_id, bytes):
+            return task_id.decode("utf-8")
+        else:
+            return task_id
+
+    async def _complete(self, task_id: str) -> None:
+        await self._eval(
+            _COMPLETE_SCRIPT,
+            [_PROCESSING_KEY, _RUNNING_KEY, _ACTIVE_KEY, _DATA_KEY, _META_KEY, _COALESCE_KEY, _QUEUE_KEY],
+            [task_id],
+        )
+
+    async def _recover_lost_tasks(self) -> None:
+        recovered = await self._eval(
+            _RECOVER_SCRIPT,
+            [_PROCESSING_KEY, _QUEUE_KEY, _META_KEY, _RUNNING_KEY, _ACTIVE_KEY],
+            [time.time() - _PROCESSING_TIMEOUT],
+        )
+
+        if recovered:
+            logger.warning(f"queued {recovered} lost task(s) again")
+
+    async def _wait_for_new_task(self) -> None:
+        # tasks might also be queued by other processes, poll the queue regularly
+        try:
+            await asyncio.wait_for(self._new_task.wait(), timeout=_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._new_task.clear()
+
+    @staticmethod
+    async def _eval(script: str, keys: list[str], args: list[Any]) -> Any:
+        return await get_redis().eval(script, len(keys), *keys, *args)
+
+
+def serialize_task(task: Task) -> str:
+    # tasks are restored by type from their parameters, never from arbitrary data stored in redis
+    return json.dumps({"type": type(task).__name__, "params": task.to_json()})
+
+
+def deserialize_task(payload: str | bytes) -> Task:
+    data = json.loads(payload)
+    return create_task_from_json(data["type"], data["params"])
+
+
+_TASK_QUEUE: TaskQueue | None = None
+
+
+def init_task_queue(app: Quart) -> None:
+    global _TASK_QUEUE
+
+    task_queue = TaskQueue(app.config["TASK_QUEUE_WORKERS"], app.config["TASK_QUEUE_TASKS_PER_ORG"])
+
+    @app.before_serving
+    async def start_task_queue():
+        global _TASK_QUEUE
+
+        _TASK_QUEUE = task_queue
+        app.add_background_task(task_queue.run)
+
+    @app.after_serving
+    async def stop_task_queue():
+        task_queue.stop()
+
+
+def queue_task(task: Task) -> None:
+    """
+    Queues a task for execution, the task is executed directly if no task queue is available.
+    """
+    if _TASK_QUEUE is None:
+        current_app.add_background_task(task)
+    else:
+        # serialize the task right away, tasks that can not be queued are a programming error
+        payload = serialize_task(task)
+        current_app.add_background_task(_TASK_QUEUE.enqueue, task, payload)
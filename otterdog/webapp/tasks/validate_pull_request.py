@@ -74,6 +74,10 @@ class ValidatePullRequestTask(InstallationBasedTask, Task[ValidationResult]):
             pull_request=self.pull_request_number,
         )
 
+    def get_coalescing_key(self) -> str | None:
+        # only validate the most recent state of a pull request
+        return f"{type(self).__name__}:{self.org_id}/{self.repo_name}#{self.pull_request_number}"
+
     async def _pre_execute(self) -> bool:
         if isinstance(self.pull_request_or_number, int):
             rest_api = await self.rest_api
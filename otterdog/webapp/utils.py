@@ -7,9 +7,11 @@
 #  *******************************************************************************
 
 import asyncio
+import dataclasses
 import os.path
 import re
 import sys
+import time
 from datetime import datetime, timedelta
 from functools import cache
 from logging import getLogger
@@ -21,10 +23,12 @@ from quart_redis import get_redis  # type: ignore
 
 from otterdog.cache import get_github_cache
 from otterdog.config import OtterdogConfig
-from otterdog.providers.github.auth import app_auth, token_auth
+from otterdog.providers.github.auth import app_auth, refreshable_token_auth, token_auth
+from otterdog.providers.github.auth.token import RefreshableTokenAuthStrategy
 from otterdog.providers.github.cache.ghproxy import ghproxy_cache
 from otterdog.providers.github.cache.redis import redis_cache
 from otterdog.providers.github.graphql import GraphQLClient
+from otterdog.providers.github.rate_limit import get_shared_rate_limiter
 from otterdog.providers.github.rest import RestApi
 from otterdog.utils import print_error
 from otterdog.webapp.policies import Policy, read_policy
@@ -36,9 +40,29 @@ _CREATE_INSTALLATION_TOKEN_LOCK = asyncio.Lock()
 
 _GLOBAL_POLICIES: list[Policy] | None = None
 
+# the number of seconds after which the clients of an installation that are not checked out anymore are closed
+_INSTALLATION_CLIENTS_IDLE_TIMEOUT = 30 * 60
+
+
+@dataclasses.dataclass
+class _InstallationClients:
+    auth: RefreshableTokenAuthStrategy
+    rest_api: RestApi
+    graphql_api: GraphQLClient
+    last_used: float
+    # the number of times the clients have been checked out and not released yet, e.g. by running tasks
+    checkouts: int = 0
+
+    async def close(self) -> None:
+        await self.rest_api.close()
+        await self.graphql_api.close()
+
+
+_INSTALLATION_CLIENTS: dict[int, _InstallationClients] = {}
+
 
 def get_github_redis_cache(app_config):
-    return redis_cache(app_config["REDIS_URI"], get_redis())
+    return redis_cache(app_config["REDIS_URI"], get_redis(), app_config["CACHE_MAX_STALE"])
 
 
 def get_github_ghproxy_cache(app_config):
@@ -51,6 +75,11 @@ async def close_rest_apis():
         logger.debug("closing rest api for app")
         await get_rest_api_for_app().close()
 
+    while len(_INSTALLATION_CLIENTS) > 0:
+        installation_id, clients = _INSTALLATION_CLIENTS.popitem()
+        logger.debug(f"closing clients for installation '{installation_id}'")
+        await clients.close()
+
 
 @cache
 def get_rest_api_for_app() -> RestApi:
@@ -90,18 +119,86 @@ async def get_token_for_installation(installation_id: int) -> tuple[str, datetim
         return token, expires_at
 
 
+def get_account_key_for_installation(installation_id: int) -> str:
+    """
+    Returns the key of the account that is used to share the rate limits of an installation,
+    which stays the same when its installation token is refreshed.
+    """
+    return f"installation:{installation_id}"
+
+
 def decode_bytes_dict(data: dict[bytes, bytes]) -> dict[str, str]:
     return {k.decode("utf-8"): v.decode("utf-8") for k, v in data.items()}
 
 
 async def get_rest_api_for_installation(installation_id: int) -> RestApi:
-    token, _ = await get_token_for_installation(installation_id)
-    return RestApi(token_auth(token), get_github_cache())
+    """
+    Returns the rest api for an installation, the client is shared and must not be closed by the caller.
+    The client needs to be released using release_installation_client once it is not used anymore.
+    """
+    return (await _get_installation_clients(installation_id)).rest_api
 
 
 async def get_graphql_api_for_installation(installation_id: int) -> GraphQLClient:
+    """
+    Returns the graphql client for an installation, the client is shared and must not be closed by the caller.
+    The client needs to be released using release_installation_client once it is not used anymore.
+    """
+    return (await _get_installation_clients(installation_id)).graphql_api
+
+
+def release_installation_client(installation_id: int) -> None:
+    """
+    Releases a client that has been checked out for an installation, allowing it to be closed once idle.
+    """
+    clients = _INSTALLATION_CLIENTS.get(installation_id)
+    if clients is not None and clients.checkouts > 0:
+        clients.checkouts -= 1
+        clients.last_used = time.monotonic()
+
+
+async def _get_installation_clients(installation_id: int) -> _InstallationClients:
     token, _ = await get_token_for_installation(installation_id)
-    return GraphQLClient(token_auth(token), get_github_cache())
+    now = time.monotonic()
+
+    await _close_idle_installation_clients(now, installation_id)
+
+    clients = _INSTALLATION_CLIENTS.get(installation_id)
+    if clients is None:
+        logger.debug(f"creating clients for installation '{installation_id}'")
+        auth = refreshable_token_auth(token)
+        # the clients share the rate limits of the installation with all other clients of the installation
+        rate_limiter = get_shared_rate_limiter(get_account_key_for_installation(installation_id))
+        clients = _InstallationClients(
+            auth,
+            RestApi(auth, get_github_cache(), rate_limiter),
+            GraphQLClient(auth, get_github_cache(), rate_limiter),
+            now,
+        )
+        _INSTALLATION_CLIENTS[installation_id] = clients
+    elif clients.auth.token != token:
+        # the installation token has been refreshed, update existing clients to keep their connections
+        clients.auth.update_token(token)
+
+    clients.checkouts += 1
+    clients.last_used = now
+    return clients
+
+
+async def _close_idle_installation_clients(now: float, excluded_installation_id: int) -> None:
+    idle_clients = []
+
+    for installation_id, clients in _INSTALLATION_CLIENTS.items():
+        if installation_id == excluded_installation_id:
+            continue
+
+        # clients that are still checked out might be used at any time, e.g. by a task waiting for a git operation
+        if clients.checkouts == 0 and now - clients.last_used > _INSTALLATION_CLIENTS_IDLE_TIMEOUT:
+            idle_clients.append(installation_id)
+
+    for installation_id in idle_clients:
+        logger.debug(f"closing idle clients for installation '{installation_id}'")
+        await _INSTALLATION_CLIENTS.pop(installation_id).close()
 
 
 def get_app_root_directory(app: Quart | None = None) -> str:
@@ -11,6 +11,7 @@ from logging import getLogger
 from pydantic import ValidationError
 from quart import Response, current_app
 
+from otterdog.cache import get_snapshot_store
 from otterdog.webapp.db.service import (
     get_installation,
     update_installation_status,
@@ -22,6 +23,7 @@ from otterdog.webapp.tasks.check_sync import CheckConfigurationInSyncTask
 from otterdog.webapp.tasks.fetch_config import FetchConfigTask
 from otterdog.webapp.tasks.fetch_policies import FetchPoliciesTask
 from otterdog.webapp.tasks.help_comment import HelpCommentTask
+from otterdog.webapp.tasks.queue import queue_task
 from otterdog.webapp.tasks.retrieve_team_membership import RetrieveTeamMembershipTask
 from otterdog.webapp.tasks.update_pull_request import UpdatePullRequestTask
 from otterdog.webapp.tasks.validate_pull_request import ValidatePullRequestTask
@@ -86,7 +88,7 @@ async def on_pull_request_received(data):
         "reopened",
         "synchronize",
     ]:
-        current_app.add_background_task(
+        queue_task(
             UpdatePullRequestTask(
                 event.installation.id,
                 event.organization.login,
@@ -96,7 +98,7 @@ async def on_pull_request_received(data):
         )
 
     if event.action in ["opened", "ready_for_review"] and event.pull_request.draft is False:
-        current_app.add_background_task(
+        queue_task(
             HelpCommentTask(
                 event.installation.id,
                 event.organization.login,
@@ -105,7 +107,7 @@ async def on_pull_request_received(data):
             )
         )
 
-        current_app.add_background_task(
+        queue_task(
             RetrieveTeamMembershipTask(
                 event.installation.id,
                 event.organization.login,
@@ -120,7 +122,7 @@ async def on_pull_request_received(data):
         and event.pull_request.draft is False
     ):
         # schedule a validate task
-        current_app.add_background_task(
+        queue_task(
             ValidatePullRequestTask(
                 event.installation.id,
                 event.organization.login,
@@ -130,7 +132,7 @@ async def on_pull_request_received(data):
         )
 
         # schedule a check-sync task
-        current_app.add_background_task(
+        queue_task(
             CheckConfigurationInSyncTask(
                 event.installation.id,
                 event.organization.login,
@@ -143,7 +145,7 @@ async def on_pull_request_received(data):
         if event.pull_request.base.ref != event.repository.default_branch:
             return success()
 
-        current_app.add_background_task(
+        queue_task(
             ApplyChangesTask(
                 event.installation.id,
                 event.organization.login,
@@ -170,7 +172,7 @@ async def on_pull_request_review_received(data):
         return success()
 
     if event.action in ["submitted", "edited", "dismissed"]:
-        current_app.add_background_task(
+        queue_task(
             UpdatePullRequestTask(
                 event.installation.id,
                 event.organization.login,
@@ -228,7 +230,7 @@ async def on_push_received(data):
         if not await targets_config_repo(event.repository.name, event.installation.id):
             return success()
 
-        current_app.add_background_task(
+        queue_task(
             FetchConfigTask(
                 event.installation.id,
                 event.organization.login,
@@ -249,7 +251,7 @@ async def on_push_received(data):
         policies_modified = any(map(modifies_any_policy, event.commits))
         if policies_modified is True:
             global_policies = await refresh_global_policies()
-            current_app.add_background_task(
+            queue_task(
                 FetchPoliciesTask(
                     event.installation.id,
                     event.organization.login,
@@ -291,6 +293,27 @@ async def on_installation_received(data):
     return success()
 
 
+@webhook.hook("repository")
+@webhook.hook("branch_protection_rule")
+@webhook.hook("repository_ruleset")
+@webhook.hook("custom_property_values")
+@webhook.hook("meta")
+async def on_repository_settings_received(data):
+    snapshot_store = get_snapshot_store()
+    if snapshot_store is None:
+        return success()
+
+    # the settings of a repo might have changed, so it needs to be retrieved again
+    # when loading the live state the next time.
+    org_id = (data.get("organization") or {}).get("login")
+    repo_name = (data.get("repository") or {}).get("name")
+    if org_id is None or repo_name is None:
+        return success()
+
+    current_app.add_background_task(snapshot_store.mark_dirty, org_id, [repo_name])
+    return success()
+
+
 @webhook.hook("workflow_job")
 async def on_workflow_job_received(data):
     try:
@@ -317,14 +340,17 @@ async def on_workflow_job_received(data):
             assert isinstance(policy, MacOSLargeRunnersUsagePolicy)
 
             if not policy.is_workflow_job_permitted(event.workflow_job.labels):
-                from otterdog.webapp.utils import get_rest_api_for_installation
+                from otterdog.webapp.utils import get_rest_api_for_installation, release_installation_client
 
                 org_id = event.organization.login
                 repo_name = event.repository.name
                 run_id = event.workflow_job.run_id
 
                 rest_api = await get_rest_api_for_installation(event.installation.id)
-                cancelled = await rest_api.action.cancel_workflow_run(org_id, repo_name, run_id)
+                try:
+                    cancelled = await rest_api.action.cancel_workflow_run(org_id, repo_name, run_id)
+                finally:
+                    release_installation_client(event.installation.id)
                 logger.info(f"cancelled workflow run #{run_id} in repo '{org_id}/{repo_name}': success={cancelled}")
 
     return success()
@@ -13,9 +13,8 @@ from abc import ABC, abstractmethod
 from functools import cached_property
 from typing import TYPE_CHECKING
 
-from quart import current_app
-
 from otterdog.utils import LogLevel
+from otterdog.webapp.tasks.queue import queue_task
 
 if TYPE_CHECKING:
     from re import Match, Pattern
@@ -42,7 +41,7 @@ class CommentHandler(ABC):
 
     @staticmethod
     def schedule_task(task: Task) -> None:
-        current_app.add_background_task(task)
+        queue_task(task)
 
 
 class HelpCommentHandler(CommentHandler):
@@ -0,0 +1,130 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from otterdog.models import github_organization
+from otterdog.models.github_organization import _fetch_single_repo, _load_bulk_repo_data
+from otterdog.providers.github import GitHubProvider
+from otterdog.providers.github.auth import token_auth
+from otterdog.providers.github.graphql import GraphQLClient
+
+_RESOURCES = ["branch_protection_rules", "rulesets", "webhooks", "secrets", "variables", "environments"]
+
+
+class _Requests:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    def request(self, name: str, delay: float):
+        async def request(*args):
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            try:
+                await asyncio.sleep(delay)
+                return name
+            finally:
+                self.running -= 1
+
+        return request
+
+
+def _provider(requests: _Requests) -> SimpleNamespace:
+    async def get_repo_data(org_id, repo_name, prefetched_data):
+        return {"name": repo_name, "private": False}
+
+    # requests issued first complete last to check that the results are associated correctly
+    repo = SimpleNamespace(
+        get_repo_data=get_repo_data,
+        get_workflow_settings=requests.request("workflows", 0.07),
+        get_secrets=requests.request("secrets", 0.03),
+        get_variables=requests.request("variables", 0.02),
+        get_environments=requests.request("environments", 0.01),
+    )
+
+    return SimpleNamespace(
+        rest_api=SimpleNamespace(repo=repo),
+        get_branch_protection_rules=requests.request("branch_protection_rules", 0.06),
+        get_repo_rulesets=requests.request("rulesets", 0.05),
+        get_repo_webhooks=requests.request("webhooks", 0.04),
+    )
+
+
+@pytest.mark.asyncio
+async def test_fetch_single_repo(monkeypatch):
+    monkeypatch.setattr(github_organization, "MAX_REPO_CONCURRENCY", 3)
+
+    requests = _Requests()
+    data = await _fetch_single_repo(_provider(requests), "test-org", "test-repo", _RESOURCES)  # type: ignore
+
+    assert requests.max_running == 3
+    assert data == {
+        "repo": {"name": "test-repo", "private": False},
+        "workflows": "workflows",
+        "branch_protection_rules": "branch_protection_rules",
+        "rulesets": "rulesets",
+        "webhooks": "webhooks",
+        "secrets": "secrets",
+        "variables": "variables",
+        "environments": "environments",
+    }
+
+
+@pytest.mark.asyncio
+async def test_fetch_single_repo_with_prefetched_data():
+    requests = _Requests()
+    prefetched_data = {"branch_protection_rules": ["rule"], "environments": []}
+    data = await _fetch_single_repo(
+        _provider(requests),  # type: ignore
+        "test-org",
+        "test-repo",
+        _RESOURCES,
+        prefetched_data,
+    )
+
+    assert data["branch_protection_rules"] == ["rule"]
+    assert data["environments"] == []
+    assert data["secrets"] == "secrets"
+
+
+@pytest.mark.asyncio
+async def test_load_bulk_repo_data_with_failed_batch(monkeypatch):
+    monkeypatch.setattr(github_organization, "_BULK_REPO_BATCH_SIZE", 1)
+
+    repo_data = {
+        "name": "first",
+        "isArchived": True,
+        "environments": {"totalCount": 1},
+        "repositoryTopics": {"nodes": []},
+        "branchProtectionRules": {"nodes": [], "pageInfo": {"hasNextPage": True, "endCursor": "abc"}},
+    }
+
+    async def request_raw(method, query, variables):
+        if variables["repo0"] == "second":
+            return 502, json.dumps({"message": "Bad Gateway"})
+        return 200, json.dumps({"data": {"repo0": repo_data}})
+
+    async def get_custom_property_values(org_id):
+        return []
+
+    provider = GitHubProvider(None)
+    provider.rest_api = SimpleNamespace(org=SimpleNamespace(get_custom_property_values=get_custom_property_values))
+
+    async with GraphQLClient(token_auth("token")) as client:
+        client._request_raw = request_raw
+        provider.graphql_client = client
+
+        result = await _load_bulk_repo_data("test-org", provider, ["first", "second"], [])  # type: ignore
+
+    # repos of the failed batch are retrieved per repo
+    assert list(result) == ["first"]
@@ -0,0 +1,75 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import pytest
+
+from otterdog.models.branch_protection_rule import BranchProtectionRule
+from otterdog.models.repo_ruleset import RepositoryRuleset
+from otterdog.models.repo_workflow_settings import RepositoryWorkflowSettings
+from otterdog.models.repository import Repository
+from otterdog.models.ruleset import PullRequestSettings
+from otterdog.utils import UNSET
+
+from . import ModelTest
+
+
+def test_nested_model_data():
+    data = ModelTest.load_json_resource("otterdog-repo.json")
+    bpr_data = ModelTest.load_json_resource("otterdog-bpr.json")
+
+    data["branch_protection_rules"] = [bpr_data]
+    data["rulesets"] = [{"name": "main", "required_pull_request": {"required_approving_review_count": 2}}]
+    data["workflows"] = {"enabled": False}
+    data.pop("environments", None)
+
+    repo = Repository.from_model_data(data)
+
+    assert repo.branch_protection_rules == [BranchProtectionRule.from_model_data(bpr_data)]
+    assert repo.environments == []
+    assert isinstance(repo.workflows, RepositoryWorkflowSettings)
+    assert repo.workflows.enabled is False
+
+    ruleset = repo.rulesets[0]
+    assert isinstance(ruleset, RepositoryRuleset)
+    assert ruleset.required_pull_request == PullRequestSettings.from_model_data({"required_approving_review_count": 2})
+    assert ruleset.required_status_checks is None
+    # missing keys without a default value are unset
+    assert ruleset.enforcement is UNSET
+
+    data["workflows"] = None
+    assert Repository.from_model_data(data).workflows is UNSET
+
+
+def test_model_data_with_legacy_key():
+    data = ModelTest.load_json_resource("otterdog-bpr.json")
+    data["requires_approving_reviews"] = not data["requires_pull_request"]
+
+    assert BranchProtectionRule.from_model_data(data).requires_pull_request == data["requires_approving_reviews"]
+
+
+def test_model_objects_are_slotted():
+    repo = Repository.from_model_data(ModelTest.load_json_resource("otterdog-repo.json"))
+
+    assert not hasattr(repo, "__dict__")
+    assert not hasattr(PullRequestSettings.from_model_data({}), "__dict__")
+
+    with pytest.raises(AttributeError):
+        repo.unknown_attribute = True
+
+
+def test_field_metadata_is_computed_once_per_class():
+    assert Repository.all_fields() is Repository.all_fields()
+    assert Repository.provider_fields() is Repository.provider_fields()
+    assert RepositoryRuleset.all_fields() is not Repository.all_fields()
+
+    assert "branch_protection_rules" in (field.name for field in Repository.model_fields())
+    assert "branch_protection_rules" not in (field.name for field in Repository.provider_fields())
+    assert Repository.is_nested_model_key("branch_protection_rules")
+
+    with pytest.raises(ValueError):
+        Repository.is_nested_model_key("unknown")
@@ -0,0 +1,67 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import jsonschema
+import pytest
+
+import otterdog.models.github_organization
+from otterdog.models.github_organization import GitHubOrganization
+
+from . import ModelTest
+
+
+def _org_data() -> dict:
+    settings = ModelTest.load_json_resource("otterdog-org-settings.json")
+    return {
+        "github_id": "OtterdogTest",
+        # the resource contains some outdated settings not supported by the schema anymore
+        "settings": {
+            k: v for k, v in settings.items() if k not in ("members_can_create_pages", "organization_projects_enabled")
+        },
+        "repositories": [ModelTest.load_json_resource("otterdog-repo.json")],
+    }
+
+
+def test_validate_config_with_referenced_schemas():
+    data = _org_data()
+    GitHubOrganization.validate_config(data)
+
+    data["repositories"][0]["archived"] = "no"
+    with pytest.raises(jsonschema.ValidationError, match="'no' is not of type 'boolean'"):
+        GitHubOrganization.validate_config(data)
+
+    data = _org_data()
+    data["settings"]["name"] = 1
+    with pytest.raises(jsonschema.ValidationError):
+        GitHubOrganization.validate_config(data)
+
+
+def test_validated_configs_are_not_validated_again(monkeypatch):
+    validations = []
+    validator = otterdog.models.github_organization._get_org_schema_validator()
+
+    class _Validator:
+        def iter_errors(self, data):
+            validations.append(data)
+            return validator.iter_errors(data)
+
+    monkeypatch.setattr(otterdog.models.github_organization, "_get_org_schema_validator", lambda: _Validator())
+
+    data = _org_data()
+    data["repositories"][0]["description"] = "only validated once"
+
+    GitHubOrganization.validate_config(data)
+    GitHubOrganization.validate_config(_org_data() | {"repositories": data["repositories"]})
+    assert len(validations) == 1
+
+    data["repositories"][0]["archived"] = "no"
+    with pytest.raises(jsonschema.ValidationError):
+        GitHubOrganization.validate_config(data)
+    with pytest.raises(jsonschema.ValidationError):
+        GitHubOrganization.validate_config(data)
+    assert len(validations) == 3
@@ -0,0 +1,93 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import asyncio
+import dataclasses
+
+import pytest
+
+from otterdog.models import LivePatch
+from otterdog.models.organization_secret import OrganizationSecret
+from otterdog.models.patch_executor import LivePatchExecutor
+from otterdog.models.repository import Repository
+from otterdog.providers.github.exception import GitHubException
+
+from . import ModelTest
+
+
+def _repo(name: str, template_repository: str | None = None) -> Repository:
+    repo = Repository.from_model_data(ModelTest.load_json_resource("otterdog-repo.json"))
+    return dataclasses.replace(repo, name=name, template_repository=template_repository)
+
+
+def _secret() -> OrganizationSecret:
+    return OrganizationSecret.from_model_data(ModelTest.load_json_resource("otterdog-org-secret.json"))
+
+
+@pytest.mark.asyncio
+async def test_execute_in_dependency_order():
+    applied = []
+
+    async def apply(patch, org_id, provider):
+        # let other patches run in between
+        await asyncio.sleep(0)
+        applied.append(repr(patch))
+
+    template = _repo("template")
+    repo = _repo("from-template", "OtterdogTest/template")
+
+    patches = [
+        LivePatch.of_deletion(_secret(), None, apply),
+        LivePatch.of_addition(_secret(), None, apply),
+        LivePatch.of_addition(repo, None, apply),
+        LivePatch.of_addition(_secret(), repo, apply),
+        LivePatch.of_deletion(_repo("old"), None, apply),
+        LivePatch.of_addition(template, None, apply),
+    ]
+
+    executor = LivePatchExecutor("OtterdogTest", None, concurrency=4)
+    errors = await executor.execute(patches)
+
+    assert errors == []
+    assert applied == [
+        repr(patches[1]),
+        repr(patches[5]),
+        repr(patches[2]),
+        repr(patches[3]),
+        repr(patches[4]),
+        repr(patches[0]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_execute_with_retries_and_errors():
+    attempts = {"retried": 0, "failed": 0, "added": 0}
+
+    async def apply(patch, org_id, provider):
+        name = patch.expected_object.name
+        attempts[name] += 1
+
+        if name == "retried" and attempts[name] == 1:
+            raise RuntimeError("failed to update repo") from GitHubException("url", 502, "")
+        elif name == "failed":
+            raise RuntimeError("failed to update repo") from GitHubException("url", 422, "")
+        elif name == "added":
+            raise RuntimeError("failed to add repo") from GitHubException("url", 502, "")
+
+    patches = [
+        LivePatch.of_changes(_repo("retried"), _repo("retried"), {}, None, False, apply),
+        LivePatch.of_changes(_repo("failed"), _repo("failed"), {}, None, False, apply),
+        # additions are not idempotent and never retried
+        LivePatch.of_addition(_repo("added"), None, apply),
+    ]
+
+    executor = LivePatchExecutor("OtterdogTest", None, retry_delay=0)
+    errors = await executor.execute(patches)
+
+    assert attempts == {"retried": 2, "failed": 1, "added": 1}
+    assert [error.patch for error in errors] == [patches[1], patches[2]]
@@ -0,0 +1,33 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+from otterdog.providers.github.auth import refreshable_token_auth
+from otterdog.providers.github.stats import RequestStatistics
+
+
+def test_refreshable_token_is_updated_in_place():
+    auth_strategy = refreshable_token_auth("token1")
+    auth = auth_strategy.get_auth()
+
+    headers: dict[str, str] = {}
+    auth.update_headers_with_authorization(headers)
+    assert headers["Authorization"] == "Bearer token1"
+
+    auth_strategy.update_token("token2")
+
+    assert auth_strategy.token == "token2"
+    auth.update_headers_with_authorization(headers)
+    assert headers["Authorization"] == "Bearer token2"
+
+
+def test_request_statistics_since_snapshot():
+    statistics = RequestStatistics(total_requests=5, cached_responses=2)
+    start = RequestStatistics(total_requests=3, cached_responses=1)
+    statistics.update_remaining_rate_limit(100)
+
+    assert statistics.since(start) == RequestStatistics(2, 1, 100)
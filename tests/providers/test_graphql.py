@@ -0,0 +1,92 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import json
+
+import pytest
+
+from otterdog.providers.github.auth import token_auth
+from otterdog.providers.github.graphql import GraphQLClient
+
+
+def _actors() -> dict:
+    return {"nodes": [], "pageInfo": {"hasNextPage": False, "endCursor": None}}
+
+
+@pytest.mark.asyncio
+async def test_get_bulk_repo_data():
+    response = {
+        "data": {
+            "repo0": {
+                "databaseId": 1,
+                "name": "first",
+                "homepageUrl": None,
+                "isArchived": False,
+                "deleteBranchOnMerge": True,
+                "squashMergeCommitTitle": "PR_TITLE",
+                "templateRepository": {"nameWithOwner": "test-org/template"},
+                "defaultBranchRef": {"name": "main"},
+                "environments": {"totalCount": 0},
+                "hasVulnerabilityAlertsEnabled": True,
+                "repositoryTopics": {"nodes": [{"topic": {"name": "java"}}]},
+                "branchProtectionRules": {
+                    "nodes": [
+                        {
+                            "id": "BPR_1",
+                            "pattern": "main",
+                            "pushAllowances": _actors(),
+                            "reviewDismissalAllowances": _actors(),
+                            "bypassPullRequestAllowances": _actors(),
+                            "bypassForcePushAllowances": _actors(),
+                        }
+                    ],
+                    "pageInfo": {"hasNextPage": False, "endCursor": None},
+                },
+            },
+            "repo1": {
+                "isArchived": True,
+                "templateRepository": None,
+                "defaultBranchRef": None,
+                "environments": {"totalCount": 2},
+                "hasVulnerabilityAlertsEnabled": False,
+                "repositoryTopics": {"nodes": []},
+                "branchProtectionRules": {"nodes": [], "pageInfo": {"hasNextPage": True, "endCursor": "abc"}},
+            },
+            "repo2": None,
+        }
+    }
+
+    queries = []
+
+    async with GraphQLClient(token_auth("token")) as client:
+
+        async def request_raw(method, query, variables):
+            queries.append((query, variables))
+            return 200, json.dumps(response)
+
+        client._request_raw = request_raw
+        result = await client.get_bulk_repo_data("test-org", ["first", "second", "missing"])
+
+    assert len(queries) == 1
+    assert queries[0][1] == {"organization": "test-org", "repo0": "first", "repo1": "second", "repo2": "missing"}
+
+    assert result["first"]["id"] == 1
+    assert result["first"]["name"] == "first"
+    assert result["first"]["homepage"] is None
+    assert result["first"]["delete_branch_on_merge"] is True
+    assert result["first"]["squash_merge_commit_title"] == "PR_TITLE"
+    assert result["first"]["template_repository"] == {"full_name": "test-org/template"}
+    assert result["first"]["default_branch"] == "main"
+    assert result["first"]["environments"] == []
+    assert result["first"]["topics"] == ["java"]
+    assert result["first"]["dependabot_alerts_enabled"] is True
+    assert result["first"]["branch_protection_rules"][0]["pushRestrictions"] == []
+
+    # archived repos have no vulnerability alerts, paged rules and existing environments are read separately
+    assert result["second"] == {"archived": True, "template_repository": None, "topics": []}
+    assert "missing" not in result
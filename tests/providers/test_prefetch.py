@@ -0,0 +1,83 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import asyncio
+
+import pytest
+
+from otterdog.providers.github.rest import RestApi
+from otterdog.providers.github.rest.prefetch import SubResourcePrefetcher, prefetch_scope
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_concurrently_and_memoized():
+    prefetcher = SubResourcePrefetcher()
+    running = 0
+    max_running = 0
+    calls = []
+
+    async def fetch(key):
+        nonlocal running, max_running
+        calls.append(key)
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return key * 2
+
+    def requests(keys):
+        return [(key, lambda key=key: fetch(key)) for key in keys]
+
+    assert await prefetcher.fetch_all(requests([1, 2, 3])) == [2, 4, 6]
+    assert max_running == 3
+
+    assert await prefetcher.fetch_all(requests([3, 4])) == [6, 8]
+    assert calls == [1, 2, 3, 4]
+
+    prefetcher.invalidate(1)
+    assert await prefetcher.fetch(1, lambda: fetch(1)) == 2
+    assert calls == [1, 2, 3, 4, 1]
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_memoized():
+    prefetcher = SubResourcePrefetcher()
+    attempts = 0
+
+    async def fetch():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("failed")
+        return attempts
+
+    with pytest.raises(RuntimeError):
+        await prefetcher.fetch("key", fetch)
+
+    assert await prefetcher.fetch("key", fetch) == 2
+    assert await prefetcher.fetch("key", fetch) == 2
+
+
+@pytest.mark.asyncio
+async def test_prefetch_scope():
+    async with RestApi() as rest_api:
+        default_prefetcher = rest_api.prefetcher
+
+        async def fetch_in_scope():
+            with prefetch_scope() as prefetcher:
+                # let the other scope start in between
+                await asyncio.sleep(0)
+                assert rest_api.prefetcher is prefetcher
+                return prefetcher
+
+        first, second = await asyncio.gather(fetch_in_scope(), fetch_in_scope())
+
+        # each scope uses its own prefetcher, outside a scope the prefetcher of the client is used
+        assert first is not second
+        assert default_prefetcher not in (first, second)
+        assert rest_api.prefetcher is default_prefetcher
@@ -0,0 +1,100 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import asyncio
+import time
+
+import pytest
+
+from otterdog.credentials import Credentials
+from otterdog.providers.github import rate_limit
+from otterdog.providers.github.rate_limit import RateLimiter, get_shared_rate_limiter
+
+
+def test_get_cost():
+    assert RateLimiter.get_cost("core", "GET") == 1
+    assert RateLimiter.get_cost("core", "PATCH") == 5
+    assert RateLimiter.get_cost("core", "DELETE") == 5
+    assert RateLimiter.get_cost("graphql", "POST") == 1
+    assert RateLimiter.get_cost("graphql", "POST", is_mutation=True) == 5
+
+
+def test_update_without_rate_limit():
+    limiter = RateLimiter(max_concurrency=50)
+    initial_concurrency = limiter.concurrency
+
+    headers = {"x-ratelimit-remaining": "4000", "x-ratelimit-limit": "5000", "x-ratelimit-reset": "0"}
+    for _ in range(initial_concurrency):
+        assert limiter.update("core", 200, headers, "") is False
+
+    assert limiter.concurrency == initial_concurrency + 1
+
+
+def test_update_secondary_rate_limit():
+    limiter = RateLimiter()
+    initial_concurrency = limiter.concurrency
+
+    body = '{"message": "You have exceeded a secondary rate limit."}'
+    assert limiter.update("core", 403, {"retry-after": "1"}, body) is True
+    assert limiter.concurrency == initial_concurrency // 2
+
+    assert limiter.update("core", 403, {}, '{"message": "Resource not accessible by integration"}') is False
+
+
+@pytest.mark.asyncio
+async def test_burst_of_secondary_rate_limits():
+    limiter = RateLimiter()
+    initial_concurrency = limiter.concurrency
+    body = '{"message": "You have exceeded a secondary rate limit."}'
+
+    async def hit_rate_limit() -> bool:
+        async with limiter.limit("core", 1):
+            await asyncio.sleep(0)
+            return limiter.update("core", 403, {}, body)
+
+    # all requests in flight hit the limit at the same time, only the first one escalates the backoff
+    assert all(await asyncio.wait_for(asyncio.gather(*[hit_rate_limit() for _ in range(20)]), timeout=5))
+    assert limiter._paused_until - time.monotonic() <= rate_limit._SECONDARY_RATE_LIMIT_BACKOFF
+    assert limiter.concurrency == initial_concurrency // 2
+
+    # the backoff of limits that are hit repeatedly after a pause is bounded
+    for _ in range(20):
+        limiter._paused_until = 0.0
+        limiter.update("core", 403, {}, body)
+
+    assert limiter._paused_until - time.monotonic() <= rate_limit._MAX_SECONDARY_RATE_LIMIT_BACKOFF
+
+
+@pytest.mark.asyncio
+async def test_limit_waits_for_retry_after():
+    limiter = RateLimiter()
+    limiter.update("graphql", 429, {"retry-after": "0.2"}, "")
+
+    start = time.monotonic()
+    async with limiter.limit("graphql", 1):
+        pass
+
+    assert time.monotonic() - start >= 0.2
+
+
+@pytest.mark.asyncio
+async def test_shared_rate_limiter():
+    limiter = get_shared_rate_limiter("installation:1")
+
+    assert get_shared_rate_limiter("installation:1") is limiter
+    assert get_shared_rate_limiter("installation:2") is not limiter
+
+
+def test_account_key_of_credentials():
+    # refreshed installation tokens keep using the same account key
+    assert Credentials(None, None, None, "token-a", "installation:1").account_key == "installation:1"
+    assert Credentials(None, None, None, "token-b", "installation:1").account_key == "installation:1"
+
+    # credentials without an account are identified by their token
+    assert Credentials(None, None, None, "token-a").account_key == Credentials(None, None, None, "token-a").account_key
+    assert Credentials(None, None, None, "token-a").account_key != Credentials(None, None, None, "token-b").account_key
@@ -0,0 +1,92 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from otterdog.providers.github.rest.repo_client import _SIMPLE_REPO_DATA_KEYS, RepoClient
+
+_RESPONSES = {
+    "/repos/test-org/test-repo": {"name": "test-repo", "private": False, "archived": False, "has_pages": False},
+    "/repos/test-org/test-repo/private-vulnerability-reporting": {"enabled": True},
+    "/repos/test-org/test-repo/topics": {"names": ["java"]},
+    "/repos/test-org/test-repo/properties/values": [],
+}
+
+
+class _Requester:
+    def __init__(self):
+        self.urls: list[str] = []
+
+    async def request_json(self, method, url, data=None, params=None):
+        self.urls.append(url)
+        return _RESPONSES[url]
+
+    async def request_raw(self, method, url, data=None, params=None):
+        self.urls.append(url)
+        if url in _RESPONSES:
+            return 200, json.dumps(_RESPONSES[url])
+        else:
+            return 404, ""
+
+
+@pytest.mark.asyncio
+async def test_get_repo_data():
+    requester = _Requester()
+    repo_client = RepoClient(SimpleNamespace(requester=requester))  # type: ignore
+
+    repo_data = await repo_client.get_repo_data("test-org", "test-repo")
+
+    # no github pages config is retrieved for repos without a pages site
+    assert sorted(requester.urls) == [
+        "/repos/test-org/test-repo",
+        "/repos/test-org/test-repo/code-scanning/default-setup",
+        "/repos/test-org/test-repo/private-vulnerability-reporting",
+        "/repos/test-org/test-repo/properties/values",
+        "/repos/test-org/test-repo/topics",
+        "/repos/test-org/test-repo/vulnerability-alerts",
+    ]
+    assert repo_data["topics"] == ["java"]
+    assert repo_data["private_vulnerability_reporting_enabled"] is True
+
+
+@pytest.mark.asyncio
+async def test_get_repo_data_with_prefetched_data():
+    requester = _Requester()
+    repo_client = RepoClient(SimpleNamespace(requester=requester))  # type: ignore
+
+    prefetched_data = {key: None for key in _SIMPLE_REPO_DATA_KEYS}
+    prefetched_data.update(
+        {
+            "name": "test-repo",
+            "private": False,
+            "archived": False,
+            "has_pages": False,
+            "topics": ["java"],
+            "dependabot_alerts_enabled": True,
+            "custom_properties": [],
+        }
+    )
+
+    repo_data = await repo_client.get_repo_data("test-org", "test-repo", prefetched_data)
+
+    # only settings that are not available in bulk are retrieved
+    assert sorted(requester.urls) == [
+        "/repos/test-org/test-repo/code-scanning/default-setup",
+        "/repos/test-org/test-repo/private-vulnerability-reporting",
+    ]
+    assert repo_data["topics"] == ["java"]
+
+    # the repo itself is retrieved if some of its settings are missing
+    del prefetched_data["security_and_analysis"]
+    requester.urls.clear()
+
+    await repo_client.get_repo_data("test-org", "test-repo", prefetched_data)
+    assert "/repos/test-org/test-repo" in requester.urls
@@ -0,0 +1,190 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import asyncio
+import json
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from aiohttp_client_cache.response import CachedResponse
+
+from otterdog.providers.github.cache.file import file_cache
+from otterdog.providers.github.rest.pull_request_client import PullRequestClient
+from otterdog.providers.github.rest.requester import Requester
+
+_BASE_URL = "api.github.invalid"
+
+
+async def _store_response(requester: Requester, url_path: str, body: str, age: int) -> None:
+    url = f"https://{_BASE_URL}{url_path}"
+    created_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=age)
+    response = CachedResponse("GET", "OK", 200, url, "1.1", body=body.encode(), created_at=created_at)
+
+    cache = requester._session.cache
+    await cache.responses.write(cache.create_key("GET", url), response)
+
+
+@pytest.mark.asyncio
+async def test_fresh_cached_response(tmp_path):
+    requester = Requester(None, file_cache(str(tmp_path), max_stale=60), _BASE_URL, "2022-11-28")
+
+    try:
+        await _store_response(requester, "/orgs/test", '{"login": "test"}', age=10)
+
+        assert await requester.request_json("GET", "/orgs/test") == {"login": "test"}
+        assert requester.statistics.total_requests == 1
+        assert requester.statistics.cached_responses == 1
+    finally:
+        await requester.close()
+
+
+@pytest.mark.asyncio
+async def test_stale_cached_response(tmp_path):
+    requester = Requester(None, file_cache(str(tmp_path), max_stale=60), _BASE_URL, "2022-11-28")
+
+    try:
+        await _store_response(requester, "/orgs/test", '{"login": "test"}', age=120)
+
+        assert await requester._get_fresh_cached_response("GET", f"https://{_BASE_URL}/orgs/test", None, None) is None
+    finally:
+        await requester.close()
+
+
+@pytest.mark.asyncio
+async def test_cached_responses_after_modification(tmp_path):
+    requester = Requester(None, file_cache(str(tmp_path), max_stale=60), _BASE_URL, "2022-11-28")
+    url = f"https://{_BASE_URL}/orgs/test"
+
+    try:
+        await _store_response(requester, "/orgs/test", '{"login": "test"}', age=10)
+        await requester._mark_as_modified("PATCH", "/orgs/test")
+
+        assert await requester._get_fresh_cached_response("GET", url, None, None) is None
+
+        # responses retrieved after the modification are served again
+        await _store_response(requester, "/orgs/test", '{"login": "test"}', age=0)
+        assert await requester._get_fresh_cached_response("GET", url, None, None) is not None
+    finally:
+        await requester.close()
+
+
+@pytest.mark.asyncio
+async def test_cached_responses_after_creating_access_tokens(tmp_path):
+    requester = Requester(None, file_cache(str(tmp_path), max_stale=60), _BASE_URL, "2022-11-28")
+    url = f"https://{_BASE_URL}/orgs/test"
+
+    try:
+        await _store_response(requester, "/orgs/test", '{"login": "test"}', age=10)
+
+        # creating an access token does not modify any resource
+        await requester._mark_as_modified("POST", "/app/installations/1/access_tokens")
+        assert await requester._get_fresh_cached_response("GET", url, None, None) is not None
+
+        await requester._mark_as_modified("GET", "/orgs/test")
+        assert await requester._get_fresh_cached_response("GET", url, None, None) is not None
+    finally:
+        await requester.close()
+
+
+def _paged_requester(tmp_path, pages: list[list[int]], with_links: bool = True) -> tuple[Requester, list[str]]:
+    requester = Requester(None, file_cache(str(tmp_path)), _BASE_URL, "2022-11-28")
+    requested_pages = []
+
+    async def request(method, url_path, data=None, params=None):
+        page = int(params["page"])
+        requested_pages.append(page)
+
+        headers = {}
+        if with_links and page < len(pages):
+            url = f"https://{_BASE_URL}/repositories/1/pulls?per_page=100"
+            headers["Link"] = f'<{url}&page={page + 1}>; rel="next", <{url}&page={len(pages)}>; rel="last"'
+
+        items = pages[page - 1] if page <= len(pages) else []
+        return 200, json.dumps([{"id": x} for x in items]), headers
+
+    requester._request = request  # type: ignore
+    return requester, requested_pages
+
+
+@pytest.mark.asyncio
+async def test_paged_json_follows_links(tmp_path):
+    pages = [list(range(100)), list(range(100, 200)), [200]]
+    requester, requested_pages = _paged_requester(tmp_path, pages)
+
+    try:
+        result = await requester.request_paged_json("GET", "/repos/test/test/pulls")
+
+        assert [x["id"] for x in result] == list(range(201))
+        # no additional request for an empty page
+        assert sorted(requested_pages) == [1, 2, 3]
+    finally:
+        await requester.close()
+
+
+@pytest.mark.asyncio
+async def test_paged_json_stops_early(tmp_path):
+    pages = [list(range(i * 100, (i + 1) * 100)) for i in range(10)]
+    requester, requested_pages = _paged_requester(tmp_path, pages)
+
+    try:
+        async with aclosing(requester.iter_paged_json("GET", "/repos/test/test/pulls", prefetch_pages=2)) as items:
+            async for item in items:
+                if item["id"] == 150:
+                    break
+
+        assert max(requested_pages) < 10
+    finally:
+        await requester.close()
+
+
+@pytest.mark.asyncio
+async def test_paged_json_without_links(tmp_path):
+    pages = [list(range(100)), [100]]
+    requester, requested_pages = _paged_requester(tmp_path, pages, with_links=False)
+
+    try:
+        result = await requester.request_paged_json("GET", "/repos/test/test/pulls")
+
+        assert len(result) == 101
+        assert requested_pages == [1, 2]
+    finally:
+        await requester.close()
+
+
+@pytest.mark.asyncio
+async def test_closing_pull_requests_cancels_pending_pages(tmp_path):
+    requester = Requester(None, file_cache(str(tmp_path)), _BASE_URL, "2022-11-28")
+    cancelled_pages = []
+
+    async def request_page(method, url_path, data, params):
+        page = int(params["page"])
+        if page > 2:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled_pages.append(page)
+                raise
+
+        url = f"https://{_BASE_URL}/repositories/1/pulls?per_page=100"
+        return [{"number": page}], {"next": f"{url}&page={page + 1}", "last": f"{url}&page=5"}
+
+    requester._request_page = request_page  # type: ignore
+    client = PullRequestClient(SimpleNamespace(requester=requester))  # type: ignore
+
+    try:
+        async with aclosing(client.iter_pull_requests("test", "test")) as pull_requests:
+            async for pull_request in pull_requests:
+                if pull_request["number"] == 2:
+                    break
+
+        # pending pages are cancelled when closing the iterator, not only once it is garbage collected
+        assert sorted(cancelled_pages) == [3, 4, 5]
+    finally:
+        await requester.close()
@@ -0,0 +1,124 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from otterdog.providers.github import GitHubProvider
+from otterdog.providers.github.resource_ids import ResourceIdIndex
+
+
+@pytest.mark.asyncio
+async def test_resolve_lists_collection_once():
+    listed = 0
+
+    async def list_ids():
+        nonlocal listed
+        listed += 1
+        await asyncio.sleep(0)
+        return {"main": 1, "release": 2}
+
+    index = ResourceIdIndex()
+
+    assert await asyncio.gather(
+        index.resolve("rulesets", "main", list_ids),
+        index.resolve("rulesets", "release", list_ids),
+        index.resolve("rulesets", "unknown", list_ids),
+    ) == [1, 2, None]
+    assert listed == 1
+
+    index.invalidate("rulesets")
+    assert await index.resolve("rulesets", "main", list_ids) == 1
+    assert listed == 2
+
+    index.add_all("webhooks", {"https://example.org": 3})
+    assert await index.resolve("webhooks", "https://example.org", list_ids) == 3
+    assert listed == 2
+
+
+@pytest.mark.asyncio
+async def test_listings_are_not_memoized_after_invalidation():
+    listing = asyncio.Event()
+    added = asyncio.Event()
+
+    async def list_ids():
+        listing.set()
+        await added.wait()
+        return {"main": 1}
+
+    index = ResourceIdIndex()
+    resolve = asyncio.create_task(index.resolve("rulesets", "main", list_ids))
+
+    # a resource is added while the collection is being listed
+    await listing.wait()
+    index.invalidate("rulesets")
+    added.set()
+
+    assert await resolve == 1
+    assert await index.resolve("rulesets", "release", _list_ruleset_ids) == 2
+
+
+async def _list_ruleset_ids():
+    return {"main": 1, "release": 2}
+
+
+class _RepoClient:
+    def __init__(self):
+        self.listed = 0
+        self.updated = []
+
+    async def get_rulesets(self, org_id, repo_name):
+        return [{"id": 1, "name": "main"}]
+
+    async def get_ruleset_ids(self, org_id, repo_name):
+        self.listed += 1
+        return {"main": 1, "release": 2}
+
+    async def update_ruleset(self, org_id, repo_name, ruleset_id, ruleset):
+        self.updated.append((repo_name, ruleset_id))
+
+
+@pytest.mark.asyncio
+async def test_ruleset_ids_are_resolved_once_per_repo():
+    provider = GitHubProvider(None)
+    repo_client = _RepoClient()
+    provider.rest_api = SimpleNamespace(repo=repo_client)
+
+    # rulesets retrieved while loading the live configuration do not need to be listed again
+    await provider.get_repo_rulesets("OtterdogTest", "loaded")
+    await provider.update_repo_ruleset("OtterdogTest", "loaded", None, "main", {"enforcement": "active"})
+    assert repo_client.listed == 0
+
+    await asyncio.gather(
+        provider.update_repo_ruleset("OtterdogTest", "test", None, "main", {"enforcement": "active"}),
+        provider.update_repo_ruleset("OtterdogTest", "test", None, "release", {"enforcement": "active"}),
+    )
+    assert repo_client.listed == 1
+    assert sorted(repo_client.updated) == [("loaded", 1), ("test", 1), ("test", 2)]
+
+    with pytest.raises(RuntimeError):
+        await provider.update_repo_ruleset("OtterdogTest", "test", None, "unknown", {"enforcement": "active"})
+
+
+@pytest.mark.asyncio
+async def test_collections_are_invalidated_after_adding_resources():
+    provider = GitHubProvider(None)
+    repo_client = _RepoClient()
+    provider.rest_api = SimpleNamespace(repo=repo_client)
+
+    async def add_ruleset(org_id, repo_name, data):
+        # a concurrent lookup lists the collection before the ruleset has been added
+        assert await provider._get_repo_ruleset_id(org_id, repo_name, "main") == 1
+
+    repo_client.add_ruleset = add_ruleset
+
+    await provider.add_repo_ruleset("OtterdogTest", "test", {"name": "release"})
+    await provider.update_repo_ruleset("OtterdogTest", "test", None, "release", {"enforcement": "active"})
+    assert repo_client.listed == 2
@@ -0,0 +1,36 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import os
+import stat
+
+from otterdog.providers.github.web import _WEB_SESSION_MAX_AGE, _WebSession, _WebSessionStore
+
+
+def test_web_sessions_are_stored_per_account(tmp_path):
+    session_dir = str(tmp_path / "web-sessions")
+    session = _WebSession({"cookies": [], "origins": []}, created_at=1000, verified_at=1000)
+
+    _WebSessionStore(session_dir).put("user1", session)
+
+    # a new store, e.g. of a subsequent run, restores the session from disk
+    store = _WebSessionStore(session_dir)
+    assert store.get("user1", 1000) == session
+    assert store.get("user2", 1000) is None
+    assert store.get("user1", 1000 + _WEB_SESSION_MAX_AGE + 1) is None
+
+    for file in os.listdir(session_dir):
+        assert stat.S_IMODE(os.stat(os.path.join(session_dir, file)).st_mode) == 0o600
+        assert "user1" not in file
+
+
+def test_web_session_verification():
+    session = _WebSession({"cookies": [], "origins": []}, created_at=0, verified_at=1000)
+
+    assert not session.needs_verification(1000)
+    assert session.needs_verification(1000 + 24 * 60 * 60)
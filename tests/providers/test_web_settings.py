@@ -0,0 +1,60 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import pytest
+
+import otterdog.cache
+from otterdog.providers.github import GitHubProvider
+from otterdog.providers.github.web_settings import file_web_settings_cache
+
+
+@pytest.mark.asyncio
+async def test_load_cached_web_settings(tmp_path):
+    cache = file_web_settings_cache(60, cache_dir=str(tmp_path))
+    await cache.save("OtterdogTest", {"has_discussions": True, "discussion_source_repository": None})
+
+    assert await cache.load("OtterdogTest", {"has_discussions"}) == {"has_discussions": True}
+    assert await cache.load("OtterdogTest", {"has_discussions", "two_factor_requirement"}) is None
+    assert await cache.load("OtherOrg", {"has_discussions"}) is None
+
+    assert await file_web_settings_cache(0, cache_dir=str(tmp_path)).load("OtterdogTest", {"has_discussions"}) is None
+    assert await file_web_settings_cache(60, True, str(tmp_path)).load("OtterdogTest", {"has_discussions"}) is None
+
+    await cache.delete("OtterdogTest")
+    assert await cache.load("OtterdogTest", {"has_discussions"}) is None
+
+
+class _WebClient:
+    def __init__(self):
+        self.retrieved = 0
+        self.settings = {"has_discussions": False}
+
+    async def get_org_settings(self, org_id, included_keys):
+        self.retrieved += 1
+        return {k: self.settings[k] for k in included_keys}
+
+    async def update_org_settings(self, org_id, data):
+        self.settings.update(data)
+
+
+@pytest.mark.asyncio
+async def test_web_settings_are_cached_until_updated(tmp_path, monkeypatch):
+    monkeypatch.setattr(otterdog.cache, "_WEB_SETTINGS_CACHE", file_web_settings_cache(60, cache_dir=str(tmp_path)))
+
+    provider = GitHubProvider(None)
+    web_client = _WebClient()
+    provider.web_client = web_client
+
+    assert await provider._get_org_web_settings("OtterdogTest", {"has_discussions"}) == {"has_discussions": False}
+    assert await provider._get_org_web_settings("OtterdogTest", {"has_discussions"}) == {"has_discussions": False}
+    assert web_client.retrieved == 1
+
+    await provider.update_org_settings("OtterdogTest", {"has_discussions": True})
+
+    assert await provider._get_org_web_settings("OtterdogTest", {"has_discussions"}) == {"has_discussions": True}
+    assert web_client.retrieved == 2
@@ -0,0 +1,157 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import asyncio
+import subprocess
+import sys
+from io import StringIO
+
+import pytest
+
+from otterdog import cli
+from otterdog.models.patch_executor import DEFAULT_PATCH_CONCURRENCY
+from otterdog.operations import Operation
+from otterdog.utils import IndentingPrinter
+
+# modules that must only be imported by the commands that need them
+_DEFERRED_MODULES = [
+    "aiohttp",
+    "git",
+    "jsonbender",
+    "jsonschema",
+    "nacl",
+    "playwright",
+    "otterdog.config",
+    "otterdog.models",
+    "otterdog.operations",
+    "otterdog.providers",
+]
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """
+    Imports the module in a new interpreter, returning the cumulative import time
+    in microseconds of each module that has been imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                import_times[name.strip()] = int(cumulative)
+
+    return import_times
+
+
+def test_cli_imports_commands_on_demand():
+    import_times = _import_times("otterdog.cli")
+
+    start_up_time = import_times["otterdog.cli"] / 1000
+    for module in _DEFERRED_MODULES:
+        assert module not in import_times, f"'{module}' imported at start up, taking {start_up_time}ms"
+
+
+def test_closing_shared_resources_does_not_import_playwright():
+    # resources are closed after every command, including those that never open a browser
+    code = (
+        "import asyncio, sys; from otterdog import cli; "
+        "asyncio.run(cli._close_shared_resources()); "
+        "assert 'playwright' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_cli_defaults():
+    assert cli._DEFAULT_PATCH_CONCURRENCY == DEFAULT_PATCH_CONCURRENCY
+
+
+class _Config:
+    def get_organization_config(self, organization):
+        return organization
+
+
+class _Operation(Operation):
+    def __init__(self):
+        super().__init__()
+        # shared with the copies of the operation that are created for each organization
+        self.running: list[str] = []
+        self.finished: list[str] = []
+        self.max_running = [0]
+
+    def pre_execute(self) -> None:
+        pass
+
+    async def execute(self, org_config) -> int:
+        self.running.append(org_config)
+        self.max_running[0] = max(self.max_running[0], len(self.running))
+
+        try:
+            self.printer.println(f"start {org_config}")
+            await asyncio.sleep(0.01)
+
+            if org_config == "failing":
+                raise RuntimeError("boom")
+
+            self.printer.println(f"end {org_config}")
+            return 0
+        finally:
+            self.running.remove(org_config)
+            self.finished.append(org_config)
+
+
+class _Output(StringIO):
+    def __init__(self, operation: _Operation):
+        super().__init__()
+        self.operation = operation
+        # organizations that have been finished when writing the output of each organization
+        self.finished_at_write: list[list[str]] = []
+
+    def write(self, s: str) -> int:
+        self.finished_at_write.append(list(self.operation.finished))
+        return super().write(s)
+
+
+@pytest.mark.asyncio
+async def test_execute_operation_in_parallel(monkeypatch):
+    async def close_shared_resources():
+        pass
+
+    monkeypatch.setattr(cli, "_close_shared_resources", close_shared_resources)
+
+    operation = _Operation()
+    output = _Output(operation)
+    organizations = ["org1", "failing", "org2", "org3", "org4"]
+
+    exit_code = await cli._execute_operation_in_parallel(
+        _Config(),  # type: ignore
+        organizations,
+        operation,
+        2,
+        IndentingPrinter(output),
+    )
+
+    # the failure of an organization does not prevent processing the others
+    assert exit_code == 2
+    assert operation.max_running == [2]
+    assert output.getvalue() == (
+        "start org1\nend org1\n"
+        "start failing\nfailed to process organization 'failing': boom\n"
+        "start org2\nend org2\n"
+        "start org3\nend org3\n"
+        "start org4\nend org4\n"
+    )
+
+    # the output of an organization is written before all organizations have been processed
+    assert "org4" not in output.finished_at_write[0]
@@ -0,0 +1,90 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import json
+import subprocess
+import threading
+
+import pytest
+
+from otterdog.config import OtterdogConfig
+from otterdog.credentials import CredentialProvider
+from otterdog.credentials.bitwarden_provider import BitwardenVault
+
+
+def test_bitwarden_items_are_retrieved_once(monkeypatch):
+    lock = threading.Lock()
+    commands = []
+
+    def getstatusoutput(command):
+        with lock:
+            commands.append(command)
+
+        if command == "bw unlock --check":
+            return 0, ""
+
+        item_id = command.removeprefix("bw get item ")
+        item = {"fields": [{"name": "webhook", "value": f"{item_id}-webhook"}, {"name": "token", "value": None}]}
+        return 0, json.dumps(item)
+
+    monkeypatch.setattr(subprocess, "getstatusoutput", getstatusoutput)
+
+    vault = BitwardenVault("api_token_admin")
+
+    assert vault.get_secrets(["item1@webhook", "item2@webhook", "item1@webhook"]) == {
+        "item1@webhook": "item1-webhook",
+        "item2@webhook": "item2-webhook",
+    }
+    assert sorted(commands) == ["bw get item item1", "bw get item item2", "bw unlock --check"]
+
+    assert vault.get_secret("item1@webhook") == "item1-webhook"
+
+    with pytest.raises(RuntimeError, match="is empty"):
+        vault.get_secret("item1@token")
+
+    with pytest.raises(RuntimeError, match="failed to parse"):
+        vault.get_secret("item1")
+
+
+class _Vault(CredentialProvider):
+    def __init__(self):
+        self.retrieved = []
+
+    def get_credentials(self, org_name, data, only_token=False):
+        raise NotImplementedError
+
+    def get_secret(self, data):
+        self.retrieved.append(data)
+        return data.upper()
+
+
+def test_secrets_are_resolved_once(tmp_path):
+    config_file = tmp_path / "otterdog.json"
+    config_file.write_text(
+        json.dumps(
+            {
+                "defaults": {
+                    "jsonnet": {"base_template": "https://github.com/otterdog/test-defaults#test.libsonnet@main"}
+                },
+                "organizations": [{"name": "OtterdogTest", "github_id": "OtterdogTest"}],
+            }
+        )
+    )
+
+    config = OtterdogConfig(str(config_file), False)
+    vault = _Vault()
+    config._credential_providers["pass"] = vault
+
+    assert config.get_secrets(["pass:secret1", "pass:secret2", "pass:secret1", "plain", "unknown:secret"]) == {
+        "pass:secret1": "SECRET1",
+        "pass:secret2": "SECRET2",
+        "plain": "plain",
+        "unknown:secret": "unknown:secret",
+    }
+    assert config.get_secret("pass:secret2") == "SECRET2"
+    assert sorted(vault.retrieved) == ["secret1", "secret2"]
@@ -0,0 +1,85 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import os
+
+import pytest
+
+import otterdog.jsonnet
+from otterdog.jsonnet import JsonnetConfig
+
+
+def _create_config(base_dir: str, org_id: str, template: str) -> JsonnetConfig:
+    config = JsonnetConfig(
+        org_id, base_dir, "https://github.com/otterdog/test-defaults#test-defaults.libsonnet@main", True
+    )
+    os.makedirs(config.template_dir)
+    with open(config.template_file, "w") as file:
+        file.write(template)
+    return config
+
+
+def test_default_configs_are_shared_by_templates_with_same_content(tmp_path, monkeypatch):
+    snippets = []
+
+    def evaluate_snippet(snippet):
+        snippets.append(snippet)
+        return {"org": {"settings": {}}, "repo": {"name": "default"}, "merge_queue": None}
+
+    monkeypatch.setattr(otterdog.jsonnet, "jsonnet_evaluate_snippet", evaluate_snippet)
+
+    config1 = _create_config(str(tmp_path), "org1", "{ newRepo(name):: {} }")
+    config2 = _create_config(str(tmp_path), "org2", "{ newRepo(name):: {} }")
+    config3 = _create_config(str(tmp_path), "org3", "{ newRepo(name):: { changed: true } }")
+
+    assert config1.default_repo_config == {"name": "default"}
+    assert config1.default_org_config == {"settings": {}}
+    assert config1.default_merge_queue_config is None
+
+    assert config2.default_repo_config == {"name": "default"}
+    assert config2.default_repo_config is not config1.default_repo_config
+
+    assert len(snippets) == 1
+
+    assert config3.default_repo_config == {"name": "default"}
+    assert len(snippets) == 2
+
+
+@pytest.mark.asyncio
+async def test_init_template_links_pinned_commit(tmp_path):
+    commit_sha = "0123456789abcdef0123456789abcdef01234567"
+    commit_dir = tmp_path / "templates" / ".commits" / "otterdog" / "test-defaults" / commit_sha
+    commit_dir.mkdir(parents=True)
+    (commit_dir / "test-defaults.libsonnet").write_text("{}")
+
+    # an existing copy of the template in the vendor directory is replaced by a link
+    config = JsonnetConfig(
+        "org1", str(tmp_path), f"https://github.com/otterdog/test-defaults#test-defaults.libsonnet@{commit_sha}", False
+    )
+    os.makedirs(config.template_dir)
+
+    await config.init_template()
+
+    assert os.path.islink(config.template_dir)
+    assert os.path.samefile(config.template_dir, commit_dir)
+    with open(config.template_file) as file:
+        assert file.read() == "{}"
+
+
+@pytest.mark.asyncio
+async def test_template_lock_is_shared_across_processes(tmp_path):
+    fcntl = pytest.importorskip("fcntl")
+    lock_file = f"{tmp_path}/templates/test-defaults.lock"
+
+    async with otterdog.jsonnet._file_lock(lock_file):
+        # locks acquired via another open file description conflict, like those of other processes
+        with open(lock_file) as file, pytest.raises(BlockingIOError):
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    with open(lock_file) as file:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
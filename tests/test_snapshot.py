@@ -0,0 +1,99 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import time
+
+import pytest
+
+from otterdog.snapshot import OrganizationSnapshot, RepositorySnapshot
+from otterdog.snapshot.file import file_snapshot_store
+
+_RESOURCES = ["webhooks", "secrets"]
+
+
+def _create_snapshot() -> OrganizationSnapshot:
+    return OrganizationSnapshot(
+        _RESOURCES,
+        {
+            "repo1": RepositorySnapshot("2024-01-01T00:00:00Z", "2024-01-01T00:00:00Z", {"repo": {"name": "repo1"}}),
+            "repo2": RepositorySnapshot("2024-01-01T00:00:00Z", "2024-01-01T00:00:00Z", {"repo": {"name": "repo2"}}),
+            "repo3": RepositorySnapshot("2024-01-01T00:00:00Z", "2024-01-01T00:00:00Z", {"repo": {"name": "repo3"}}),
+        },
+    )
+
+
+def _summary(name: str, updated_at: str = "2024-01-01T00:00:00Z") -> dict:
+    return {"name": name, "updated_at": updated_at, "pushed_at": "2024-01-01T00:00:00Z"}
+
+
+def test_get_reusable_repositories():
+    snapshot = _create_snapshot()
+    snapshot.dirty_repositories.add("repo3")
+
+    summaries = [_summary("repo1"), _summary("repo2", "2024-02-01T00:00:00Z"), _summary("repo3"), _summary("repo4")]
+    reusable = snapshot.get_reusable_repositories(summaries, _RESOURCES, 60)
+
+    assert list(reusable.keys()) == ["repo1"]
+
+
+def test_get_reusable_repositories_discarded():
+    snapshot = _create_snapshot()
+    summaries = [_summary("repo1")]
+
+    assert snapshot.get_reusable_repositories(summaries, ["webhooks"], 60) == {}
+
+
+def test_get_reusable_repositories_expired():
+    snapshot = _create_snapshot()
+    # repositories reused from older snapshots keep the time they have been retrieved
+    snapshot.created_at = time.time() - 120
+    snapshot.repositories["repo1"].fetched_at = time.time() - 120
+
+    summaries = [_summary("repo1"), _summary("repo2")]
+    reusable = snapshot.get_reusable_repositories(summaries, _RESOURCES, 60)
+
+    assert list(reusable.keys()) == ["repo2"]
+
+
+@pytest.mark.asyncio
+async def test_file_snapshot_store(tmp_path):
+    store = file_snapshot_store(60, str(tmp_path))
+
+    assert await store.load("test-org") is None
+
+    snapshot = _create_snapshot()
+    await store.save("test-org", snapshot)
+    assert await store.load("test-org") == snapshot
+
+    await store.mark_dirty("test-org", ["repo2"])
+    loaded_snapshot = await store.load("test-org")
+    assert loaded_snapshot is not None
+    assert loaded_snapshot.dirty_repositories == {"repo2"}
+
+    await store.delete("test-org")
+    assert await store.load("test-org") is None
+
+
+@pytest.mark.asyncio
+async def test_update_keeps_concurrently_marked_repositories(tmp_path):
+    store = file_snapshot_store(60, str(tmp_path))
+
+    snapshot = _create_snapshot()
+    snapshot.dirty_repositories.add("repo1")
+    await store.save("test-org", snapshot)
+
+    previous_snapshot = await store.load("test-org")
+    assert previous_snapshot is not None
+
+    # repo2 is modified while the live state is retrieved
+    await store.mark_dirty("test-org", ["repo2"])
+    await store.update("test-org", _create_snapshot(), previous_snapshot.dirty_repositories)
+
+    loaded_snapshot = await store.load("test-org")
+    assert loaded_snapshot is not None
+    assert loaded_snapshot.dirty_repositories == {"repo2"}
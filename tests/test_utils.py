@@ -10,12 +10,14 @@ import pytest
 
 from otterdog.utils import (
     UNSET,
+    PrefixTrie,
     camel_to_snake_case,
     deep_merge_dict,
     is_different_ignoring_order,
     is_ghsa_repo,
     parse_template_url,
     patch_to_other,
+    query_json,
     snake_to_camel_case,
 )
 
@@ -100,3 +102,23 @@ def test_deep_merge_dict():
         "second": {"Peter": 2},
         "third": {"Maria": 3},
     }
+
+
+def test_prefix_trie():
+    trie: PrefixTrie[str] = PrefixTrie()
+    trie.insert("release/", 1, "release-wildcard")
+    trie.insert("release/v1", 0, "release-v1")
+    trie.insert("r", 2, "r")
+
+    assert trie.find_first("release/v1.0") == "release-v1"
+    assert trie.find_first("release/v2.0") == "release-wildcard"
+    assert trie.find_first("rel") == "r"
+    assert trie.find_first("main") is None
+
+
+def test_query_json():
+    assert query_json("a.b", {"a": {"b": 1}}) == 1
+    # cached expressions must not keep the input of previous evaluations
+    assert query_json("a.b", {"a": {"b": 2}}) == 2
+    assert query_json("$", {"c": 3}) == {"c": 3}
+    assert query_json("a.b", {}) is None
@@ -10,7 +10,13 @@ import pytest
 
 from otterdog.config import OtterdogConfig
 from otterdog.webapp import mongo
-from otterdog.webapp.db.models import InstallationModel
+from otterdog.webapp.db.models import ApplyStatus, InstallationModel, InstallationStatus, PullRequestStatus
+from otterdog.webapp.db.service import (
+    _add_pull_request_increments,
+    _get_bulk_updates,
+    _get_org_statistics_increments,
+    _get_pull_request_counter,
+)
 
 
 @pytest.mark.asyncio
@@ -42,6 +48,66 @@ async def test_update_installations(app):
         assert (await get_installations())[0].github_id == "OtterdogTest2"
 
 
+def test_bulk_updates_contain_only_modified_models():
+    def load(github_id: str) -> InstallationModel:
+        model = InstallationModel.model_validate_doc(
+            {"_id": github_id, "project_name": github_id, "installation_status": "installed"}
+        )
+        # models retrieved from the database are not marked as modified
+        object.__setattr__(model, "__fields_modified__", set())
+        return model
+
+    created = InstallationModel(  # type: ignore
+        github_id="org1", project_name="org1", installation_status=InstallationStatus.INSTALLED
+    )
+    loaded = load("org2")
+    modified = load("org3")
+    modified.installation_id = 3
+
+    updates = _get_bulk_updates([created, loaded, modified])
+
+    assert [x._filter for x in updates] == [{"_id": "org1"}, {"_id": "org3"}]
+    assert updates[1]._doc == {"$set": {"installation_id": 3}}
+    assert all(x._upsert for x in updates)
+
+
+def test_pull_request_counters():
+    assert (
+        _get_pull_request_counter(PullRequestStatus.OPEN, ApplyStatus.NOT_APPLIED) == "open_or_incomplete_pull_requests"
+    )
+    assert _get_pull_request_counter("merged", "failed") == "open_or_incomplete_pull_requests"
+    assert _get_pull_request_counter("merged", "completed") == "merged_pull_requests"
+    assert _get_pull_request_counter("closed", "not_applied") is None
+
+    increments: dict[str, int] = {}
+    _add_pull_request_increments(increments, None, "open_or_incomplete_pull_requests")
+    _add_pull_request_increments(increments, "open_or_incomplete_pull_requests", "merged_pull_requests")
+    _add_pull_request_increments(increments, "merged_pull_requests", "merged_pull_requests")
+    _add_pull_request_increments(increments, "open_or_incomplete_pull_requests", None)
+
+    assert increments == {"open_or_incomplete_pull_requests": -1, "merged_pull_requests": 1}
+
+
+def test_org_statistics_increments():
+    stats = {
+        "two_factor_enforced": 1,
+        "total_repos": 10,
+        "archived_repos": 2,
+        "repos_with_branch_protection": 5,
+        "repos_with_secret_scanning": 3,
+        "repos_with_secret_scanning_push_protection": 4,
+        "repos_with_dependabot_alerts": 1,
+        "repos_with_dependabot_security_updates": 6,
+        "repos_with_private_vulnerability_reporting": 7,
+    }
+
+    increments = _get_org_statistics_increments(None, stats)
+    assert increments == {"total_projects": 1, **stats}
+
+    increments = _get_org_statistics_increments(stats, {**stats, "total_repos": 12, "two_factor_enforced": 0})
+    assert {k: v for k, v in increments.items() if v != 0} == {"total_repos": 2, "two_factor_enforced": -1}
+
+
 def _get_config_file(filename: str) -> str:
     import os
 
@@ -0,0 +1,53 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+# import the webhook module first to resolve the circular imports between tasks and webhooks
+import otterdog.webapp.webhook  # noqa: F401
+from otterdog.webapp.tasks.fetch_config import _get_statistics
+
+
+def test_statistics_from_config_data():
+    config_data = {
+        "settings": {"two_factor_requirement": True},
+        "repositories": [
+            {"name": "archived", "archived": True, "secret_scanning": "enabled"},
+            {
+                "name": "protected",
+                "archived": False,
+                "branch_protection_rules": [{"pattern": "main"}],
+                "rulesets": [],
+                "secret_scanning": "enabled",
+                "secret_scanning_push_protection": "enabled",
+                "dependabot_alerts_enabled": True,
+                "dependabot_security_updates_enabled": True,
+                "private_vulnerability_reporting_enabled": True,
+            },
+            {
+                "name": "other",
+                "archived": False,
+                "branch_protection_rules": [],
+                "rulesets": [{"name": "main"}],
+                "secret_scanning": "enabled",
+                "secret_scanning_push_protection": "disabled",
+                "dependabot_alerts_enabled": True,
+                "dependabot_security_updates_enabled": False,
+            },
+        ],
+    }
+
+    stats = _get_statistics("test", "OtterdogTest", config_data)
+
+    assert stats.two_factor_enforced == 1
+    assert stats.total_repos == 3
+    assert stats.archived_repos == 1
+    assert stats.repos_with_branch_protection == 2
+    assert stats.repos_with_secret_scanning == 1
+    assert stats.repos_with_secret_scanning_push_protection == 1
+    assert stats.repos_with_dependabot_alerts == 1
+    assert stats.repos_with_dependabot_security_updates == 1
+    assert stats.repos_with_private_vulnerability_reporting == 1
@@ -0,0 +1,58 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import pytest
+
+from otterdog.utils import query_json
+from otterdog.webapp.api import query_index
+from otterdog.webapp.api.query_index import QueryIndex
+
+_REPOSITORIES = [
+    {"name": "otterdog", "archived": False, "private": False, "topics": ["python"]},
+    {"name": "otterdog-defaults", "archived": True, "private": False, "topics": []},
+    {"name": "internal", "archived": False, "private": True, "topics": ["python", "internal"]},
+    {"name": "and", "archived": False},
+]
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        'name = "otterdog"',
+        "archived = true",
+        'archived = false and private = false and name = "otterdog"',
+        'name = "and"',
+        "private = false",
+        'name = "unknown"',
+    ],
+)
+def test_indexed_queries(filter, monkeypatch):
+    expected = query_json(f"$[{filter}][]", _REPOSITORIES) or []
+
+    def evaluate(expr, data):
+        raise AssertionError(f"expression '{expr}' should be answered using an index")
+
+    monkeypatch.setattr(query_index, "query_json", evaluate)
+
+    assert QueryIndex(_REPOSITORIES).query(filter) == expected
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        '"internal" in topics',
+        "private != true",
+        'name = "otterdog" or archived = true',
+        '$contains(name, "otterdog")',
+    ],
+)
+def test_other_queries_are_evaluated(filter):
+    expected = query_json(f"$[{filter}][]", _REPOSITORIES) or []
+    assert len(expected) > 0
+
+    assert QueryIndex(_REPOSITORIES).query(filter) == expected
@@ -0,0 +1,293 @@
+#  *******************************************************************************
+#  Copyright (c) 2024 Eclipse Foundation and others.
+#  This program and the accompanying materials are made available
+#  under the terms of the Eclipse Public License 2.0
+#  which is available at http://www.eclipse.org/legal/epl-v20.html
+#  SPDX-License-Identifier: EPL-2.0
+#  *******************************************************************************
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+
+import pytest
+
+# import the webhook module first to resolve the circular imports between tasks and webhooks
+import otterdog.webapp.webhook  # noqa: F401
+from otterdog.utils import LogLevel
+from otterdog.webapp.policies.macos_large_runners import MacOSLargeRunnersUsagePolicy
+from otterdog.webapp.tasks import Task, TaskPriority, queue
+from otterdog.webapp.tasks.apply_changes import ApplyChangesTask
+from otterdog.webapp.tasks.check_sync import CheckConfigurationInSyncTask
+from otterdog.webapp.tasks.fetch_policies import FetchPoliciesTask
+from otterdog.webapp.tasks.help_comment import HelpCommentTask
+from otterdog.webapp.tasks.queue import TaskQueue, deserialize_task, serialize_task
+from otterdog.webapp.tasks.update_pull_request import UpdatePullRequestTask
+from otterdog.webapp.tasks.validate_pull_request import ValidatePullRequestTask
+from otterdog.webapp.webhook.github_models import PullRequest
+
+_ACTOR = {"login": "otterdog", "id": 1, "node_id": "U_1", "type": "User"}
+_REPOSITORY = {
+    "id": 2,
+    "node_id": "R_2",
+    "name": ".otterdog",
+    "full_name": "OtterdogTest/.otterdog",
+    "private": False,
+    "owner": _ACTOR,
+    "default_branch": "main",
+}
+
+
+def _ref(ref: str) -> dict:
+    return {"label": f"OtterdogTest:{ref}", "ref": ref, "sha": "abc", "user": _ACTOR, "repo": _REPOSITORY}
+
+
+_PULL_REQUEST = PullRequest.model_validate(
+    {
+        "id": 3,
+        "node_id": "PR_3",
+        "number": 10,
+        "state": "open",
+        "locked": False,
+        "title": "Update settings",
+        "draft": False,
+        "user": _ACTOR,
+        "author_association": "MEMBER",
+        "created_at": "2024-06-01T10:00:00Z",
+        "updated_at": "2024-06-01T11:00:00Z",
+        "head": _ref("update"),
+        "base": _ref("main"),
+    }
+)
+
+
+def test_queued_tasks_can_be_restored():
+    task = ValidatePullRequestTask(1, "OtterdogTest", ".otterdog", 10, LogLevel.INFO)
+    # accessing the logger caches it on the task
+    assert task.logger is not None
+
+    payload = serialize_task(task)
+    assert json.loads(payload) == {
+        "type": "ValidatePullRequestTask",
+        "params": {
+            "installation_id": 1,
+            "org_id": "OtterdogTest",
+            "repo_name": ".otterdog",
+            "pull_request_or_number": 10,
+            "log_level": LogLevel.INFO.value,
+        },
+    }
+
+    restored_task = deserialize_task(payload)
+
+    assert isinstance(restored_task, ValidatePullRequestTask)
+    assert restored_task.log_level == LogLevel.INFO
+    assert repr(restored_task) == repr(task)
+    assert restored_task.get_coalescing_key() == task.get_coalescing_key()
+
+
+def test_queued_tasks_with_pull_requests_can_be_restored():
+    task = UpdatePullRequestTask(1, "OtterdogTest", ".otterdog", _PULL_REQUEST)
+    restored_task = deserialize_task(serialize_task(task))
+
+    assert isinstance(restored_task, UpdatePullRequestTask)
+    assert restored_task.pull_request == _PULL_REQUEST
+    assert restored_task.review is None
+
+    task = ValidatePullRequestTask(1, "OtterdogTest", ".otterdog", _PULL_REQUEST)
+    restored_task = deserialize_task(serialize_task(task))
+
+    assert isinstance(restored_task, ValidatePullRequestTask)
+    assert restored_task.pull_request_or_number == _PULL_REQUEST
+
+
+def test_queued_tasks_with_policies_can_be_restored():
+    task = FetchPoliciesTask(1, "OtterdogTest", ".otterdog", [MacOSLargeRunnersUsagePolicy(allowed=False)])
+    restored_task = deserialize_task(serialize_task(task))
+
+    assert isinstance(restored_task, FetchPoliciesTask)
+    assert restored_task.global_policies == [MacOSLargeRunnersUsagePolicy(allowed=False)]
+
+
+def test_unknown_task_types_are_not_restored():
+    with pytest.raises(RuntimeError):
+        deserialize_task(json.dumps({"type": "UnknownTask", "params": {}}))
+
+
+def test_tasks_that_can_not_be_serialized_are_rejected():
+    class _UnserializableTask(Task[None]):
+        async def _execute(self) -> None:
+            pass
+
+        def __repr__(self) -> str:
+            return "_UnserializableTask()"
+
+    with pytest.raises(TypeError):
+        serialize_task(_UnserializableTask())
+
+
+def test_coalescing_keys():
+    assert ValidatePullRequestTask(1, "OtterdogTest", ".otterdog", 10).get_coalescing_key() == (
+        "ValidatePullRequestTask:OtterdogTest/.otterdog#10"
+    )
+    assert CheckConfigurationInSyncTask(1, "OtterdogTest", ".otterdog", 10).get_coalescing_key() == (
+        "CheckConfigurationInSyncTask:OtterdogTest/.otterdog#10"
+    )
+    assert HelpCommentTask(1, "OtterdogTest", ".otterdog", 10).get_coalescing_key() is None
+
+
+def test_priorities():
+    assert ApplyChangesTask.priority < ValidatePullRequestTask.priority < CheckConfigurationInSyncTask.priority
+    assert ValidatePullRequestTask.priority == TaskPriority.NORMAL
+
+
+@dataclass(repr=False)
+class _QueuedTask(Task[None]):
+    name: str
+    org_id: str
+    coalescing_key: str | None = None
+
+    def get_coalescing_key(self) -> str | None:
+        return self.coalescing_key
+
+    async def _execute(self) -> None:
+        pass
+
+    def __repr__(self) -> str:
+        return f"_QueuedTask(name={self.name})"
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    # executing the lua scripts of the queue requires lupa
+    pytest.importorskip("lupa")
+    fakeredis = pytest.importorskip("fakeredis")
+
+    redis = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(queue, "get_redis", lambda: redis)
+    return redis
+
+
+async def _enqueue(task_queue: TaskQueue, task: Task) -> None:
+    await task_queue.enqueue(task)
+    # tasks are ordered by the millisecond they have been queued in
+    await asyncio.sleep(0.002)
+
+
+async def _claim_all(task_queue: TaskQueue) -> list[str]:
+    names = []
+    while (task_id := await task_queue._claim()) is not None:
+        task = deserialize_task(await queue.get_redis().hget(queue._DATA_KEY, task_id))
+        assert isinstance(task, _QueuedTask)
+        names.append(task.name)
+    return names
+
+
+@pytest.mark.asyncio
+async def test_claim_limits_tasks_per_org(redis):
+    task_queue = TaskQueue(max_workers=4, max_tasks_per_org=1)
+
+    await _enqueue(task_queue, _QueuedTask("first", "org1"))
+    await _enqueue(task_queue, _QueuedTask("second", "org1"))
+    await _enqueue(task_queue, _QueuedTask("third", "org2"))
+
+    assert await _claim_all(task_queue) == ["first", "third"]
+
+
+@pytest.mark.asyncio
+async def test_claim_skips_active_coalescing_keys(redis):
+    task_queue = TaskQueue(max_workers=4, max_tasks_per_org=4)
+
+    await _enqueue(task_queue, _QueuedTask("first", "org1", "key"))
+    assert await _claim_all(task_queue) == ["first"]
+
+    await _enqueue(task_queue, _QueuedTask("second", "org1", "key"))
+    await _enqueue(task_queue, _QueuedTask("third", "org1", "other-key"))
+    assert await _claim_all(task_queue) == ["third"]
+
+
+@pytest.mark.asyncio
+async def test_completed_tasks_are_removed(redis):
+    task_queue = TaskQueue(max_workers=4, max_tasks_per_org=1)
+
+    await _enqueue(task_queue, _QueuedTask("first", "org1", "key"))
+    await _enqueue(task_queue, _QueuedTask("second", "org1"))
+
+    task_id = await task_queue._claim()
+    await task_queue._workers.acquire()
+    await task_queue._execute(task_id)
+
+    assert await redis.hget(queue._DATA_KEY, task_id) is None
+    assert await redis.zcard(queue._PROCESSING_KEY) == 0
+    assert await _claim_all(task_queue) == ["second"]
+
+
+@pytest.mark.asyncio
+async def test_failed_claims_release_workers(redis, monkeypatch):
+    task_queue = TaskQueue(max_workers=1, max_tasks_per_org=1)
+    monkeypatch.setattr(queue, "_POLL_INTERVAL", 0)
+
+    claims = 0
+
+    async def failing_claim() -> str | None:
+        nonlocal claims
+        claims += 1
+        if claims == 3:
+            task_queue.stop()
+        raise RuntimeError("claim failed")
+
+    monkeypatch.setattr(task_queue, "_claim", failing_claim)
+
+    # a worker that is not released after a failed claim would block the queue forever
+    await asyncio.wait_for(task_queue.run(), timeout=5)
+
+    assert claims == 3
+    assert not task_queue._workers.locked()
+
+
+@pytest.mark.asyncio
+async def test_lost_tasks_are_recovered(redis):
+    task_queue = TaskQueue(max_workers=4, max_tasks_per_org=1)
+
+    await _enqueue(task_queue, _QueuedTask("first", "org1", "key"))
+    task_id = await task_queue._claim()
+
+    # tasks with a recent heartbeat are not recovered
+    await redis.zadd(queue._PROCESSING_KEY, {task_id: time.time()}, xx=True)
+    await task_queue._recover_lost_tasks()
+    assert await _claim_all(task_queue) == []
+
+    await redis.zadd(queue._PROCESSING_KEY, {task_id: time.time() - queue._PROCESSING_TIMEOUT - 1}, xx=True)
+    await task_queue._recover_lost_tasks()
+    assert await _claim_all(task_queue) == ["first"]
+
+
+@pytest.mark.asyncio
+async def test_completing_a_recovered_task_keeps_it_queued(redis):
+    task_queue = TaskQueue(max_workers=4, max_tasks_per_org=1)
+
+    await _enqueue(task_queue, _QueuedTask("first", "org1"))
+    await _enqueue(task_queue, _QueuedTask("second", "org2"))
+    task_id = await task_queue._claim()
+
+    await redis.zadd(queue._PROCESSING_KEY, {task_id: time.time() - queue._PROCESSING_TIMEOUT - 1}, xx=True)
+    await task_queue._recover_lost_tasks()
+
+    # the lost task completes after it has been queued again
+    await task_queue._complete(task_id)
+
+    assert await _claim_all(task_queue) == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_tasks_without_metadata_are_skipped(redis):
+    task_queue = TaskQueue(max_workers=4, max_tasks_per_org=1)
+
+    await _enqueue(task_queue, _QueuedTask("first", "org1"))
+    await _enqueue(task_queue, _QueuedTask("second", "org1"))
+    task_id = (await redis.zrange(queue._QUEUE_KEY, 0, 0))[0]
+    await redis.hdel(queue._META_KEY, task_id)
+
+    assert await _claim_all(task_queue) == ["second"]
+    assert await redis.zcard(queue._QUEUE_KEY) == 0
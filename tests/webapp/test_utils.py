@@ -10,6 +10,7 @@ from datetime import timedelta
 
 import pytest
 
+from otterdog.webapp import utils
 from otterdog.webapp.utils import backoff_if_needed, current_utc_time
 
 
@@ -26,3 +27,32 @@ async def test_backoff_if_needed():
     await backoff_if_needed(start - timedelta(seconds=60), timedelta(seconds=3))
     end = current_utc_time()
     assert end - start < timedelta(seconds=1)
+
+
+class _Clients(utils._InstallationClients):
+    closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_checked_out_installation_clients_are_not_closed(monkeypatch):
+    timeout = utils._INSTALLATION_CLIENTS_IDLE_TIMEOUT
+    checked_out = _Clients(None, None, None, last_used=0, checkouts=1)  # type: ignore
+    released = _Clients(None, None, None, last_used=0)  # type: ignore
+    monkeypatch.setattr(utils, "_INSTALLATION_CLIENTS", {1: checked_out, 2: released})
+
+    await utils._close_idle_installation_clients(timeout + 1, 3)
+
+    assert not checked_out.closed
+    assert released.closed
+    assert list(utils._INSTALLATION_CLIENTS) == [1]
+
+    # released clients are closed once they have been idle for a while
+    utils.release_installation_client(1)
+    await utils._close_idle_installation_clients(checked_out.last_used + 1, 3)
+    assert not checked_out.closed
+
+    await utils._close_idle_installation_clients(checked_out.last_used + timeout + 1, 3)
+    assert checked_out.closed